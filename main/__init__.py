@@ -7,6 +7,7 @@ Main Classes:
     - PitchBookScraper: Main orchestrator for scraping workflow
     - ScrapeCompanyDetails: Handles individual company scraping
     - StartDriver: Manages Selenium WebDriver instances
+    - DriverPool: Shares warm StartDriver instances between scrapers
     - CustomLogger: Logging functionality
 
 Example:
@@ -20,7 +21,7 @@ __author__ = "Riken"
 
 from .main import PitchBookScraper
 from .details import ScrapeCompanyDetails, scrape_company, save_to_db
-from .driver import StartDriver
+from .driver import StartDriver, DriverPool
 from .logger import CustomLogger
 
 __all__ = [
@@ -29,5 +30,6 @@ __all__ = [
     'scrape_company',
     'save_to_db',
     'StartDriver',
+    'DriverPool',
     'CustomLogger'
 ]
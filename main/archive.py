@@ -0,0 +1,314 @@
+"""
+Content-addressed archive of raw fetched HTML.
+Pages are stored once per content hash as zstd blobs; a SQLite index maps URL and fetch time to hashes.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import threading
+import time
+
+import zstandard
+
+
+# Next to this module, so the archive does not depend on the working directory
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive")
+
+# Fetch states: the page was usable, it never became ready, or it extracted to
+# company_name "Unknown" (blank page, challenge, half-loaded DOM). Only OK
+# fetches are re-parsed.
+OK = "ok"
+TIMEOUT = "timeout"
+UNKNOWN = "unknown"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fetches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'ok'
+);
+CREATE INDEX IF NOT EXISTS fetches_url_time ON fetches (url, fetched_at);
+CREATE INDEX IF NOT EXISTS fetches_time ON fetches (fetched_at);
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    compressed_size INTEGER NOT NULL,
+    first_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    sha256 TEXT NOT NULL,
+    extractor_version INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (sha256, extractor_version)
+);
+"""
+
+
+def read_blob(path, decompressor=None):
+    """
+    Decompress a blob straight from a memory map of its file.
+
+    Args:
+        path (str): Blob path
+        decompressor (ZstdDecompressor, optional): Reused decompressor
+
+    Returns:
+        str: Page source
+    """
+    decompressor = decompressor or zstandard.ZstdDecompressor()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return decompressor.decompress(mm).decode("utf-8")
+
+
+def blob_path(objects_dir, sha256):
+    """Path of the compressed blob for a content hash"""
+    return os.path.join(objects_dir, sha256[:2], f"{sha256}.zst")
+
+
+class HtmlArchive:
+    """
+    Write-once archive of fetched pages.
+
+    Layout under ``root``:
+        objects/ab/abcdef....zst   zstd-compressed HTML, named by sha256 of the bytes
+        index.sqlite               fetches (url, kind, fetched_at, state -> sha256),
+                                   blobs, and cached extraction results
+
+    Identical pages share one blob, and the extraction result of a blob is
+    cached per extractor version, so unchanged content is never parsed twice.
+    """
+
+    def __init__(self, root=DEFAULT_ARCHIVE_DIR, level=3):
+        """
+        Initialize the archive.
+
+        Args:
+            root (str): Archive directory
+            level (int): zstd compression level
+        """
+        self.root = root
+        self.level = level
+        self.objects_dir = os.path.join(root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Several worker processes may share the index; WAL lets readers run during writes
+        self.index_path = os.path.join(root, "index.sqlite")
+        self._db = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(fetches)")}
+        if "state" not in columns:
+            # Archives created before fetch states existed
+            self._db.execute(f"ALTER TABLE fetches ADD COLUMN state TEXT NOT NULL DEFAULT '{OK}'")
+        self._db.commit()
+
+    def _compressor(self):
+        # zstd (de)compressor objects are not thread-safe
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = zstandard.ZstdCompressor(level=self.level)
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local.compressor, self._local.decompressor
+
+    def blob_path(self, sha256):
+        """Path of the compressed blob for a content hash"""
+        return blob_path(self.objects_dir, sha256)
+
+    def put(self, url, html, kind="profile", fetched_at=None, state=OK):
+        """
+        Archive a fetched page.
+
+        Args:
+            url (str): Page URL
+            html (str or bytes): Raw page source
+            kind (str): Page kind, e.g. 'search' or 'profile'
+            fetched_at (float, optional): Unix time of the fetch, defaults to now
+            state (str): Fetch state (OK, TIMEOUT or UNKNOWN); see set_state
+
+        Returns:
+            dict: {'fetch_id', 'sha256', 'size', 'new_blob', 'unchanged'}; 'unchanged'
+                is True when the previous fetch of this URL had the same content
+        """
+        raw = html.encode("utf-8") if isinstance(html, str) else html
+        sha256 = hashlib.sha256(raw).hexdigest()
+        fetched_at = fetched_at or time.time()
+
+        path = self.blob_path(sha256)
+        new_blob = not os.path.exists(path)
+        compressed_size = None
+        if new_blob:
+            compressor, _ = self._compressor()
+            compressed = compressor.compress(raw)
+            compressed_size = len(compressed)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            previous = self._db.execute(
+                "SELECT sha256 FROM fetches WHERE url = ? ORDER BY fetched_at DESC LIMIT 1", (url,)
+            ).fetchone()
+            if new_blob:
+                self._db.execute(
+                    "INSERT OR IGNORE INTO blobs (sha256, size, compressed_size, first_seen) VALUES (?, ?, ?, ?)",
+                    (sha256, len(raw), compressed_size, fetched_at)
+                )
+            fetch_id = self._db.execute(
+                "INSERT INTO fetches (url, kind, fetched_at, sha256, size, state) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, kind, fetched_at, sha256, len(raw), state)
+            ).lastrowid
+            self._db.commit()
+
+        return {
+            "fetch_id": fetch_id,
+            "sha256": sha256,
+            "size": len(raw),
+            "new_blob": new_blob,
+            "unchanged": previous is not None and previous[0] == sha256,
+        }
+
+    def set_state(self, fetch_id, state):
+        """
+        Tag a fetch once its page has been judged, e.g. UNKNOWN after it
+        extracted to company_name "Unknown".
+
+        Args:
+            fetch_id (int): 'fetch_id' returned by put
+            state (str): New state
+        """
+        with self._lock:
+            self._db.execute("UPDATE fetches SET state = ? WHERE id = ?", (state, fetch_id))
+            self._db.commit()
+
+    def get(self, sha256):
+        """
+        Read an archived page.
+
+        Args:
+            sha256 (str): Content hash
+
+        Returns:
+            str: Page source
+        """
+        _, decompressor = self._compressor()
+        return read_blob(self.blob_path(sha256), decompressor)
+
+    def lookup(self, url=None, since=None, until=None, kind=None, limit=None):
+        """
+        Find fetches by URL and/or time range, newest first.
+
+        Args:
+            url (str, optional): Exact page URL
+            since (float, optional): Earliest fetch time (unix seconds, inclusive)
+            until (float, optional): Latest fetch time (unix seconds, exclusive)
+            kind (str, optional): Page kind
+            limit (int, optional): Maximum number of rows
+
+        Returns:
+            list: Dicts with url, kind, fetched_at, sha256, size and state
+        """
+        clauses, params = [], []
+        for column, op, value in (("url", "=", url), ("fetched_at", ">=", since),
+                                  ("fetched_at", "<", until), ("kind", "=", kind)):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        query = "SELECT url, kind, fetched_at, sha256, size, state FROM fetches"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY fetched_at DESC"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [dict(zip(("url", "kind", "fetched_at", "sha256", "size", "state"), row)) for row in rows]
+
+    def iter_latest(self, kind="profile", after_id=0, batch_size=1000):
+        """
+        Stream the newest usable (OK) fetch of every URL, in fetch id order.
+
+        A URL whose latest fetch timed out or extracted to "Unknown" falls
+        back to its previous OK fetch; URLs without one are left out.
+
+        Args:
+            kind (str): Page kind
+            after_id (int): Only URLs whose newest OK fetch id is greater (resume point)
+            batch_size (int): Rows read from SQLite per round trip
+
+        Yields:
+            tuple: (fetch_id, url, sha256)
+        """
+        # Own connection, so a long scan never holds the lock writers use
+        db = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            # SQLite returns the row's other columns alongside MAX(id)
+            cursor = db.execute(
+                "SELECT MAX(id) AS last_id, url, sha256 FROM fetches WHERE kind = ? AND state = ? "
+                "GROUP BY url HAVING last_id > ? ORDER BY last_id",
+                (kind, OK, after_id)
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            db.close()
+
+    def latest(self, url):
+        """Most recent fetch of a URL, or None"""
+        rows = self.lookup(url=url, limit=1)
+        return rows[0] if rows else None
+
+    def cached_result(self, sha256, extractor_version):
+        """
+        Extraction result stored for a blob.
+
+        Returns:
+            dict or None: Extracted data, None if this content was never parsed
+                by this extractor version
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM results WHERE sha256 = ? AND extractor_version = ?",
+                (sha256, extractor_version)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store_result(self, sha256, extractor_version, data):
+        """Cache the extraction result of a blob"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (sha256, extractor_version, data) VALUES (?, ?, ?)",
+                (sha256, extractor_version, json.dumps(data, default=str))
+            )
+            self._db.commit()
+
+    def stats(self):
+        """
+        Archive size for the run log.
+
+        Returns:
+            dict: fetches, blobs, raw and compressed bytes
+        """
+        with self._lock:
+            fetches = self._db.execute("SELECT COUNT(*) FROM fetches").fetchone()[0]
+            blobs, raw, compressed = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(compressed_size), 0) FROM blobs"
+            ).fetchone()
+        return {"fetches": fetches, "blobs": blobs, "raw_bytes": raw, "compressed_bytes": compressed}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
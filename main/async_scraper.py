@@ -0,0 +1,445 @@
+"""
+Asyncio scraping engine that drives Chrome directly over the DevTools protocol.
+Overlaps navigation, readiness waits and extraction across many tabs in one process.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+import logging
+
+import websockets
+
+from details import extract_pitchbook_data, PROXIES, SEARCH_PAGE, PROFILE_PAGE, BASE_URL
+from driver.get_driver import StartDriver
+from driver.instance_dirs import reaper
+from driver.readiness import PENDING_STATES, readiness_stats
+from driver.resource_policy import ResourcePolicy
+from driver.tabs import STALE_MARK, STALE_EXPRESSION_GUARD
+from driver.utils import find_chrome_binary, get_chrome_version
+from pacing import AIMDPacer
+
+
+# Minimal fingerprint patches; selenium-stealth needs a WebDriver and cannot be used here
+STEALTH_SCRIPT = """
+Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+Object.defineProperty(navigator, 'platform', {get: () => 'Win32'});
+window.chrome = window.chrome || {runtime: {}};
+"""
+
+SEARCH_LINKS_EXPRESSION = (
+    "Array.from(document.querySelectorAll(\"a[href*='/profiles/company/']\")).map(a => a.href)"
+)
+
+
+class CDPError(Exception):
+    """Error returned by Chrome for a DevTools command"""
+
+
+class CDPConnection:
+    """A DevTools websocket with request/response matching"""
+
+    def __init__(self, ws_url):
+        self.ws_url = ws_url
+        self.ws = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._reader = None
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.ws_url, max_size=None)
+        self._reader = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self):
+        try:
+            async for raw in self.ws:
+                message = json.loads(raw)
+                future = self._pending.pop(message.get('id'), None)
+                if future is None or future.done():
+                    continue
+                if 'error' in message:
+                    future.set_exception(CDPError(message['error']))
+                else:
+                    future.set_result(message.get('result', {}))
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("DevTools connection closed"))
+            self._pending.clear()
+
+    async def send(self, method, params=None, session_id=None, timeout=30):
+        """
+        Send a DevTools command and wait for its result.
+
+        Args:
+            method (str): CDP method, e.g. 'Page.navigate'
+            params (dict, optional): Command parameters
+            session_id (str, optional): Target session for flattened sessions
+            timeout (float): Seconds to wait for the response
+
+        Returns:
+            dict: Command result
+        """
+        message_id = next(self._ids)
+        message = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        await self.ws.send(json.dumps(message))
+        return await asyncio.wait_for(future, timeout)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+
+class AsyncTab:
+    """One page target in its own browser context, attached via a flat session"""
+
+    def __init__(self, connection, target_id, session_id, context_id):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+        self.context_id = context_id
+
+    async def send(self, method, params=None, timeout=30):
+        return await self.connection.send(method, params, session_id=self.session_id, timeout=timeout)
+
+    async def evaluate(self, expression):
+        """Evaluate a JS expression in the page and return its value"""
+        result = await self.send('Runtime.evaluate', {'expression': expression, 'returnByValue': True})
+        return result.get('result', {}).get('value')
+
+    async def navigate(self, url):
+        """Start a navigation; returns once it is committed, not loaded"""
+        # Until the new document replaces this one, wait_for must not accept it
+        await self.evaluate(STALE_MARK)
+        await self.send('Page.navigate', {'url': url})
+
+    async def wait_for(self, kind, poll_interval=0.25):
+        """
+        Async counterpart of driver.readiness.wait_for_page.
+
+        Args:
+            kind (PageKind): Readiness rules for the page
+            poll_interval (float): Seconds between checks
+
+        Returns:
+            tuple: (state, seconds)
+        """
+        start = time.time()
+        loaded_at = None
+        state = 'timeout'
+        expression = STALE_EXPRESSION_GUARD + kind.expression
+
+        while time.time() - start < kind.timeout:
+            try:
+                current = await self.evaluate(expression)
+            except (CDPError, asyncio.TimeoutError):
+                current = 'loading'
+
+            if current not in PENDING_STATES:
+                state = current
+                break
+            if current == 'loaded' and kind.settle_after_load is not None:
+                loaded_at = loaded_at or time.time()
+                if time.time() - loaded_at >= kind.settle_after_load:
+                    state = current
+                    break
+            await asyncio.sleep(poll_interval)
+
+        elapsed = time.time() - start
+        readiness_stats.record(kind.name, state, elapsed)
+        return state, elapsed
+
+    async def html(self):
+        """Serialized DOM of the page"""
+        return await self.evaluate("document.documentElement.outerHTML")
+
+    async def close(self):
+        try:
+            await self.connection.send('Target.closeTarget', {'targetId': self.target_id})
+            await self.connection.send('Target.disposeBrowserContext', {'browserContextId': self.context_id})
+        except (CDPError, asyncio.TimeoutError) as e:
+            print(f"Error closing tab: {e}")
+
+
+class AsyncPitchBookScraper:
+    """
+    PitchBook scraper built on asyncio and raw DevTools.
+
+    One Chrome process serves ``concurrency`` isolated tabs. ``scrape_many``
+    and ``search_many`` keep every tab busy, so navigation, readiness waits
+    and extraction of different pages overlap instead of running one after
+    another as in the Selenium flow.
+
+    Example:
+        >>> async def main():
+        ...     async with AsyncPitchBookScraper(concurrency=4) as scraper:
+        ...         return await scraper.scrape_many(urls)
+        >>> results = asyncio.run(main())
+    """
+
+    def __init__(self, concurrency=4, headless=True, proxy=None, resource_policy=None,
+                 pacer=None, logger=None, max_captcha_retries=3, base_url=BASE_URL):
+        """
+        Initialize the scraper.
+
+        Args:
+            concurrency (int): Number of tabs working in parallel
+            headless (bool): Run Chrome headless
+            proxy (str, optional): "host:port" proxy. A random entry of PROXIES if None.
+            resource_policy (ResourcePolicy, optional): Request blocking; defaults to ResourcePolicy()
+            pacer (AIMDPacer, optional): Per-proxy pacing; in-memory if None
+            logger: Logger instance
+            max_captcha_retries (int): Reloads per URL after a captcha or a page that never became ready
+            base_url (str): Site root used for search URLs
+        """
+        self.concurrency = concurrency
+        self.headless = headless
+        self.proxy = proxy or random.choice(PROXIES)
+        self.resource_policy = resource_policy or ResourcePolicy()
+        self.pacer = pacer or AIMDPacer(state_path=None)
+        self.max_captcha_retries = max_captcha_retries
+        self.base_url = base_url.rstrip('/')
+
+        if logger is None:
+            logger = logging.getLogger(__name__)
+        self.logger = logger
+
+        self.process = None
+        self.profile_dir = None
+        self.connection = None
+        self.chrome_version = None
+        self._tabs = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Launch Chrome, connect to its browser target and open the tabs"""
+        binary = find_chrome_binary()
+        if not binary:
+            raise RuntimeError("Chrome binary not found")
+
+        self.chrome_version = get_chrome_version()
+        self.profile_dir = tempfile.mkdtemp(prefix='async-profile-')
+        try:
+            StartDriver.startup_cache.clone_profile(self.chrome_version, self.profile_dir)
+        except Exception as e:
+            self.logger.warning(f"Template profile unavailable: {e}")
+
+        args = [
+            binary,
+            '--remote-debugging-port=0',
+            f'--user-data-dir={self.profile_dir}',
+            f'--proxy-server=http://{self.proxy}',
+            '--no-first-run',
+            '--no-default-browser-check',
+            '--no-sandbox',
+            '--disable-gpu',
+            '--disable-dev-shm-usage',
+            '--lang=en',
+            'about:blank',
+        ]
+        if self.headless:
+            args.insert(1, '--headless=new')
+
+        self.process = await asyncio.create_subprocess_exec(
+            *args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        ws_url = await self._wait_for_devtools()
+        self.connection = CDPConnection(ws_url)
+        await self.connection.connect()
+
+        self._tabs = asyncio.Queue()
+        for _ in range(self.concurrency):
+            self._tabs.put_nowait(await self._open_tab())
+        self.logger.info(f"✓ Async Chrome {self.chrome_version} started with {self.concurrency} tabs")
+
+    async def _wait_for_devtools(self, timeout=20):
+        """Read the browser websocket URL from DevToolsActivePort"""
+        port_file = os.path.join(self.profile_dir, 'DevToolsActivePort')
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if os.path.exists(port_file):
+                with open(port_file) as f:
+                    lines = f.read().split()
+                if len(lines) >= 2:
+                    return f"ws://127.0.0.1:{lines[0]}{lines[1]}"
+            if self.process.returncode is not None:
+                raise RuntimeError(f"Chrome exited with code {self.process.returncode}")
+            await asyncio.sleep(0.05)
+        raise RuntimeError("Timed out waiting for Chrome DevTools")
+
+    async def _open_tab(self):
+        """Create an isolated tab with stealth and request blocking installed"""
+        context = await self.connection.send('Target.createBrowserContext')
+        context_id = context['browserContextId']
+        target = await self.connection.send('Target.createTarget', {
+            'url': 'about:blank',
+            'browserContextId': context_id
+        })
+        session = await self.connection.send('Target.attachToTarget', {
+            'targetId': target['targetId'],
+            'flatten': True
+        })
+        tab = AsyncTab(self.connection, target['targetId'], session['sessionId'], context_id)
+
+        user_agent = (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            f"(KHTML, like Gecko) Chrome/{self.chrome_version}.0.0.0 Safari/537.36"
+        )
+        await tab.send('Network.enable')
+        await tab.send('Network.setUserAgentOverride', {'userAgent': user_agent, 'acceptLanguage': 'en-US,en'})
+        await tab.send('Network.setBlockedURLs', {'urls': self.resource_policy.url_patterns()})
+        await tab.send('Page.enable')
+        await tab.send('Page.addScriptToEvaluateOnNewDocument', {'source': STEALTH_SCRIPT})
+        return tab
+
+    async def _load(self, tab, url, kind):
+        """Navigate a tab with pacing and captcha/timeout retries; returns the final state"""
+        state = 'timeout'
+        for attempt in range(self.max_captcha_retries + 1):
+            await asyncio.sleep(self.pacer.reserve_turn(self.proxy))
+            await tab.navigate(url)
+            state, elapsed = await tab.wait_for(kind)
+            if state not in ('captcha', 'timeout'):
+                self.logger.info(f"✓ {kind.name} page {state} in {elapsed:.2f}s: {url}")
+                return state
+            self.logger.warning(f"{state.capitalize()} on {url} (attempt {attempt + 1})")
+            self.pacer.failure(self.proxy, state)
+        return state
+
+    async def scrape_one(self, url):
+        """
+        Scrape one company profile.
+
+        Args:
+            url (str): Company profile URL
+
+        Returns:
+            dict: Extracted data, or {} on captcha/failure
+        """
+        tab = await self._tabs.get()
+        try:
+            state = await self._load(tab, url, PROFILE_PAGE)
+            if state in ('captcha', 'timeout'):
+                return {}
+            html = await tab.html()
+        except (CDPError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Error loading {url}: {e}")
+            return {}
+        finally:
+            self._tabs.put_nowait(tab)
+
+        # Parse off the event loop so other tabs keep being driven
+        data = await asyncio.get_running_loop().run_in_executor(None, extract_pitchbook_data, html, url)
+        if data.get('company_name') == "Unknown":
+            self.pacer.failure(self.proxy, "unknown")
+        else:
+            self.pacer.success(self.proxy)
+        return data
+
+    async def scrape_many(self, urls):
+        """
+        Scrape many company profiles concurrently.
+
+        Args:
+            urls (list): Company profile URLs
+
+        Returns:
+            dict: ``url -> data``
+        """
+        results = await asyncio.gather(*(self.scrape_one(url) for url in urls))
+        return dict(zip(urls, results))
+
+    async def search_one(self, name):
+        """
+        Search PitchBook for a company name.
+
+        Args:
+            name (str): Company name
+
+        Returns:
+            list: Company profile URLs
+        """
+        url = f"{self.base_url}/profiles/search?q={name}"
+        tab = await self._tabs.get()
+        try:
+            state = await self._load(tab, url, SEARCH_PAGE)
+            if state in ('captcha', 'timeout'):
+                return []
+            hrefs = await tab.evaluate(SEARCH_LINKS_EXPRESSION) or []
+        except (CDPError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Error searching {name}: {e}")
+            return []
+        finally:
+            self._tabs.put_nowait(tab)
+
+        company_urls = []
+        for href in hrefs:
+            clean_url = href.split('?')[0].split('#')[0]
+            if '/profiles/company/' in clean_url and clean_url not in company_urls:
+                company_urls.append(clean_url)
+        if company_urls:
+            self.pacer.success(self.proxy)
+        return company_urls
+
+    async def search_many(self, names):
+        """
+        Search many company names concurrently.
+
+        Args:
+            names (list): Company names
+
+        Returns:
+            dict: ``name -> list of profile URLs``
+        """
+        results = await asyncio.gather(*(self.search_one(name) for name in names))
+        return dict(zip(names, results))
+
+    async def close(self):
+        """Close the tabs, the DevTools connection and Chrome"""
+        if self._tabs is not None:
+            while not self._tabs.empty():
+                await self._tabs.get_nowait().close()
+        if self.connection is not None:
+            await self.connection.close()
+        if self.process is not None and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), 10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+        if self.profile_dir:
+            reaper.discard(self.profile_dir)
+
+
+# Test code
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    async def main():
+        async with AsyncPitchBookScraper(concurrency=2) as scraper:
+            matches = await scraper.search_many(["QNu Labs"])
+            urls = [url for found in matches.values() for url in found[:2]]
+            results = await scraper.scrape_many(urls)
+            for url, data in results.items():
+                print(url, data.get('company_name'))
+
+    asyncio.run(main())
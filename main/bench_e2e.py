@@ -0,0 +1,178 @@
+"""
+End-to-end load test of PitchBookScraper against the local stand-in server.
+Seeds synthetic companies into a local MongoDB, runs process_batch for each
+concurrency setting (profile tabs per browser) and reports companies/hour,
+browser launches per company, retries and stage timings.
+
+Needs Chrome and a disposable MongoDB: it writes to the same PITCHBOOK and
+STARTUPSCRAPERDATA databases as the scraper. Never point it at production.
+
+    python bench_e2e.py --concurrency 1 2 4 --companies 20 --captcha-rate 0.05
+"""
+
+import argparse
+import json
+import re
+import time
+from datetime import datetime
+
+from pymongo import MongoClient
+
+from details import apply_stealth
+from driver.pool import DriverPool
+from driver.readiness import readiness_stats
+from driver.resource_policy import ResourcePolicy
+from logger import CustomLogger
+from main import PitchBookScraper, SEED_FILTER
+from pacing import AIMDPacer
+from standin_server import start_server
+
+
+BENCH_MARKER = "standin_bench"
+
+
+def seed_companies(client, count):
+    """
+    Replace the benchmark companies in the source collection.
+
+    Args:
+        client (MongoClient): Local MongoDB client
+        count (int): Companies to insert; each matches SEED_FILTER
+    """
+    source = client.STARTUPSCRAPERDATA['OrganiztionDetails']
+    source.delete_many({BENCH_MARKER: True})
+    source.insert_many([
+        {"organization_name": f"Standin Company {i}", "financial": {"funding_total": i}, "corrupted_data": False,
+         BENCH_MARKER: True}
+        for i in range(count)
+    ])
+    other = source.count_documents(dict(SEED_FILTER, **{BENCH_MARKER: {"$ne": True}}))
+    if other:
+        print(f"Warning: {other} other documents match the seed filter and may be sampled too")
+
+
+def saved_profiles(client, base_url):
+    """Documents scraped from the stand-in (their source_url starts with its base URL)"""
+    return client.PITCHBOOK['OrganizationDetails'].count_documents(
+        {"source_url": {"$regex": f"^{re.escape(base_url)}"}}
+    )
+
+
+def run_setting(server, args, concurrency, logger):
+    """
+    Scrape the seeded companies once with ``concurrency`` tabs per browser.
+
+    Returns:
+        dict: Throughput, browser launches, retries and stage timings
+    """
+    client = MongoClient(args.mongo_uri, serverSelectionTimeoutMS=5000)
+    client.PITCHBOOK['OrganizationDetails'].delete_many(
+        {"source_url": {"$regex": f"^{re.escape(server.base_url)}"}}
+    )
+    seed_companies(client, args.companies)
+    server.state.reset()
+    readiness_stats.reset()
+
+    # No proxies or identities: the stand-in is on localhost
+    driver_pool = DriverPool(
+        driver_type='undetected',
+        max_size=1,
+        on_create=apply_stealth,
+        logger=logger,
+        resource_policy=ResourcePolicy()
+    )
+    scraper = PitchBookScraper(
+        mongo_uri=args.mongo_uri,
+        batch_size=args.batch_size,
+        max_runs=1,
+        driver_pool=driver_pool,
+        tabs_per_browser=concurrency,
+        pacer=AIMDPacer(state_path=None, initial_delay=args.min_delay, min_delay=args.min_delay),
+        logger=logger,
+        http_fast_path=args.fast_path,
+        archive_dir=None,
+        parse_workers=args.parse_workers,
+        base_url=server.base_url
+    )
+
+    batches = -(-args.companies // args.batch_size)
+    started = time.time()
+    try:
+        for _ in range(batches):
+            scraper.process_batch()
+        # Profiles still in the write queue count towards this setting
+        scraper.flush_writes()
+    finally:
+        driver_pool.close_all()
+        if scraper.fast_path:
+            scraper.fast_path.close()
+        if scraper.parse_pool:
+            scraper.parse_pool.close()
+        if scraper.writer is not None:
+            scraper.writer.close()
+    elapsed = time.time() - started
+
+    requests_served = server.state.snapshot()
+    profiles = saved_profiles(client, server.base_url)
+    searches = requests_served["search"]
+    client.close()
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 1),
+        "searches": searches,
+        "profiles_saved": profiles,
+        "companies_per_hour": round(profiles / elapsed * 3600, 1) if elapsed else None,
+        "browser_launches": driver_pool.stats["launched"],
+        "launches_per_company": round(driver_pool.stats["launched"] / profiles, 3) if profiles else None,
+        # Every injected captcha or error forces the scraper to load the page again
+        "retries": requests_served["captcha"] + requests_served["error"],
+        "requests": requests_served,
+        "stages": readiness_stats.summary(),
+        "fast_path": scraper.fast_path.summary() if scraper.fast_path else None,
+        "parse_pool": scraper.parse_pool.summary() if scraper.parse_pool else None,
+        "db_writer": scraper.writer.summary() if scraper.writer is not None else None,
+        "driver_pool": dict(driver_pool.stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the scraper against a local PitchBook stand-in")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4],
+                        help="Profile tabs per browser to compare")
+    parser.add_argument("--companies", type=int, default=20, help="Synthetic companies to search")
+    parser.add_argument("--batch-size", type=int, default=5, help="Companies per process_batch call")
+    parser.add_argument("--results", type=int, default=3, help="Profiles per search page")
+    parser.add_argument("--latency", type=float, default=0.3, help="Mean stand-in response delay (s)")
+    parser.add_argument("--captcha-rate", type=float, default=0.0, help="Fraction of captcha responses")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--min-delay", type=float, default=0.0, help="Pacer delay per navigation (s)")
+    parser.add_argument("--parse-workers", type=int, default=0, help="Parse pool processes (0 = inline)")
+    parser.add_argument("--no-fast-path", dest="fast_path", action="store_false", help="Always use Chrome")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017", help="Disposable local MongoDB")
+    parser.add_argument("--output", default=None, help="Write JSON results here")
+    args = parser.parse_args()
+
+    logger = CustomLogger(log_folder="logs/bench_e2e")
+    server = start_server(latency=args.latency, captcha_rate=args.captcha_rate, error_rate=args.error_rate,
+                          results_per_search=args.results, seed=0)
+    print(f"Stand-in server on {server.base_url}")
+
+    report = {"created_at": datetime.utcnow().isoformat(), "settings": vars(args), "results": []}
+    try:
+        for concurrency in args.concurrency:
+            result = run_setting(server, args, concurrency, logger)
+            report["results"].append(result)
+            print(f"concurrency={concurrency}: {result['companies_per_hour']} companies/h, "
+                  f"{result['launches_per_company']} launches/company, {result['retries']} retries, "
+                  f"{result['elapsed_s']}s")
+    finally:
+        server.shutdown()
+
+    print(json.dumps(report["results"], indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Parser benchmark over the fixture corpus in fixtures/.
+Reports pages/sec, p50/p99 latency and peak RSS for every parser backend and
+profile section (plus search-page link extraction), and writes the results as
+JSON so runs on different commits can be compared.
+
+    python bench_parsers.py                              # all backends, all sections
+    python bench_parsers.py --backends bs4 lxml --output bench.json
+    python bench_parsers.py --compare bench.json         # fail on >10% slowdowns
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SEARCH = "search"
+
+
+def load_corpus(fixtures_dir=FIXTURES_DIR):
+    """
+    Read the fixture pages.
+
+    Returns:
+        dict: {'profile': [(name, html)], 'search': [(name, html)]}
+    """
+    corpus = {"profile": [], SEARCH: []}
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, "*.html"))):
+        name = os.path.basename(path)
+        with open(path, "r", encoding="utf-8") as f:
+            corpus[SEARCH if name.startswith("search_") else "profile"].append((name, f.read()))
+    return corpus
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _run_case(backend, section, iterations, fixtures_dir, results):
+    """Child process: time one backend/section over the corpus, isolated for peak RSS"""
+    from details import extract_pitchbook_data, extract_company_links
+    from parsers import get_backend
+
+    corpus = load_corpus(fixtures_dir)
+    if get_backend(backend).name != backend:
+        results.put({"backend": backend, "section": section, "skipped": "backend not installed"})
+        return
+
+    if section == SEARCH:
+        pages = corpus[SEARCH]
+        extract = lambda html, name: extract_company_links(html, backend=backend)
+    else:
+        pages = corpus["profile"]
+        sections = None if section == "all" else [section]
+        extract = lambda html, name: extract_pitchbook_data(html, name, backend=backend, sections=sections)
+
+    # Warm-up: selector compilation and lazy imports are not part of the steady state
+    for name, html in pages:
+        extract(html, name)
+    baseline_rss = _peak_rss_mb()
+
+    latencies = []
+    per_page = {name: [] for name, _ in pages}
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for name, html in pages:
+            t0 = time.perf_counter()
+            extract(html, name)
+            elapsed = time.perf_counter() - t0
+            latencies.append(elapsed)
+            per_page[name].append(elapsed)
+    total = time.perf_counter() - started
+
+    results.put({
+        "backend": backend,
+        "section": section,
+        "pages": len(latencies),
+        "pages_per_sec": round(len(latencies) / total, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "rss_growth_mb": round(_peak_rss_mb() - baseline_rss, 1),
+        "per_page_p50_ms": {name: round(statistics.median(times) * 1000, 3) for name, times in per_page.items()},
+    })
+
+
+def run_case(backend, section, iterations, fixtures_dir=FIXTURES_DIR):
+    """Run one case in a fresh process, so peak RSS belongs to that case alone"""
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=_run_case, args=(backend, section, iterations, fixtures_dir, results))
+    process.start()
+    try:
+        result = results.get(timeout=600)
+    except Exception:
+        result = {"backend": backend, "section": section, "error": f"exit code {process.exitcode}"}
+    process.join()
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, previous, threshold):
+    """
+    Compare throughput with an earlier results file.
+
+    Returns:
+        list: (backend, section, previous pages/sec, current pages/sec, change) for
+            cases slower by more than ``threshold``
+    """
+    before = {(r["backend"], r["section"]): r for r in previous["results"] if "pages_per_sec" in r}
+    regressions = []
+    for result in current["results"]:
+        old = before.get((result["backend"], result["section"]))
+        if not old or "pages_per_sec" not in result:
+            continue
+        change = result["pages_per_sec"] / old["pages_per_sec"] - 1
+        print(f"{result['backend']:>10} {result['section']:>18} "
+              f"{old['pages_per_sec']:>9.1f} -> {result['pages_per_sec']:>9.1f} pages/s ({change:+.1%})")
+        if change < -threshold:
+            regressions.append((result["backend"], result["section"], old["pages_per_sec"],
+                                result["pages_per_sec"], change))
+    return regressions
+
+
+def main():
+    from details import SECTIONS
+    from parsers import BACKENDS
+
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on the fixture corpus")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--sections", nargs="+", default=["all"] + list(SECTIONS) + [SEARCH],
+                        choices=["all"] + list(SECTIONS) + [SEARCH],
+                        help="'all' is a full extraction, 'search' is search-page link extraction")
+    parser.add_argument("--iterations", type=int, default=20, help="Passes over the corpus per case")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Corpus directory")
+    parser.add_argument("--output", default=None, help="Write JSON results here")
+    parser.add_argument("--compare", default=None, help="Earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown for --compare")
+    args = parser.parse_args()
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "iterations": args.iterations,
+        "corpus": {kind: [name for name, _ in pages] for kind, pages in load_corpus(args.fixtures).items()},
+        "results": [],
+    }
+
+    print(f"{'backend':>10} {'section':>18} {'pages/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'peak MB':>8}")
+    for backend in args.backends:
+        for section in args.sections:
+            result = run_case(backend, section, args.iterations, args.fixtures)
+            report["results"].append(result)
+            if "pages_per_sec" in result:
+                print(f"{backend:>10} {section:>18} {result['pages_per_sec']:>9.1f} {result['p50_ms']:>8.2f} "
+                      f"{result['p99_ms']:>8.2f} {result['peak_rss_mb']:>8.1f}")
+            else:
+                print(f"{backend:>10} {section:>18} {result.get('skipped') or result.get('error')}")
+                if "skipped" in result:
+                    break
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        print(f"\nCompared with {previous.get('commit')} ({previous.get('created_at')}):")
+        regressions = compare(report, previous, args.threshold)
+        if regressions:
+            print(f"✗ {len(regressions)} case(s) slower by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print("✓ No regressions")
+
+
+if __name__ == "__main__":
+    main()
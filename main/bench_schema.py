@@ -0,0 +1,236 @@
+"""
+Per-page CPU benchmark of the schema extractor against the hand-written
+extractors it replaced. Both must return the same dict on every page.
+
+    python bench_schema.py page1.html page2.html
+    python bench_schema.py --archive archive --limit 500
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from details import extract_pitchbook_data
+
+
+# Reference implementation: the extract_* functions as they were before schema.py
+
+def normalize_key(text: str) -> str:
+    """Normalize text for use as dictionary key"""
+    text = text.strip().lower()
+    text = re.sub(r"[^a-z0-9]+", "_", text)
+    return text.strip("_")
+
+
+def clean_text(el):
+    """Extract and clean text from BeautifulSoup element"""
+    return el.get_text(" ", strip=True) if el else None
+
+
+def extract_pitchbook_overview(soup):
+    """Extract overview section from PitchBook page"""
+    overview = {}
+    items = soup.select('[data-pp-overview-item]')
+    for item in items:
+        label_elem = item.select_one('.dont-break.text-small')
+        value_elem = item.select_one('.pp-overview-item__title')
+        if label_elem and value_elem:
+            key = normalize_key(label_elem.text)
+            overview[key] = value_elem.text.strip()
+    return overview
+
+
+def extract_pitchbook_general_info(soup):
+    """Extract general information section"""
+    info = {}
+    gen_info_sec = soup.select_one('.general-info')
+    if not gen_info_sec:
+        return info
+    
+    desc_elem = gen_info_sec.select_one('.pp-description_text')
+    if desc_elem:
+        info['description'] = clean_text(desc_elem)
+        
+    contact_items = gen_info_sec.select('.pp-contact-info_item')
+    for item in contact_items:
+        label_elem = item.select_one('h5, .font-weight-bold')
+        if label_elem:
+            label = label_elem.text.strip()
+            value_elem = item.select_one('a, .font-weight-regular')
+            if value_elem:
+                info[normalize_key(label)] = value_elem.get('title') or value_elem.text.strip()
+    
+    office_elem = gen_info_sec.select_one('.pp-contact-info_corporate-office')
+    if office_elem:
+        address_lines = [li.text.strip() for li in office_elem.select('ul li')]
+        info['corporate_office'] = ", ".join(address_lines)
+        
+    socials = {}
+    for social in gen_info_sec.select('.info-item__social div a'):
+        platform = social.get('aria-label', '').replace(' link', '').lower()
+        if platform:
+            socials[platform] = social.get('href')
+    if socials:
+        info['social_links'] = socials
+        
+    return info
+
+
+def extract_pitchbook_table(section_soup):
+    """Extract table data from a section"""
+    if not section_soup:
+        return []
+    table = section_soup.find('table')
+    if not table:
+        return []
+    
+    headers = [normalize_key(th.text) for th in table.find_all('th')]
+    rows = []
+    tbody = table.find('tbody')
+    if not tbody:
+        return []
+    
+    for tr in tbody.find_all('tr'):
+        cells = tr.find_all('td')
+        if len(cells) == len(headers):
+            row_data = {}
+            for i, cell in enumerate(cells):
+                if cell.select_one('.data-table__gray-box'):
+                    row_data[headers[i]] = "[Locked/Blurred]"
+                else:
+                    row_data[headers[i]] = cell.get('title') or cell.text.strip()
+            rows.append(row_data)
+    return rows
+
+
+def extract_pitchbook_faqs(soup):
+    """Extract FAQ section"""
+    faqs = []
+    faq_items = soup.select('.pp-faqs-table li')
+    for item in faq_items:
+        q = item.select_one('h3')
+        a = item.select_one('p')
+        if q and a:
+            faqs.append({
+                'question': q.text.strip(),
+                'answer': a.text.strip()
+            })
+    return faqs
+
+
+def legacy_extract(html_content, url):
+    """Extract all data from PitchBook company page (pre-schema version)"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    company_name = soup.select_one('.pp-search-wrap__title')
+    company_name = company_name.text.strip() if company_name else "Unknown"
+
+    data = {
+        'company_name': company_name,
+        'source_url': url,
+        'overview': extract_pitchbook_overview(soup),
+        'general_info': extract_pitchbook_general_info(soup),
+        'valuation_funding': extract_pitchbook_table(soup.select_one('#funding')),
+        'cap_table': extract_pitchbook_table(soup.select_one('#captable')),
+        'competitors': extract_pitchbook_table(soup.select_one('#competitors')),
+        'investors': extract_pitchbook_table(soup.select_one('#investors')),
+        'patents': extract_pitchbook_table(soup.select_one('#patents')),
+        'faqs': extract_pitchbook_faqs(soup)
+    }
+
+    research = []
+    for item in soup.select('#research .pp-related-research__item'):
+        title = item.select_one('.pp-related-research__item-title')
+        date = item.select_one('.pp-related-research__item-release')
+        link = item.get('href')
+        if title:
+            research.append({
+                'title': title.text.strip(),
+                'date': date.text.strip() if date else None,
+                'url': "https://pitchbook.com" + link if link else None
+            })
+    data['related_research'] = research
+    return data
+
+
+def load_pages(paths, archive_dir=None, limit=None):
+    """
+    Load benchmark pages from files and/or the newest archived profiles.
+
+    Returns:
+        list: (url, html) tuples
+    """
+    pages = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append((path, f.read()))
+    if archive_dir:
+        from archive import HtmlArchive
+        archive = HtmlArchive(archive_dir)
+        for _, url, sha256 in archive.iter_latest("profile"):
+            if limit and len(pages) >= limit:
+                break
+            pages.append((url, archive.get(sha256)))
+        archive.close()
+    return pages
+
+
+def cpu_per_page(extract, pages, repeat):
+    """Best-of-repeat CPU seconds for each page"""
+    timings = []
+    for url, html in pages:
+        best = None
+        for _ in range(repeat):
+            started = time.process_time()
+            extract(html, url)
+            elapsed = time.process_time() - started
+            best = elapsed if best is None else min(best, elapsed)
+        timings.append(best)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare schema and hand-written extractors")
+    parser.add_argument("pages", nargs="*", help="Saved profile HTML files")
+    parser.add_argument("--archive", default=None, help="Also read profiles from this archive")
+    parser.add_argument("--limit", type=int, default=200, help="Maximum archived pages")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per page (best is kept)")
+    parser.add_argument("--backend", default=None, help="Parser backend for the schema extractor")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.archive, args.limit)
+    if not pages:
+        parser.error("no pages given")
+
+    def schema_extract(html, url):
+        data = extract_pitchbook_data(html, url, backend=args.backend)
+        data.pop('scraped_at')
+        return data
+
+    mismatches = 0
+    for url, html in pages:
+        if json.dumps(legacy_extract(html, url), sort_keys=True) != json.dumps(schema_extract(html, url), sort_keys=True):
+            mismatches += 1
+            print(f"✗ Output differs: {url}")
+
+    before = cpu_per_page(legacy_extract, pages, args.repeat)
+    after = cpu_per_page(schema_extract, pages, args.repeat)
+    result = {
+        "pages": len(pages),
+        "mismatches": mismatches,
+        "before_ms_mean": round(statistics.mean(before) * 1000, 3),
+        "after_ms_mean": round(statistics.mean(after) * 1000, 3),
+        "before_ms_median": round(statistics.median(before) * 1000, 3),
+        "after_ms_median": round(statistics.median(after) * 1000, 3),
+        "speedup": round(sum(before) / sum(after), 2) if sum(after) else None,
+    }
+    print(json.dumps(result, indent=2))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Index bootstrapping and query-plan checks for the scraper's collections.
+ensure_indexes() runs at startup; the explain report shows which of the
+scraper's queries still scan whole collections.
+
+    python db_indexes.py --mongo-uri mongodb://localhost:27017            # explain report
+    python db_indexes.py --mongo-uri mongodb://localhost:27017 --ensure   # create indexes first
+"""
+
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure
+
+from work_queue import PENDING, LEASED
+
+
+# (collection, keys, options). collection is 'data' (PITCHBOOK.OrganizationDetails)
+# or 'source' (STARTUPSCRAPERDATA.OrganiztionDetails).
+INDEXES = [
+    # Upserts and the writer's hash prefetch look companies up by URL
+    ("data", [("source_url", ASCENDING)], {"name": "source_url_unique", "unique": True}),
+    # Freshness queries ("not updated since ...")
+    ("data", [("updated_at", ASCENDING)], {"name": "updated_at"}),
+    # The seed filter's $match before $sample. Partial indexes cannot express
+    # $ne/$nin, so the index covers companies with a 'financial' field and the
+    # remaining conditions are checked on the (much smaller) indexed set.
+    ("source", [("corrupted_data", ASCENDING)], {
+        "name": "seed_corrupted_data",
+        "partialFilterExpression": {"financial": {"$exists": True}},
+    }),
+]
+
+# Server error codes for an index that exists with other options or keys
+INDEX_CONFLICT_CODES = (85, 86)
+DUPLICATE_KEY = 11000
+
+
+def _log(logger, level, message):
+    if logger:
+        getattr(logger, level)(message)
+    else:
+        print(message)
+
+
+def ensure_indexes(data_collection, source_collection=None, logger=None):
+    """
+    Create the indexes the scraper's queries rely on.
+
+    Creating an index that already exists is a no-op, so this is safe to run
+    on every start and from every node. Failures are logged, never raised: the
+    scraper still works without an index, only slower.
+
+    Args:
+        data_collection: PITCHBOOK.OrganizationDetails
+        source_collection: STARTUPSCRAPERDATA.OrganiztionDetails, or None
+        logger: Logger instance
+
+    Returns:
+        dict: index name -> 'ok' or the error
+    """
+    collections = {"data": data_collection, "source": source_collection}
+    results = {}
+    for target, keys, options in INDEXES:
+        collection = collections[target]
+        if collection is None:
+            continue
+        name = options["name"]
+        try:
+            collection.create_index(keys, **options)
+            results[name] = "ok"
+        except OperationFailure as e:
+            results[name] = str(e)
+            if e.code == DUPLICATE_KEY:
+                _log(logger, "error", f"✗ Index {name} not created: {collection.name} has duplicate "
+                                      f"{keys[0][0]} values, remove them first ({e})")
+            elif e.code in INDEX_CONFLICT_CODES:
+                _log(logger, "warning", f"Index {name} conflicts with an existing index on "
+                                        f"{collection.name}, leaving it as is ({e})")
+            else:
+                _log(logger, "error", f"✗ Index {name} not created on {collection.name}: {e}")
+        except Exception as e:
+            results[name] = str(e)
+            _log(logger, "error", f"✗ Index {name} not created on {collection.name}: {e}")
+    ok = sum(1 for result in results.values() if result == "ok")
+    _log(logger, "info", f"✓ Indexes checked: {ok}/{len(results)} in place")
+    return results
+
+
+def plan_stages(explain):
+    """
+    Stages of the winning plan in an explain document.
+
+    Handles find and aggregate explains and both the classic and slot-based
+    plan layouts; rejected plans are ignored.
+
+    Returns:
+        list: Stage names, e.g. ['FETCH', 'IXSCAN']
+    """
+    stages = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == "rejectedPlans":
+                    continue
+                if key == "stage" and isinstance(value, str):
+                    stages.append(value)
+                else:
+                    walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(explain.get("queryPlanner", explain.get("stages", explain)))
+    return stages
+
+
+def scraper_queries(seed_filter):
+    """
+    The queries the scraper runs, as (label, collection key, kind, spec).
+
+    kind is 'find' (spec is a filter) or 'aggregate' (spec is a pipeline).
+    """
+    now = datetime.utcnow()
+    cutoff = now - timedelta(days=30)
+    return [
+        ("upsert by source_url", "data", "find", {"source_url": "https://pitchbook.com/profiles/company/0-00"}),
+        ("writer hash prefetch", "data", "find", {"source_url": {"$in": [
+            "https://pitchbook.com/profiles/company/0-00", "https://pitchbook.com/profiles/company/0-01"
+        ]}}),
+        ("stale profiles", "data", "find", {"updated_at": {"$lt": cutoff}}),
+        ("seed $match/$sample", "source", "aggregate", [{"$match": seed_filter}, {"$sample": {"size": 10}}]),
+        ("work queue claim", "queue", "find", {
+            "$or": [
+                {"state": PENDING, "available_at": {"$lte": now}},
+                {"state": LEASED, "lease_expires_at": {"$lt": now}}
+            ],
+            "attempts": {"$lt": 3}
+        }),
+        ("work queue dead-letter sweep", "queue", "find", {
+            "state": LEASED, "lease_expires_at": {"$lt": now}, "attempts": {"$gte": 3}
+        }),
+    ]
+
+
+def explain_report(collections, seed_filter, logger=None):
+    """
+    Explain every scraper query and flag collection scans.
+
+    Args:
+        collections (dict): 'data', 'source' and 'queue' collections
+        seed_filter (dict): Filter used to pick companies from the source collection
+        logger: Logger instance
+
+    Returns:
+        list: dicts with label, collection, stages and collscan per query
+    """
+    report = []
+    for label, target, kind, spec in scraper_queries(seed_filter):
+        collection = collections.get(target)
+        if collection is None:
+            continue
+        entry = {"query": label, "collection": collection.full_name}
+        try:
+            if kind == "find":
+                explain = collection.find(spec).explain()
+            else:
+                explain = collection.database.command(
+                    "explain", {"aggregate": collection.name, "pipeline": spec, "cursor": {}},
+                    verbosity="queryPlanner"
+                )
+            entry["stages"] = plan_stages(explain)
+            entry["collscan"] = "COLLSCAN" in entry["stages"]
+        except Exception as e:
+            entry["error"] = str(e)
+        report.append(entry)
+
+        if "error" in entry:
+            _log(logger, "error", f"✗ {label} ({entry['collection']}): {entry['error']}")
+        elif entry["collscan"]:
+            _log(logger, "warning", f"✗ COLLSCAN {label} ({entry['collection']}): {' <- '.join(entry['stages'])}")
+        else:
+            _log(logger, "info", f"✓ {label} ({entry['collection']}): {' <- '.join(entry['stages'])}")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+
+    from pymongo import MongoClient
+
+    from main import DEFAULT_MONGO_URI, SEED_FILTER
+
+    parser = argparse.ArgumentParser(description="Check the indexes and query plans of the scraper's collections")
+    parser.add_argument("--mongo-uri", default=DEFAULT_MONGO_URI, help="MongoDB connection URI")
+    parser.add_argument("--ensure", action="store_true", help="Create missing indexes before explaining")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    client = MongoClient(args.mongo_uri, serverSelectionTimeoutMS=5000)
+    collections = {
+        "data": client.PITCHBOOK['OrganizationDetails'],
+        "source": client.STARTUPSCRAPERDATA['OrganiztionDetails'],
+        "queue": client.PITCHBOOK['ScrapeQueue'],
+    }
+    if args.ensure:
+        ensure_indexes(collections["data"], collections["source"])
+    report = explain_report(collections, SEED_FILTER)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    client.close()
+    # Non-zero exit when a query scans a whole collection, for use in checks
+    sys.exit(1 if any(entry.get("collscan") for entry in report) else 0)
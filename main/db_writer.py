@@ -0,0 +1,529 @@
+"""
+Batched MongoDB persistence for scraped companies.
+Upserts are buffered and sent as one unordered bulk_write per batch, with
+the run_stats added_count increments folded into a single $inc. Only
+sections whose hash changed are written, guarded by the stored content hash,
+and batches that hit a connection error are re-buffered and retried with
+backoff.
+BackgroundWriter moves the writes off the scraping thread.
+"""
+
+import queue
+import threading
+import time
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure
+
+from details import build_change_update, build_upsert, section_hashes
+
+
+INSERTED = "inserted"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+ERROR = "error"
+
+# Backoff between retries of a batch that hit a connection error
+MAX_RETRY_DELAY = 30.0
+
+
+class BulkWriter:
+    """
+    Buffer company upserts and flush them by size or age.
+
+    A flush sends one unordered ``bulk_write`` plus, when documents were
+    inserted, one ``$inc`` of ``added_count`` on run_stats, so N companies
+    cost three round trips instead of up to 2N: the stored section hashes of
+    the batch are read with one ``find`` first, so changed companies only
+    ``$set`` the sections that differ and unchanged ones only bump
+    ``last_seen_at``. Those updates also match the stored ``content_hash``;
+    companies another writer changed between the read and the write match
+    nothing and are written in full by a second ``bulk_write``. Every
+    document gets an outcome ('inserted', 'updated',
+    'unchanged' or 'error'), which is logged and passed to ``on_outcome``.
+    Two writes of the same company within a batch are merged (later fields
+    win), as sequential ``$set`` would leave it.
+
+    A connection error (AutoReconnect, NotPrimaryError, server selection
+    timeout) is not a failed write: the batch goes back into the buffer and
+    is retried after an exponential backoff (see ``backoff``). Only write
+    errors the server reports per document, or a batch that still cannot be
+    sent after ``max_retries``, count as 'error'.
+    """
+
+    def __init__(self, collection, stats_collection=None, logger=None, unique_field="source_url",
+                 max_batch=100, max_delay=5.0, on_outcome=None, max_retries=5, retry_delay=1.0):
+        """
+        Initialize the writer.
+
+        Args:
+            collection: PITCHBOOK.OrganizationDetails
+            stats_collection: STARTUPSCRAPERDATA.run_stats, or None
+            logger: Logger instance
+            unique_field (str): Field used to identify uniqueness
+            max_batch (int): Flush when this many documents are buffered
+            max_delay (float): Flush on the next add once the oldest buffered
+                document is this many seconds old
+            on_outcome (callable, optional): Called as on_outcome(key, outcome, error)
+            max_retries (int): Connection errors in a row before a batch is
+                reported as 'error'
+            retry_delay (float): Backoff after the first connection error in
+                seconds, doubled on every further one
+        """
+        self.collection = collection
+        self.stats_collection = stats_collection
+        self.logger = logger
+        self.unique_field = unique_field
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.on_outcome = on_outcome
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._lock = threading.Lock()
+        self._buffer = {}  # key -> data, in arrival order
+        self._oldest = None
+        self._failures = 0  # connection errors in a row
+        self._retry_at = None
+        self.stats = {"flushes": 0, "documents": 0, "retries": 0,
+                      INSERTED: 0, UPDATED: 0, UNCHANGED: 0, ERROR: 0}
+
+    def _log(self, level, message):
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(message)
+
+    def add(self, data):
+        """
+        Buffer one company, flushing when the batch is full or old enough.
+
+        Args:
+            data (dict): Scraped company data
+
+        Returns:
+            list: Outcomes of the flush this add triggered, else []
+        """
+        if not data or self.unique_field not in data:
+            self._log("error", "Invalid data or missing unique field")
+            return []
+
+        with self._lock:
+            key = data[self.unique_field]
+            if key in self._buffer:
+                self._buffer[key] = dict(self._buffer[key], **data)
+            else:
+                self._buffer[key] = dict(data)
+            if self._oldest is None:
+                self._oldest = time.time()
+            due = len(self._buffer) >= self.max_batch or time.time() - self._oldest >= self.max_delay
+        return self.flush() if due and not self.backoff() else []
+
+    def pending(self):
+        """Number of buffered documents"""
+        with self._lock:
+            return len(self._buffer)
+
+    def backoff(self):
+        """Seconds until a batch that hit a connection error may be retried, 0 if none"""
+        with self._lock:
+            if self._retry_at is None:
+                return 0
+            return max(0.0, self._retry_at - time.time())
+
+    def _requeue(self, batch, error):
+        """Put a batch that could not be sent back in front of the buffer"""
+        with self._lock:
+            self._failures += 1
+            if self._failures > self.max_retries:
+                self._failures = 0
+                self._retry_at = None
+                return False
+            delay = min(self.retry_delay * 2 ** (self._failures - 1), MAX_RETRY_DELAY)
+            self._retry_at = time.time() + delay
+            # Documents added since the batch was taken are newer and win
+            buffer = {data[self.unique_field]: data for data in batch}
+            for key, data in self._buffer.items():
+                buffer[key] = dict(buffer[key], **data) if key in buffer else data
+            self._buffer = buffer
+            if self._oldest is None:
+                self._oldest = time.time()
+            self.stats["retries"] += 1
+            failures = self._failures
+        self._log("warning", f"Could not reach MongoDB, retrying {len(batch)} documents in {delay:.1f}s "
+                             f"({failures}/{self.max_retries}): {error}")
+        return True
+
+    def flush(self):
+        """
+        Write every buffered document.
+
+        Returns:
+            list: (key, outcome, error) per document
+        """
+        with self._lock:
+            batch = list(self._buffer.values())
+            self._buffer = {}
+            self._oldest = None
+        if not batch:
+            return []
+
+        keys = [data[self.unique_field] for data in batch]
+        try:
+            stored = {
+                doc[self.unique_field]: doc for doc in self.collection.find(
+                    {self.unique_field: {"$in": keys}}, {self.unique_field: 1, "section_hashes": 1, "content_hash": 1}
+                )
+            }
+        except Exception as e:
+            # Full upserts are still correct, just not minimal
+            self._log("warning", f"Could not read stored hashes, writing full documents: {e}")
+            stored = {}
+
+        operations, changes, guarded = [], [], {}
+        for index, data in enumerate(batch):
+            query, update, upsert, changed = build_change_update(
+                data, stored.get(data[self.unique_field]), self.unique_field
+            )
+            operations.append(UpdateOne(query, update, upsert=upsert))
+            changes.append(changed)
+            if not upsert:
+                # content_hash the document has once this update is applied
+                guarded[index] = update["$set"].get("content_hash", query["content_hash"])
+
+        upserted, errors, matched = set(), {}, None
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            upserted = set(result.upserted_ids)
+            matched = result.matched_count if guarded else None
+        except BulkWriteError as e:
+            # Unordered: the other operations were still applied
+            upserted = {entry["index"] for entry in e.details.get("upserted", [])}
+            errors = {entry["index"]: entry.get("errmsg") for entry in e.details.get("writeErrors", [])}
+            matched = e.details.get("nMatched", 0) if guarded else None
+        except ConnectionFailure as e:
+            # Failover or network blip. Re-sending is safe: every operation is
+            # an idempotent upsert, and the retry re-reads the stored hashes.
+            if self._requeue(batch, e):
+                return []
+            errors = {index: f"not written after {self.max_retries} retries: {e}" for index in range(len(batch))}
+        except Exception as e:
+            errors = {index: str(e) for index in range(len(batch))}
+        with self._lock:
+            self._failures = 0
+            self._retry_at = None
+        if matched is not None:
+            self._rewrite_stale(batch, guarded, matched, changes, upserted, errors)
+
+        outcomes = []
+        for index, data in enumerate(batch):
+            key = data[self.unique_field]
+            if index in errors:
+                outcomes.append((key, ERROR, errors[index]))
+                self._log("error", f"Error saving to DB: {key}: {errors[index]}")
+            elif index in upserted:
+                outcomes.append((key, INSERTED, None))
+                self._log("info", f"Inserted new document: {key}")
+            elif changes[index]:
+                outcomes.append((key, UPDATED, None))
+                self._log("info", f"Updated existing document: {key} ({', '.join(changes[index])})")
+            else:
+                outcomes.append((key, UNCHANGED, None))
+                self._log("info", f"Unchanged document: {key}")
+
+        inserted = sum(1 for _, outcome, _ in outcomes if outcome == INSERTED)
+        unchanged = sum(1 for _, outcome, _ in outcomes if outcome == UNCHANGED)
+        if inserted and self.stats_collection is not None:
+            try:
+                self.stats_collection.update_one({"_id": "update_run_stats"}, {"$inc": {"added_count": inserted}})
+            except Exception as e:
+                self._log("error", f"Error updating run stats (+{inserted} added): {e}")
+
+        with self._lock:
+            self.stats["flushes"] += 1
+            self.stats["documents"] += len(batch)
+            for _, outcome, _ in outcomes:
+                self.stats[outcome] += 1
+        self._log("info", f"Flushed {len(batch)} documents: {inserted} inserted, "
+                          f"{len(batch) - inserted - unchanged - len(errors)} updated, {unchanged} unchanged, "
+                          f"{len(errors)} errors")
+
+        if self.on_outcome:
+            for key, outcome, error in outcomes:
+                self.on_outcome(key, outcome, error)
+        return outcomes
+
+    def _rewrite_stale(self, batch, guarded, matched, changes, upserted, errors):
+        """
+        Write in full the companies whose guarded update matched nothing.
+
+        The bulk result only counts matches, so when fewer guarded updates
+        matched than were sent, the current content hashes are read back and
+        every company whose document does not hold the hash its update would
+        have left is upserted in full. ``changes``, ``upserted`` and
+        ``errors`` are updated in place.
+
+        Args:
+            batch (list): Documents of the flush
+            guarded (dict): index -> content_hash after its update, for the
+                non-upsert operations
+            matched (int): nMatched of the bulk write
+            changes (list): Changed section names per index
+            upserted (set): Indexes that inserted a document
+            errors (dict): index -> error message
+        """
+        guarded = {index: digest for index, digest in guarded.items() if index not in errors}
+        if not guarded:
+            return
+        # Upserts of companies that exist by now match instead of inserting
+        matched -= sum(1 for index in range(len(batch))
+                       if index not in guarded and index not in upserted and index not in errors)
+        if matched >= len(guarded):
+            return
+
+        keys = {batch[index][self.unique_field]: index for index in guarded}
+        try:
+            current = {
+                doc[self.unique_field]: doc.get("content_hash") for doc in self.collection.find(
+                    {self.unique_field: {"$in": list(keys)}}, {self.unique_field: 1, "content_hash": 1}
+                )
+            }
+            stale = [index for key, index in keys.items() if key not in current or current[key] != guarded[index]]
+        except Exception as e:
+            # A full write of fresh data is always correct
+            self._log("warning", f"Could not re-read content hashes, writing {len(keys)} documents in full: {e}")
+            stale = list(keys.values())
+        if not stale:
+            return
+
+        self._log("info", f"{len(stale)} documents changed since they were read, writing them in full")
+        operations = []
+        for index in stale:
+            query, update = build_upsert(batch[index], self.unique_field)
+            operations.append(UpdateOne(query, update, upsert=True))
+            changes[index] = sorted(section_hashes(batch[index], self.unique_field))
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            upserted.update(stale[position] for position in result.upserted_ids)
+        except BulkWriteError as e:
+            upserted.update(stale[entry["index"]] for entry in e.details.get("upserted", []))
+            errors.update({stale[entry["index"]]: entry.get("errmsg") for entry in e.details.get("writeErrors", [])})
+        except Exception as e:
+            errors.update({index: f"full rewrite failed: {e}" for index in stale})
+
+    def drain(self):
+        """
+        Flush until nothing is buffered, waiting out connection-error backoffs.
+
+        Returns:
+            list: (key, outcome, error) per document
+        """
+        outcomes = self.flush()
+        while self.pending():
+            time.sleep(self.backoff())
+            outcomes += self.flush()
+        return outcomes
+
+    def close(self):
+        """Flush what is left"""
+        return self.drain()
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+        self.outcomes = []
+
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """
+    Run a BulkWriter on its own thread behind a bounded queue.
+
+    ``submit`` returns as soon as the document is queued, so a slow or failing
+    over MongoDB no longer stalls the browser; when the queue is full it blocks
+    until the writer catches up (backpressure). While a batch waits out a
+    connection-error backoff the thread takes nothing from the queue, so a
+    long outage also ends in backpressure rather than an unbounded buffer.
+    ``flush`` waits until everything submitted so far is written and ``close``
+    flushes and stops the thread.
+    """
+
+    def __init__(self, writer, max_queue=500, logger=None):
+        """
+        Initialize and start the writer thread.
+
+        Args:
+            writer (BulkWriter): Writer the thread drives
+            max_queue (int): Documents that may wait before submit blocks
+            logger: Logger instance
+        """
+        self.writer = writer
+        self.logger = logger
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._enqueued = {}  # key -> time of the oldest unwritten submit
+        self._outcomes = []  # since the last flush request
+        self.stats = {
+            "submitted": 0, "max_depth": 0, "blocked": 0, "blocked_ms": 0.0,
+            "flushes": 0, "write_ms": 0.0, "write_ms_max": 0.0, "latency_ms": 0.0, "latency_ms_max": 0.0, "latency_n": 0,
+        }
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def _log(self, level, message):
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(message)
+
+    def submit(self, data, timeout=None):
+        """
+        Queue one company for writing, blocking while the queue is full.
+
+        Args:
+            data (dict): Scraped company data
+            timeout (float, optional): Give up after this many seconds
+
+        Returns:
+            bool: True if queued
+        """
+        if self._closed:
+            raise RuntimeError("BackgroundWriter is closed")
+        started = time.time()
+        try:
+            self._queue.put_nowait(data)
+        except queue.Full:
+            try:
+                self._queue.put(data, timeout=timeout)
+            except queue.Full:
+                self._log("error", f"DB write queue full for {timeout}s, dropped {data.get(self.writer.unique_field)}")
+                return False
+            finally:
+                with self._lock:
+                    self.stats["blocked"] += 1
+                    self.stats["blocked_ms"] += (time.time() - started) * 1000
+        with self._lock:
+            self.stats["submitted"] += 1
+            self.stats["max_depth"] = max(self.stats["max_depth"], self._queue.qsize())
+            key = data.get(self.writer.unique_field) if data else None
+            self._enqueued.setdefault(key, started)
+        return True
+
+    def depth(self):
+        """Documents waiting in the queue (not counting the writer's buffer)"""
+        return self._queue.qsize()
+
+    def _record(self, outcomes, started):
+        if not outcomes:
+            return
+        now = time.time()
+        elapsed = (now - started) * 1000
+        with self._lock:
+            self.stats["flushes"] += 1
+            self.stats["write_ms"] += elapsed
+            self.stats["write_ms_max"] = max(self.stats["write_ms_max"], elapsed)
+            for key, _, _ in outcomes:
+                enqueued = self._enqueued.pop(key, None)
+                if enqueued is not None:
+                    latency = (now - enqueued) * 1000
+                    self.stats["latency_ms"] += latency
+                    self.stats["latency_n"] += 1
+                    self.stats["latency_ms_max"] = max(self.stats["latency_ms_max"], latency)
+            self._outcomes.extend(outcomes)
+
+    def _run(self):
+        while True:
+            wait = self.writer.backoff()
+            if wait:
+                time.sleep(wait)
+                started = time.time()
+                self._record(self.writer.flush(), started)
+                continue
+            # Wake up in time to flush a partial batch that has aged out
+            timeout = self.writer.max_delay if self.writer.pending() else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                started = time.time()
+                self._record(self.writer.flush(), started)
+                continue
+
+            started = time.time()
+            try:
+                if item is _STOP or isinstance(item, _FlushRequest):
+                    self._record(self.writer.drain(), started)
+                    if item is _STOP:
+                        return
+                    with self._lock:
+                        item.outcomes, self._outcomes = self._outcomes, []
+                    item.done.set()
+                else:
+                    self._record(self.writer.add(item), started)
+            except Exception as e:
+                # Never let one bad document stop persistence
+                self._log("error", f"DB writer error: {e}")
+                if isinstance(item, _FlushRequest):
+                    item.done.set()
+
+    def flush(self, timeout=None):
+        """
+        Wait until everything submitted so far is written.
+
+        Args:
+            timeout (float, optional): Seconds to wait
+
+        Returns:
+            list: (key, outcome, error) for every document written since the
+                previous flush
+        """
+        if self._closed:
+            return []
+        request = _FlushRequest()
+        self._queue.put(request)
+        if not request.done.wait(timeout):
+            self._log("warning", f"DB writer flush did not finish within {timeout}s")
+        return request.outcomes
+
+    def close(self, timeout=60):
+        """Write what is queued and stop the thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self._log("warning", f"DB writer still running after {timeout}s, {self.depth()} documents queued")
+
+    def summary(self):
+        """
+        Queue and write metrics.
+
+        Returns:
+            dict: Queue depth, backpressure and mean/max flush and
+                submit-to-written latencies in ms
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        written = self.writer.stats["documents"]
+        return {
+            "depth": self.depth(),
+            "buffered": self.writer.pending(),
+            "max_depth": stats["max_depth"],
+            "submitted": stats["submitted"],
+            "written": written,
+            "retries": self.writer.stats["retries"],
+            "inserted": self.writer.stats[INSERTED],
+            "updated": self.writer.stats[UPDATED],
+            "unchanged": self.writer.stats[UNCHANGED],
+            "errors": self.writer.stats[ERROR],
+            "blocked": stats["blocked"],
+            "blocked_ms": round(stats["blocked_ms"], 1),
+            "flush_ms_mean": round(stats["write_ms"] / stats["flushes"], 1) if stats["flushes"] else None,
+            "flush_ms_max": round(stats["write_ms_max"], 1),
+            "latency_ms_mean": round(stats["latency_ms"] / stats["latency_n"], 1) if stats["latency_n"] else None,
+            "latency_ms_max": round(stats["latency_ms_max"], 1),
+        }
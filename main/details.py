@@ -4,14 +4,15 @@ Handles company detail extraction and database operations.
 """
 
 import requests
-from bs4 import BeautifulSoup
+import hashlib
 from datetime import datetime
+from urllib.parse import urljoin
 import time
 import random
-import re
 import os
 import json
 import logging
+from concurrent.futures import Future
 from pymongo import MongoClient
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -20,6 +21,15 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import undetected_chromedriver as uc
 from selenium_stealth import stealth
 from driver.get_driver import StartDriver
+from driver.pool import DriverPool
+from driver.proxy_pool import ProxyPool, CHOOSE_TIMEOUT
+from driver.tabs import TabSet
+from driver.resource_policy import ResourcePolicy
+from driver.readiness import PageKind, ReadinessCondition, wait_for_page, readiness_stats
+from pacing import AIMDPacer
+from archive import TIMEOUT, UNKNOWN
+from parsers import get_backend
+from schema import PROFILE_SCHEMA, normalize_key, clean_text
 
 
 # Constants
@@ -36,11 +46,58 @@ PROXIES = [
     "83.149.70.159:13082"
 ]
 
+CAPTCHA_MARKER = "Verify you are human"
+
+# Site root for search URLs; point it at a stand-in server (standin_server.py) for load tests
+BASE_URL = "https://pitchbook.com"
+
+# Bump when extract_pitchbook_data changes output, so archived results are re-parsed
+EXTRACTOR_VERSION = 1
+
+# Page readiness: return as soon as content or a captcha is on the page
+SEARCH_PAGE = PageKind(
+    'search',
+    [
+        ReadinessCondition('ready', selector="a[href*='/profiles/company/']"),
+        ReadinessCondition('captcha', text=CAPTCHA_MARKER),
+    ],
+    timeout=20,
+    settle_after_load=4,
+)
+
+PROFILE_PAGE = PageKind(
+    'profile',
+    [
+        ReadinessCondition('ready', selector='.pp-search-wrap__title'),
+        ReadinessCondition('captcha', text=CAPTCHA_MARKER),
+    ],
+    timeout=20,
+)
+
+
+# A profile that times out this often (across browsers) is given up
+MAX_PAGE_TIMEOUTS = 3
+
 
 # Utility Functions
-def get_proxies():
-    """Get random proxy configuration"""
-    prx = random.choice(PROXIES)
+def choose_proxy(proxy_pool=None):
+    """
+    Pick a proxy, health-weighted when a ProxyPool is given.
+    
+    Raises:
+        RuntimeError: No proxy became available within CHOOSE_TIMEOUT
+    """
+    if not proxy_pool:
+        return random.choice(PROXIES)
+    prx = proxy_pool.choose(timeout=CHOOSE_TIMEOUT)
+    if prx is None:
+        raise RuntimeError(f"No healthy proxy available within {CHOOSE_TIMEOUT}s")
+    return prx
+
+
+def get_proxies(proxy_pool=None):
+    """Get proxy configuration, health-weighted when a ProxyPool is given"""
+    prx = choose_proxy(proxy_pool)
     return {"http": f"http://{prx}", "https": f"http://{prx}"}
 
 
@@ -59,12 +116,12 @@ def sleep_random(min_sec=3, max_sec=6, for_reason=""):
     time.sleep(sleep_time)
 
 
-def get_options():
+def get_options(proxy_pool=None):
     """Get Chrome options with proxy configuration"""
     options = uc.ChromeOptions()
     options.add_argument("--headless")
     options.add_argument("--disable-blink-features=AutomationControlled")
-    prx = random.choice(PROXIES)
+    prx = choose_proxy(proxy_pool)
     options.add_argument(f"--proxy-server=http://{prx}")
     options.add_argument("--disable-web-security")
     options.add_argument("--allow-running-insecure-content")
@@ -73,153 +130,285 @@ def get_options():
     return options
 
 
-def normalize_key(text: str) -> str:
-    """Normalize text for use as dictionary key"""
-    text = text.strip().lower()
-    text = re.sub(r"[^a-z0-9]+", "_", text)
-    return text.strip("_")
+def apply_stealth(driver):
+    """Apply selenium-stealth fingerprint patches to a driver"""
+    stealth(
+        driver,
+        languages=["en-US", "en"],
+        vendor="Google Inc.",
+        platform="Win32",
+        webgl_vendor="Intel Inc.",
+        renderer="Intel Iris OpenGL Engine",
+        fix_hairline=True
+    )
 
 
-def clean_text(el):
-    """Extract and clean text from BeautifulSoup element"""
-    return el.get_text(" ", strip=True) if el else None
+# Section name -> Section (extractor and the container it reads from), in output order
+SECTIONS = PROFILE_SCHEMA.sections
 
 
-# Data Extraction Functions
-def extract_pitchbook_overview(soup):
-    """Extract overview section from PitchBook page"""
-    overview = {}
-    items = soup.select('[data-pp-overview-item]')
-    for item in items:
-        label_elem = item.select_one('.dont-break.text-small')
-        value_elem = item.select_one('.pp-overview-item__title')
-        if label_elem and value_elem:
-            key = normalize_key(label_elem.text)
-            overview[key] = value_elem.text.strip()
-    return overview
+def resolve_sections(sections=None):
+    """
+    Validate a section selection.
+    
+    Args:
+        sections (iterable, optional): Section names from SECTIONS; None for all
+        
+    Returns:
+        list: Requested section names in extraction order
+    """
+    if sections is None:
+        return list(SECTIONS)
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))} (choose from {', '.join(SECTIONS)})")
+    return [name for name in SECTIONS if name in sections]
 
 
-def extract_pitchbook_general_info(soup):
-    """Extract general information section"""
-    info = {}
-    gen_info_sec = soup.select_one('.general-info')
-    if not gen_info_sec:
-        return info
+def extract_pitchbook_data(html_content, url, backend=None, sections=None):
+    """
+    Extract all data from PitchBook company page.
     
-    desc_elem = gen_info_sec.select_one('.pp-description_text')
-    if desc_elem:
-        info['description'] = clean_text(desc_elem)
+    Args:
+        html_content (str): Page source
+        url (str): Profile URL
+        backend (str, optional): Parser backend ('bs4', 'lxml' or 'selectolax');
+            defaults to config.json "parser_backend"
+        sections (iterable, optional): Only extract these SECTIONS, e.g.
+            {'valuation_funding', 'investors'}; the bs4 backend then only builds
+            the subtrees of their containers. None extracts everything.
         
-    contact_items = gen_info_sec.select('.pp-contact-info_item')
-    for item in contact_items:
-        label_elem = item.select_one('h5, .font-weight-bold')
-        if label_elem:
-            label = label_elem.text.strip()
-            value_elem = item.select_one('a, .font-weight-regular')
-            if value_elem:
-                info[normalize_key(label)] = value_elem.get('title') or value_elem.text.strip()
-    
-    office_elem = gen_info_sec.select_one('.pp-contact-info_corporate-office')
-    if office_elem:
-        address_lines = [li.text.strip() for li in office_elem.select('ul li')]
-        info['corporate_office'] = ", ".join(address_lines)
+    Returns:
+        dict: company_name, source_url, scraped_at and the requested sections
+    """
+    names = resolve_sections(sections)
+    containers = None
+    if len(names) < len(SECTIONS):
+        containers = [PROFILE_SCHEMA.title] + [SECTIONS[name].container for name in names]
+    
+    parser = get_backend(backend)
+    soup = parser.parse(html_content, containers)
+    try:
+        title, sections = PROFILE_SCHEMA.extract(soup, parser, names)
+        data = {
+            'company_name': title.text.strip() if title else "Unknown",
+            'source_url': url,
+            'scraped_at': datetime.now().isoformat(),
+        }
+        data.update(sections)
+        return data
+    finally:
+        # Free the tree now rather than when the garbage collector gets to it
+        parser.release(soup)
+
+
+def extract_company_links(html_content, base_url=BASE_URL, backend=None):
+    """
+    Company profile URLs on a search results page.
+    
+    Args:
+        html_content (str): Search page source
+        base_url (str): Base for relative links
+        backend (str, optional): Parser backend; defaults to config.json
         
-    socials = {}
-    for social in gen_info_sec.select('.info-item__social div a'):
-        platform = social.get('aria-label', '').replace(' link', '').lower()
-        if platform:
-            socials[platform] = social.get('href')
-    if socials:
-        info['social_links'] = socials
+    Returns:
+        list: Profile URLs without query or fragment, in page order, deduplicated
+    """
+    parser = get_backend(backend)
+    root = parser.parse(html_content)
+    try:
+        company_urls = []
+        for link in parser.compile("a[href*='/profiles/company/']").select(root):
+            clean_url = urljoin(base_url, link.get('href')).split('?')[0].split('#')[0]
+            if clean_url not in company_urls:
+                company_urls.append(clean_url)
+        return company_urls
+    finally:
+        parser.release(root)
+
+
+def cached_profile(html_content, url, archive, sections=None):
+    """
+    Archive a profile page and look up its cached extraction.
+    
+    Args:
+        html_content (str): Page source as fetched
+        url (str): Profile URL
+        archive (HtmlArchive): Raw HTML archive
+        sections (iterable, optional): Only return these SECTIONS
         
-    return info
-
-
-def extract_pitchbook_table(section_soup):
-    """Extract table data from a section"""
-    if not section_soup:
-        return []
-    table = section_soup.find('table')
-    if not table:
-        return []
-    
-    headers = [normalize_key(th.text) for th in table.find_all('th')]
-    rows = []
-    tbody = table.find('tbody')
-    if not tbody:
-        return []
-    
-    for tr in tbody.find_all('tr'):
-        cells = tr.find_all('td')
-        if len(cells) == len(headers):
-            row_data = {}
-            for i, cell in enumerate(cells):
-                if cell.select_one('.data-table__gray-box'):
-                    row_data[headers[i]] = "[Locked/Blurred]"
-                else:
-                    row_data[headers[i]] = cell.get('title') or cell.text.strip()
-            rows.append(row_data)
-    return rows
-
-
-def extract_pitchbook_faqs(soup):
-    """Extract FAQ section"""
-    faqs = []
-    faq_items = soup.select('.pp-faqs-table li')
-    for item in faq_items:
-        q = item.select_one('h3')
-        a = item.select_one('p')
-        if q and a:
-            faqs.append({
-                'question': q.text.strip(),
-                'answer': a.text.strip()
-            })
-    return faqs
-
-
-def extract_pitchbook_data(html_content, url):
-    """Extract all data from PitchBook company page"""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    company_name = soup.select_one('.pp-search-wrap__title')
-    company_name = company_name.text.strip() if company_name else "Unknown"
-    
-    data = {
-        'company_name': company_name,
-        'source_url': url,
-        'scraped_at': datetime.now().isoformat(),
-        'overview': extract_pitchbook_overview(soup),
-        'general_info': extract_pitchbook_general_info(soup),
-        'valuation_funding': extract_pitchbook_table(soup.select_one('#funding')),
-        'cap_table': extract_pitchbook_table(soup.select_one('#captable')),
-        'competitors': extract_pitchbook_table(soup.select_one('#competitors')),
-        'investors': extract_pitchbook_table(soup.select_one('#investors')),
-        'patents': extract_pitchbook_table(soup.select_one('#patents')),
-        'faqs': extract_pitchbook_faqs(soup)
-    }
+    Returns:
+        tuple: (entry, data); entry is the archive.put result, data is None
+            when this content was never fully parsed by the current EXTRACTOR_VERSION
+    """
+    entry = archive.put(url, html_content, kind='profile')
+    data = archive.cached_result(entry['sha256'], EXTRACTOR_VERSION)
+    if data is not None:
+        data['source_url'] = url
+        data['scraped_at'] = datetime.now().isoformat()
+        if sections is not None:
+            data = {key: value for key, value in data.items() if key not in SECTIONS or key in sections}
+    return entry, data
+
+
+def archive_result(archive, entry, data, sections=None):
+    """
+    Record the extraction of an archived profile.
+    
+    A page that extracted to "Unknown" (challenge, blank or half-loaded DOM)
+    is tagged UNKNOWN so re-parsing skips it, and its result is not cached.
+    Only full extractions are cached.
     
-    # Extract research items
-    research = []
-    research_items = soup.select('#research .pp-related-research__item')
-    for item in research_items:
-        title = item.select_one('.pp-related-research__item-title')
-        date = item.select_one('.pp-related-research__item-release')
-        link = item.get('href')
-        if title:
-            research.append({
-                'title': title.text.strip(),
-                'date': date.text.strip() if date else None,
-                'url': "https://pitchbook.com" + link if link else None
-            })
-    data['related_research'] = research
+    Args:
+        archive (HtmlArchive): Raw HTML archive
+        entry (dict): archive.put result for the page
+        data (dict): Extracted company data
+        sections (iterable, optional): Sections the extraction was limited to
+    """
+    if data.get('company_name') == "Unknown":
+        archive.set_state(entry['fetch_id'], UNKNOWN)
+    elif sections is None:
+        archive.store_result(entry['sha256'], EXTRACTOR_VERSION, data)
+
+
+def parse_profile(html_content, url, archive=None, sections=None):
+    """
+    Extract a profile page, archiving the raw HTML first.
+    
+    With an archive, content that was already parsed by the current
+    EXTRACTOR_VERSION (same hash) reuses the cached result instead of
+    being parsed again. Only full, successful extractions are cached; a
+    section subset is served from a cached full result when there is one.
     
+    Args:
+        html_content (str): Page source as fetched
+        url (str): Profile URL
+        archive (HtmlArchive, optional): Raw HTML archive
+        sections (iterable, optional): Only extract these SECTIONS
+        
+    Returns:
+        dict: Extracted company data
+    """
+    if archive is None:
+        return extract_pitchbook_data(html_content, url, sections=sections)
+    
+    entry, data = cached_profile(html_content, url, archive, sections)
+    if data is None:
+        data = extract_pitchbook_data(html_content, url, sections=sections)
+        archive_result(archive, entry, data, sections)
     return data
 
 
 # Database Functions
+# Bookkeeping fields that change on every scrape; they are not content
+VOLATILE_FIELDS = frozenset((
+    "_id", "scraped_at", "updated_at", "created_at", "last_seen_at", "reparsed_at", "content_hash", "section_hashes"
+))
+
+
+def _hash(value):
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def section_hashes(data, unique_field="source_url"):
+    """
+    Hash every content field of a scraped company.
+
+    Args:
+        data (dict): Scraped company data
+        unique_field (str): Key field, not hashed
+
+    Returns:
+        dict: field -> sha256 of its canonical JSON
+    """
+    return {
+        field: _hash(value) for field, value in data.items()
+        if field != unique_field and field not in VOLATILE_FIELDS
+    }
+
+
+def content_hash(hashes):
+    """Hash of a whole document, from its section hashes"""
+    return _hash(sorted(hashes.items()))
+
+
+def build_upsert(data, unique_field="source_url"):
+    """
+    Filter and update document that upsert one company in full.
+    
+    Args:
+        data (dict): Scraped company data (not modified)
+        unique_field (str): Field used to identify uniqueness
+        
+    Returns:
+        tuple: (query, update)
+    """
+    now = datetime.utcnow()
+    hashes = section_hashes(data, unique_field)
+    data = dict(data, updated_at=now)
+    query = {unique_field: data[unique_field]}
+    update = {
+        "$set": dict(data, section_hashes=hashes, content_hash=content_hash(hashes), last_seen_at=now),
+        "$setOnInsert": {
+            "created_at": now
+        }
+    }
+    return query, update
+
+
+def build_change_update(data, stored, unique_field="source_url"):
+    """
+    Update that writes only the sections whose hash differs from the stored one.
+    
+    Sections missing from ``data`` (a partial scrape) keep their stored value
+    and hash. A scrape without changes only bumps 'last_seen_at'.
+
+    The query of an update also matches the stored 'content_hash', so it
+    only applies to the document the hashes were read from. When another
+    writer changed it in between, the update matches nothing and the caller
+    has to fall back to a full write (``build_upsert``).
+    
+    Args:
+        data (dict): Scraped company data
+        stored (dict or None): Stored document with at least 'section_hashes'
+            and 'content_hash', or None when the company is new (or unknown)
+        unique_field (str): Field used to identify uniqueness
+        
+    Returns:
+        tuple: (query, update, upsert, changed section names)
+    """
+    if stored is None:
+        query, update = build_upsert(data, unique_field)
+        return query, update, True, sorted(section_hashes(data, unique_field))
+
+    now = datetime.utcnow()
+    # None also matches documents written before content_hash existed
+    query = {unique_field: data[unique_field], "content_hash": stored.get("content_hash")}
+    old = stored.get("section_hashes") or {}
+    fresh = section_hashes(data, unique_field)
+    changed = sorted(field for field, digest in fresh.items() if old.get(field) != digest)
+    if not changed:
+        return query, {"$set": {"last_seen_at": now}}, False, []
+
+    update = {field: data[field] for field in changed}
+    update.update({f"section_hashes.{field}": fresh[field] for field in changed})
+    update["content_hash"] = content_hash(dict(old, **fresh))
+    if "scraped_at" in data:
+        update["scraped_at"] = data["scraped_at"]
+    update["updated_at"] = now
+    update["last_seen_at"] = now
+    return query, {"$set": update}, False, changed
+
+
 def save_to_db(data, collection, stats_collection, logger, unique_field="source_url"):
     """
     Insert or update company data in MongoDB.
 
+    Only sections that changed since the stored copy are written; an unchanged
+    company just gets a new 'last_seen_at'. If the stored copy changed between
+    the read and the write, the company is written in full instead.
+
     Args:
         data (dict): Scraped company data
         collection: MongoDB collection
@@ -234,33 +423,31 @@ def save_to_db(data, collection, stats_collection, logger, unique_field="source_
             print("Invalid data or missing unique field")
         return
 
-    data["updated_at"] = datetime.utcnow()
-    query = {unique_field: data[unique_field]}
-    update = {
-        "$set": data,
-        "$setOnInsert": {
-            "created_at": datetime.utcnow()
-        }
-    }
-    
     try:
-        result = collection.update_one(query, update, upsert=True)
-
-        if result.matched_count:
-            if logger:
-                logger.info(f"Updated existing document: {data[unique_field]}")
-            else:
-                print(f"Updated existing document: {data[unique_field]}")
-        elif result.upserted_id:
+        stored = collection.find_one({unique_field: data[unique_field]}, {"section_hashes": 1, "content_hash": 1})
+        query, update, upsert, changed = build_change_update(data, stored, unique_field)
+        result = collection.update_one(query, update, upsert=upsert)
+        if not upsert and not result.matched_count:
+            # Changed (or deleted) since it was read; the section diff no longer applies
+            query, update = build_upsert(data, unique_field)
+            result = collection.update_one(query, update, upsert=True)
+            changed = sorted(section_hashes(data, unique_field))
+
+        if result.upserted_id:
             if stats_collection is not None:
                 stats_collection.update_one(
                     {"_id": "update_run_stats"},
                     {"$inc": {"added_count": 1}}
                 )
-            if logger:
-                logger.info(f"Inserted new document: {data[unique_field]}")
-            else:
-                print(f"Inserted new document: {data[unique_field]}")
+            message = f"Inserted new document: {data[unique_field]}"
+        elif changed:
+            message = f"Updated existing document: {data[unique_field]} ({', '.join(changed)})"
+        else:
+            message = f"Unchanged document: {data[unique_field]}"
+        if logger:
+            logger.info(message)
+        else:
+            print(message)
     except Exception as e:
         if logger:
             logger.error(f"Error saving to DB: {e}")
@@ -275,7 +462,8 @@ class ScrapeCompanyDetails:
     Uses StartDriver for driver management.
     """
     
-    def __init__(self, url, logger=None, driver_type='undetected'):
+    def __init__(self, url, logger=None, driver_type='undetected', driver_pool=None, block_resources=True,
+                 pacer=None, fast_path=None, archive=None, sections=None, parse_pool=None):
         """
         Initialize the scraper.
         
@@ -283,6 +471,17 @@ class ScrapeCompanyDetails:
             url (str): Company URL to scrape
             logger: Logger instance
             driver_type (str): Type of driver to use
+            driver_pool (DriverPool, optional): Shared pool to lease browsers from.
+                If None, a private single-browser pool is used.
+            block_resources (bool): Block images, fonts, media and trackers in the
+                private pool (a shared pool brings its own policy)
+            pacer (AIMDPacer, optional): Per-proxy pacing shared with other scrapers.
+                If None, an in-memory pacer is used.
+            fast_path (HttpFastPath, optional): Try a plain HTTP fetch before
+                leasing a browser, and seed it with cookies after browser loads
+            archive (HtmlArchive, optional): Archive for the raw profile HTML
+            sections (iterable, optional): Only extract these SECTIONS; None for all
+            parse_pool (ParsePool, optional): Process pool used by scrape_deferred
         """
         self.url = url
         
@@ -296,25 +495,39 @@ class ScrapeCompanyDetails:
         self.driver_instance = None
         self.driver = None
         self.wait = None
+        self.pages_loaded = 0
+        self.captchas = 0
+        
+        self.owns_pool = driver_pool is None
+        self.driver_pool = driver_pool or DriverPool(
+            driver_type=driver_type,
+            max_size=1,
+            on_create=apply_stealth,
+            logger=logger,
+            resource_policy=ResourcePolicy() if block_resources else None,
+            proxy_pool=ProxyPool(PROXIES, state_path=None, logger=logger)
+        )
+        self.pacer = pacer or AIMDPacer(state_path=None)
+        self.fast_path = fast_path
+        self.archive = archive
+        self.sections = resolve_sections(sections) if sections is not None else None
+        self.parse_pool = parse_pool
+
+    @property
+    def proxy(self):
+        """Proxy of the leased browser, used as the pacing key"""
+        return self.driver_instance.proxy if self.driver_instance else None
 
     def start_driver(self):
-        """Initialize and start the WebDriver"""
+        """Check out a warm WebDriver from the pool"""
         try:
-            self.driver_instance = StartDriver(driver_type=self.driver_type)
-            self.driver = self.driver_instance.get_driver()
+            self.driver_instance = self.driver_pool.checkout()
+            self.driver = self.driver_instance.driver if self.driver_instance else None
+            self.pages_loaded = 0
+            self.captchas = 0
             
             if self.driver:
                 self.wait = WebDriverWait(self.driver, 10)
-                # Apply stealth
-                stealth(
-                    self.driver, 
-                    languages=["en-US", "en"], 
-                    vendor="Google Inc.", 
-                    platform="Win32", 
-                    webgl_vendor="Intel Inc.", 
-                    renderer="Intel Iris OpenGL Engine", 
-                    fix_hairline=True
-                )
                 self.logger.info("✓ Driver started successfully")
                 return True
             else:
@@ -375,17 +588,30 @@ class ScrapeCompanyDetails:
         except TimeoutException:
             return False
 
-    def quit(self):
-        """Quit driver and cleanup"""
+    def quit(self, recycle=False):
+        """
+        Return the driver to the pool.
+        
+        Args:
+            recycle (bool): Close the browser instead of keeping it warm
+                (captcha or error)
+        """
         try:
             if self.driver_instance:
-                self.driver_instance.CloseDriver()
-                self.logger.info("✓ Driver quit successfully")
+                self.driver_pool.checkin(
+                    self.driver_instance, recycle=recycle, pages=max(1, self.pages_loaded), captchas=self.captchas
+                )
+                self.logger.info("✓ Driver released" + (" for recycling" if recycle else ""))
         except Exception as e:
             self.logger.error(f"✗ Quit failed: {e}")
+        finally:
+            self.driver_instance = None
+            self.driver = None
+            self.wait = None
         
     def get_driver_url(self):
-        """Navigate to URL and handle captcha"""
+        """Navigate to URL and handle captcha and pages that never become ready"""
+        timeouts = 0
         for attempt in range(20):
             try:
                 if not self.driver:
@@ -395,29 +621,46 @@ class ScrapeCompanyDetails:
                 self.logger.info(f"Attempt {attempt + 1}: Navigating to {self.url}")
                 
                 for retry in range(5):
+                    self.pacer.wait_turn(self.proxy, reason="company profile")
                     self.driver.get(self.url)
-                    sleep_random(for_reason="waiting for page load")
+                    state, elapsed = wait_for_page(self.driver, PROFILE_PAGE)
+                    self.pages_loaded += 1
+                    self.driver_pool.report_page(self.driver_instance, state, elapsed)
                     
-                    body_text = self.driver.find_element(By.TAG_NAME, 'body').text
-                    if "Verify you are human by completing the action below" in body_text:
+                    if state == 'captcha':
+                        self.captchas += 1
                         self.logger.warning("Captcha detected, retrying...")
-                        sleep_random(5, 10)
+                        self.pacer.failure(self.proxy, "captcha")
+                        continue
+                    elif state == 'timeout':
+                        # Never parse a page that did not become ready
+                        timeouts += 1
+                        self.pacer.failure(self.proxy, "timeout")
+                        if timeouts >= MAX_PAGE_TIMEOUTS:
+                            self.logger.error(f"Page not ready after {timeouts} timeouts, giving up")
+                            if self.archive:
+                                self.archive.put(self.url, self.driver.page_source, kind='profile', state=TIMEOUT)
+                            return None
+                        self.logger.warning(f"Page not ready after {elapsed:.2f}s, retrying...")
                         continue
                     else:
-                        self.logger.info("✓ Page loaded successfully")
+                        self.logger.info(f"✓ Page loaded successfully ({state} in {elapsed:.2f}s)")
                         break
                 else:
-                    # All retries failed
-                    self.quit()
+                    # All retries failed, this browser is flagged
+                    self.quit(recycle=True)
                     continue
                 
                 # Success - get page source
                 self.company_resource = self.driver.page_source
+                if self.fast_path:
+                    self.fast_path.seed_from_driver(self.driver_instance)
                 return self.company_resource
                 
             except Exception as e:
                 self.logger.error(f"Error navigating to URL: {e}")
-                self.quit()
+                self.driver_pool.report_page(self.driver_instance, 'error')
+                self.quit(recycle=True)
                 continue
         
         self.logger.error("Failed to bypass captcha after multiple attempts.")
@@ -427,20 +670,44 @@ class ScrapeCompanyDetails:
         """Get the stored page source"""
         return self.company_resource
 
+    def fetch_fast(self):
+        """
+        Try the HTTP fast path.
+        
+        Returns:
+            dict: Extracted data, or {} when the page needs a browser
+        """
+        if not self.fast_path:
+            return {}
+        
+        state, html = self.fast_path.fetch(self.url)
+        if state == 'ready':
+            data = parse_profile(html, self.url, self.archive, self.sections)
+            if data.get('company_name') != "Unknown":
+                self.company_resource = html
+                self.logger.info("✓ Served by HTTP fast path")
+                return data
+            state = 'missing'
+        self.logger.info(f"HTTP fast path {state}, escalating to Chrome")
+        return {}
+
     def extract_company_data(self):
-        """Extract company data from page source"""
-        if not self.driver:
-            self.logger.error("Driver not initialized.")
+        """Extract company data from the page source captured by get_driver_url"""
+        if not self.company_resource:
+            self.logger.error("No page source captured.")
             return {}
         
-        page_source = self.driver.page_source 
-        return extract_pitchbook_data(page_source, self.url)
+        return parse_profile(self.company_resource, self.url, self.archive, self.sections)
 
     def scrape(self):
         """Main scraping method"""
         try:
             self.logger.info(f"Scraping company details: {self.url}")
             
+            data = self.fetch_fast()
+            if data:
+                return data
+            
             # Get page
             if not self.get_driver_url():
                 self.logger.error("Failed to load page")
@@ -449,21 +716,87 @@ class ScrapeCompanyDetails:
             # Extract data
             data = self.extract_company_data()
             
+            if data.get('company_name') == "Unknown":
+                self.pacer.failure(self.proxy, "unknown")
+            else:
+                self.pacer.success(self.proxy)
+            
             return data
         except Exception as e:
             self.logger.error(f"Error during scraping: {e}")
             return {}
         finally:
             self.quit()
+            if self.owns_pool:
+                self.driver_pool.close_all()
+
+    def scrape_deferred(self):
+        """
+        Load the page and hand extraction to the parse pool.
+        
+        The browser is checked back in as soon as the page source is captured,
+        so it can load the next URL while this one is parsed. Without a
+        parse pool this is scrape() wrapped in a finished future.
+        
+        Returns:
+            Future: Resolves to the extracted dict ({} when the page failed to load)
+        """
+        if self.parse_pool is None:
+            return completed_future(self.scrape())
+        
+        try:
+            self.logger.info(f"Scraping company details: {self.url}")
+            
+            data = self.fetch_fast()
+            if data:
+                return completed_future(data)
+            
+            if not self.get_driver_url():
+                self.logger.error("Failed to load page")
+                return completed_future({})
+            
+            proxy, pacer = self.proxy, self.pacer
+            future = self.parse_pool.submit_profile(self.company_resource, self.url, self.archive, self.sections)
+            
+            def record(future):
+                if future.exception() is not None:
+                    return
+                if future.result().get('company_name') == "Unknown":
+                    pacer.failure(proxy, "unknown")
+                else:
+                    pacer.success(proxy)
+            
+            future.add_done_callback(record)
+            return future
+        except Exception as e:
+            self.logger.error(f"Error during scraping: {e}")
+            return completed_future({})
+        finally:
+            self.quit()
+            if self.owns_pool:
+                self.driver_pool.close_all()
+
 
+def completed_future(value):
+    """Future that is already resolved to ``value``"""
+    future = Future()
+    future.set_result(value)
+    return future
 
-def scrape_company(url, logger=None):
+
+def scrape_company(url, logger=None, driver_pool=None, pacer=None, fast_path=None, archive=None, sections=None):
     """
     Convenience function to scrape a company.
     
     Args:
         url (str): Company URL
         logger: Logger instance
+        driver_pool (DriverPool, optional): Shared browser pool. If None, a
+            pool is created for the attempts below and closed afterwards.
+        pacer (AIMDPacer, optional): Shared per-proxy pacing
+        fast_path (HttpFastPath, optional): Shared HTTP sessions tried before Chrome
+        archive (HtmlArchive, optional): Raw HTML archive
+        sections (iterable, optional): Only extract these SECTIONS; None for all
         
     Returns:
         dict: Scraped company data
@@ -473,16 +806,33 @@ def scrape_company(url, logger=None):
         if not hasattr(logger, 'handlers') or not logger.handlers:
             logging.basicConfig(level=logging.INFO)
     
+    owns_pool = driver_pool is None
+    if owns_pool:
+        driver_pool = DriverPool(
+            driver_type='undetected',
+            on_create=apply_stealth,
+            logger=logger,
+            resource_policy=ResourcePolicy(),
+            proxy_pool=ProxyPool(PROXIES, state_path=None, logger=logger)
+        )
+    if pacer is None:
+        pacer = AIMDPacer(state_path=None)
+    
     data = {}
-    for attempt in range(3):
-        scraper = ScrapeCompanyDetails(url, logger)
-        data = scraper.scrape()
-        
-        if data and data.get('company_name') != "Unknown":
-            logger.info(f"Successfully scraped data for {url}")
-            return data
-        else:
-            logger.info(f"Attempt {attempt + 1}: Could not successfully scrape data for {url}")
+    try:
+        for attempt in range(3):
+            scraper = ScrapeCompanyDetails(url, logger, driver_pool=driver_pool, pacer=pacer, fast_path=fast_path,
+                                           archive=archive, sections=sections)
+            data = scraper.scrape()
+            
+            if data and data.get('company_name') != "Unknown":
+                logger.info(f"Successfully scraped data for {url}")
+                return data
+            else:
+                logger.info(f"Attempt {attempt + 1}: Could not successfully scrape data for {url}")
+    finally:
+        if owns_pool:
+            driver_pool.close_all()
     
     if not data or data.get('company_name') == "Unknown":
         logger.error(f"Failed to scrape data for {url} after 3 attempts")
@@ -491,6 +841,124 @@ def scrape_company(url, logger=None):
     return data
 
 
+def scrape_companies_multitab(urls, logger, driver_pool, tabs=4, isolate=True,
+                             timeout=30, max_captcha_retries=5, pacer=None, archive=None, sections=None,
+                             parse_pool=None):
+    """
+    Scrape several company profiles concurrently in tabs of one browser.
+    
+    Args:
+        urls (list): Company URLs
+        logger: Logger instance
+        driver_pool (DriverPool): Pool to lease the browser from
+        tabs (int): Number of tabs (or browser contexts) to open
+        isolate (bool): Give each tab its own CDP browser context
+        timeout (float): Seconds to wait for a profile before giving up on it
+        max_captcha_retries (int): Reloads per URL when a captcha is shown
+        pacer (AIMDPacer, optional): Per-proxy pacing applied before each tab navigation
+        archive (HtmlArchive, optional): Raw HTML archive
+        sections (iterable, optional): Only extract these SECTIONS; None for all
+        parse_pool (ParsePool, optional): Parse ready pages in worker processes;
+            data is then a Future of the dict, so tabs keep loading meanwhile
+        
+    Yields:
+        tuple: (url, data) as each page becomes ready; data is {} on failure
+    """
+    if not urls:
+        return
+    
+    instance = driver_pool.checkout()
+    if not instance:
+        logger.error("✗ Failed to start driver for multi-tab scraping")
+        for url in urls:
+            yield url, {}
+        return
+    
+    def prepare_tab(driver):
+        # Stealth and request blocking are per-target, so every tab needs them
+        apply_stealth(driver)
+        if instance.resource_policy:
+            instance.resource_policy.apply(driver)
+    
+    pacer = pacer or AIMDPacer(state_path=None)
+    proxy = instance.proxy
+    
+    def record_parsed(data):
+        if data.get('company_name') == "Unknown":
+            pacer.failure(proxy, "unknown")
+        else:
+            pacer.success(proxy)
+    
+    def on_retry(url, state):
+        nonlocal retried, captchas
+        retried += 1
+        if state == 'captcha':
+            captchas += 1
+        driver_pool.report_page(instance, state)
+        pacer.failure(proxy, state)
+    
+    tab_set = TabSet(instance.driver, size=min(tabs, len(urls)), isolate=isolate, on_tab_open=prepare_tab)
+    done = set()
+    captchas = 0
+    retried = 0
+    recycle = False
+    try:
+        tab_set.open()
+        logger.info(f"Loading {len(urls)} profiles across {len(tab_set.handles)} tabs")
+        
+        results = tab_set.run(
+            urls,
+            PROFILE_PAGE.script,
+            timeout=timeout,
+            retry_states={'captcha': max_captcha_retries, 'timeout': 1},
+            before_navigate=lambda url: pacer.wait_turn(proxy, reason="company profile tab"),
+            on_retry=on_retry
+        )
+        for url, state, page_source, elapsed in results:
+            done.add(url)
+            readiness_stats.record(PROFILE_PAGE.name, state, elapsed)
+            driver_pool.report_page(instance, state, elapsed)
+            if state == 'captcha':
+                captchas += 1
+                pacer.failure(proxy, "captcha")
+                logger.warning(f"Captcha persisted for {url}")
+                yield url, {}
+                continue
+            if state == 'timeout':
+                pacer.failure(proxy, "timeout")
+                logger.warning(f"Profile not ready after {elapsed:.2f}s: {url}")
+                if archive and page_source:
+                    archive.put(url, page_source, kind='profile', state=TIMEOUT)
+                yield url, {}
+                continue
+            
+            logger.info(f"✓ Tab ready for {url} ({state}) in {elapsed:.2f}s")
+            if parse_pool is not None:
+                future = parse_pool.submit_profile(page_source, url, archive, sections)
+                future.add_done_callback(lambda f: f.exception() is None and record_parsed(f.result()))
+                yield url, future
+                continue
+            data = parse_profile(page_source, url, archive, sections)
+            record_parsed(data)
+            yield url, data
+    except Exception as e:
+        logger.error(f"Error in multi-tab scraping: {e}")
+        recycle = True
+    finally:
+        try:
+            tab_set.close()
+        except Exception as e:
+            logger.error(f"Error closing tabs: {e}")
+            recycle = True
+        # captchas counts both retried and final captcha pages
+        driver_pool.checkin(instance, recycle=recycle or captchas > 0, pages=len(done) + retried,
+                            captchas=captchas)
+    
+    for url in urls:
+        if url not in done:
+            yield url, {}
+
+
 # Test code
 if __name__ == "__main__":
     from pymongo import MongoClient
@@ -2,6 +2,11 @@
 Driver package initialization
 """
 from .get_driver import StartDriver
+from .pool import DriverPool
+from .startup_cache import StartupCache
+from .resource_policy import ResourcePolicy
+from .identities import Identity, IdentityStore
+from .proxy_pool import ProxyPool
 from .utils import get_chrome_version
 
-__all__ = ['StartDriver', 'get_chrome_version']
+__all__ = ['StartDriver', 'DriverPool', 'StartupCache', 'ResourcePolicy', 'Identity', 'IdentityStore', 'ProxyPool', 'get_chrome_version']
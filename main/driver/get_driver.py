@@ -4,6 +4,9 @@ import os
 import time
 import requests
 from .utils import get_chrome_version
+from .startup_cache import StartupCache, timed, format_timings
+from .instance_dirs import resolve_instance_root, reaper, DEFAULT_MIN_FREE_MB
+from .proxy_pool import CHOOSE_TIMEOUT
 from tqdm import tqdm
 
 # Selenium imports
@@ -29,23 +32,73 @@ class StartDriver:
     Provides utilities for element interaction, file downloads, and cookie management.
     """
     
-    def __init__(self, driver_type='normal', instance_id=None):
+    # Shared by all instances in the process
+    startup_cache = StartupCache()
+    
+    def __init__(self, driver_type='normal', instance_id=None, use_startup_cache=True,
+                 instance_root=None, min_free_mb=None, resource_policy=None, proxy=None, identity=None,
+                 proxy_pool=None):
         """
         Initialize the driver manager.
         
         Args:
             driver_type (str): Type of driver - 'normal' or 'undetected'
             instance_id (str, optional): Unique ID for this instance. If None, a random one will be generated.
+            use_startup_cache (bool): Use the cached patched chromedriver and template profile
+            instance_root (str, optional): Root for the temp driver and profile directories,
+                e.g. a RAM-backed '/dev/shm/pitchbook'. Defaults to config "instance_root",
+                then the working directory.
+            min_free_mb (int, optional): Free space required on instance_root, otherwise
+                the working directory is used. Defaults to config "instance_root_min_free_mb".
+            resource_policy (ResourcePolicy, optional): Blocks images, fonts, media and
+                trackers via CDP and tracks the bandwidth saved
+            proxy (str, optional): "host:port" of the HTTP proxy for this browser
+            identity (Identity, optional): Persistent identity whose profile, cookies,
+                User-Agent and proxy are used instead of a throwaway profile
+            proxy_pool (ProxyPool, optional): Health-weighted proxy choice when
+                neither ``proxy`` nor ``identity`` is given
         """
         self.driver_type = driver_type
         self.instance_id = instance_id or str(uuid.uuid4())[:8]
+        self.use_startup_cache = use_startup_cache
+        self.resource_policy = resource_policy
+        self.identity = identity
+        if identity:
+            proxy = identity.proxy
+        elif proxy is None and proxy_pool:
+            # Bounded, so a pool with every circuit open cannot stall the caller
+            proxy = proxy_pool.choose(timeout=CHOOSE_TIMEOUT)
+        self.proxy = proxy
+        self.proxy_pool = proxy_pool
+        self.chrome_version = None
+        self.launch_timings = {}
+        
+        # Load config
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.json')
+        try:
+            with open(config_path, "r") as file:
+                config = json.load(file)
+            self.headless = config.get("headless", False)
+        except FileNotFoundError:
+            print(f"Config file not found at {config_path}, using default headless=False")
+            config = {}
+            self.headless = False
+        
+        if instance_root is None:
+            instance_root = config.get("instance_root")
+        if min_free_mb is None:
+            min_free_mb = config.get("instance_root_min_free_mb", DEFAULT_MIN_FREE_MB)
         
         # Define paths
         self.base_dir = os.getcwd()
+        self.instance_root = resolve_instance_root(instance_root, min_free_mb, fallback=self.base_dir)
         self.download_path = os.path.join(self.base_dir, 'downloads', self.instance_id)
         self.cookies_path = os.path.join(self.base_dir, 'cookies')
-        self.temp_dir = os.path.join(self.base_dir, 'temp_drivers', self.instance_id)
-        self.profile_dir = os.path.join(self.base_dir, 'profiles', self.instance_id)
+        self.temp_dir = os.path.join(self.instance_root, 'temp_drivers', self.instance_id)
+        if identity:
+            self.profile_dir = identity.profile_dir
+        else:
+            self.profile_dir = os.path.join(self.instance_root, 'profiles', self.instance_id)
 
         # Create directories
         # os.makedirs(self.download_path, exist_ok=True)
@@ -55,16 +108,6 @@ class StartDriver:
         
         self.driver = None
         self.options = None
-        
-        # Load config
-        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.json')
-        try:
-            with open(config_path, "r") as file:
-                config = json.load(file)
-            self.headless = config.get("headless", False)
-        except FileNotFoundError:
-            print(f"Config file not found at {config_path}, using default headless=False")
-            self.headless = False
     
     def driver_arguments(self):
         """Configure common Chrome driver arguments"""
@@ -82,6 +125,9 @@ class StartDriver:
         # Instance isolation: unique profile directory
         self.options.add_argument(f'--user-data-dir={self.profile_dir}')
         
+        if self.proxy:
+            self.options.add_argument(f'--proxy-server=http://{self.proxy}')
+        
         if self.driver_type == 'normal':
             self.options.add_argument("--disable-blink-features=AutomationControlled") 
             self.options.add_argument("--incognito")
@@ -102,13 +148,106 @@ class StartDriver:
         }
         self.options.add_experimental_option("prefs", prefs)
         
+        if self.resource_policy:
+            # Performance log feeds the resource policy's bandwidth report
+            self.options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        
+    def _prepare_launch(self):
+        """
+        Resolve cached startup artifacts before launching Chrome.
+        
+        Returns:
+            str or None: Path to a pre-patched chromedriver for undetected drivers
+        """
+        self.launch_timings = {}
+        with timed(self.launch_timings, 'chrome_version'):
+            self.chrome_version = get_chrome_version()
+        
+        if not self.use_startup_cache:
+            return None
+        
+        driver_executable_path = None
+        try:
+            with timed(self.launch_timings, 'profile'):
+                if self.identity and self.identity.is_warm:
+                    self.identity.clear_profile_locks()
+                else:
+                    self.startup_cache.clone_profile(self.chrome_version, self.profile_dir)
+            if self.driver_type != 'normal':
+                with timed(self.launch_timings, 'chromedriver'):
+                    driver_executable_path = self.startup_cache.install_chromedriver(
+                        self.chrome_version, self.temp_dir
+                    )
+        except Exception as e:
+            print(f"Startup cache unavailable, falling back to a cold start: {e}")
+        return driver_executable_path
+    
+    def _pick_user_agent(self, user_agents):
+        """Random User-Agent, fixed for the lifetime of an identity"""
+        if self.identity:
+            if not self.identity.user_agent:
+                self.identity.user_agent = random.choice(user_agents)
+            return self.identity.user_agent
+        return random.choice(user_agents)
+    
+    def _restore_identity_cookies(self):
+        """Load the identity's cookie jar into the browser through CDP"""
+        if not self.identity:
+            return
+        cookies = self.identity.load_cookies()
+        if not cookies:
+            return
+        params = []
+        for cookie in cookies:
+            param = {k: cookie[k] for k in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite')
+                     if k in cookie}
+            # Session cookies carry expires=-1
+            if cookie.get('expires', -1) > 0:
+                param['expires'] = cookie['expires']
+            params.append(param)
+        with timed(self.launch_timings, 'cookies'):
+            try:
+                self.driver.execute_cdp_cmd('Network.setCookies', {'cookies': params})
+            except Exception as e:
+                print(f"Error restoring identity cookies: {e}")
+    
+    def _apply_resource_policy(self):
+        """Install request blocking on the driver's current tab"""
+        if not self.resource_policy:
+            return
+        with timed(self.launch_timings, 'resource_policy'):
+            try:
+                self.resource_policy.apply(self.driver)
+            except Exception as e:
+                print(f"Error applying resource policy: {e}")
+    
+    def collect_resource_stats(self):
+        """
+        Add network events since the last call to the resource policy report.
+        
+        Returns:
+            dict: Counts for the drained events
+        """
+        if not self.resource_policy or self.driver is None:
+            return {}
+        return self.resource_policy.collect(self.driver)
+    
+    def _report_launch(self):
+        """Print where the launch time went"""
+        print(f"Driver {self.instance_id} launch: {format_timings(self.launch_timings)}")
+    
     def get_driver(self):
         """
         Get a configured Chrome WebDriver instance.
         
         Returns:
-            WebDriver: Configured Chrome WebDriver instance
+            WebDriver: Configured Chrome WebDriver instance, or None when the
+                proxy pool had no usable proxy
         """
+        if self.proxy_pool and not self.identity and self.proxy is None:
+            # Never fall back to a direct connection
+            print("No healthy proxy available, not launching a browser")
+            return None
         if not self.headless:
             self.get_local_driver()
             return self.driver
@@ -125,45 +264,56 @@ class StartDriver:
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 13_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.1 Safari/605.1.15',
         ]
 
+        # Unique pre-patched driver executable for this instance to avoid race conditions
+        driver_executable_path = self._prepare_launch()
+        
         for _ in range(30):
             try:
                 if self.driver_type == 'normal':
                     from selenium import webdriver
-                    user_agent = random.choice(user_agents)
+                    user_agent = self._pick_user_agent(user_agents)
                     self.options = webdriver.ChromeOptions()
                     self.options.add_argument(f'user-agent={user_agent}')
                     self.options.add_argument(f'--headless=new')
                     self.driver_arguments()
                     self.options.add_argument(f"download.default_directory={self.download_path}")
 
-                    self.driver = webdriver.Chrome(options=self.options)
+                    with timed(self.launch_timings, 'chrome_start'):
+                        self.driver = webdriver.Chrome(options=self.options)
                     params = {
                         "behavior": "allow",
                         "downloadPath": self.download_path
                     }
-                    self.driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+                    with timed(self.launch_timings, 'cdp_setup'):
+                        self.driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+                    self._apply_resource_policy()
+                    self._restore_identity_cookies()
+                    self._report_launch()
                     return self.driver
                 else:
                     import undetected_chromedriver as uc
-                    user_agent = random.choice(user_agents)
+                    user_agent = self._pick_user_agent(user_agents)
                     self.options = uc.ChromeOptions()
                     self.options.add_argument(f'user-agent={user_agent}')
                     self.driver_arguments()
                     
-                    # Ensure a unique driver executable for this instance to avoid race conditions
-                    driver_executable_path = os.path.join(self.temp_dir, 'chromedriver')
-                    
-                    self.driver = uc.Chrome(
-                        options=self.options, 
-                        use_subprocess=True, 
-                        headless=True, 
-                        version_main=get_chrome_version()
-                    )
+                    with timed(self.launch_timings, 'chrome_start'):
+                        self.driver = uc.Chrome(
+                            options=self.options, 
+                            use_subprocess=True, 
+                            headless=True, 
+                            version_main=self.chrome_version,
+                            driver_executable_path=driver_executable_path
+                        )
                     params = {
                         "behavior": "allow",
                         "downloadPath": self.download_path
                     }
-                    self.driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+                    with timed(self.launch_timings, 'cdp_setup'):
+                        self.driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+                    self._apply_resource_policy()
+                    self._restore_identity_cookies()
+                    self._report_launch()
                     return self.driver
             except Exception as e:
                 print(f"Error creating headless driver: {e}")
@@ -188,37 +338,54 @@ class StartDriver:
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 13_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.1 Safari/605.1.15',
         ]
         
+        driver_executable_path = self._prepare_launch()
+        
         for _ in range(30):
             try:
                 if self.driver_type == 'normal':
                     from selenium import webdriver
-                    user_agent = random.choice(user_agents)
+                    user_agent = self._pick_user_agent(user_agents)
                     self.options = webdriver.ChromeOptions()
                     self.options.add_argument(f'user-agent={user_agent}')
                     self.driver_arguments()
                     self.options.add_argument("--incognito")
                     self.options.add_argument(f"download.default_directory={self.download_path}")
                     
-                    self.driver = webdriver.Chrome(options=self.options)
+                    with timed(self.launch_timings, 'chrome_start'):
+                        self.driver = webdriver.Chrome(options=self.options)
                     params = {
                         "behavior": "allow",
                         "downloadPath": self.download_path
                     }
-                    self.driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+                    with timed(self.launch_timings, 'cdp_setup'):
+                        self.driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+                    self._apply_resource_policy()
+                    self._restore_identity_cookies()
+                    self._report_launch()
                     return self.driver
                 else:
                     import undetected_chromedriver as uc
-                    user_agent = random.choice(user_agents)
+                    user_agent = self._pick_user_agent(user_agents)
                     self.options = uc.ChromeOptions()
                     self.options.add_argument(f'user-agent={user_agent}')
                     self.driver_arguments()
 
-                    self.driver = uc.Chrome(use_subprocess=True, options=self.options, version_main=get_chrome_version())
+                    with timed(self.launch_timings, 'chrome_start'):
+                        self.driver = uc.Chrome(
+                            use_subprocess=True,
+                            options=self.options,
+                            version_main=self.chrome_version,
+                            driver_executable_path=driver_executable_path
+                        )
                     params = {
                         "behavior": "allow",
                         "downloadPath": self.download_path
                     }
-                    self.driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+                    with timed(self.launch_timings, 'cdp_setup'):
+                        self.driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+                    self._apply_resource_policy()
+                    self._restore_identity_cookies()
+                    self._report_launch()
                     return self.driver
             except Exception as e:
                 print(f"Error creating local driver: {e}")
@@ -374,18 +541,25 @@ class StartDriver:
     def CloseDriver(self):
         """Close and quit the driver and cleanup instance files"""
         if isinstance(self.driver, WebDriver):
+            if self.identity and not self.identity.retired:
+                try:
+                    # All domains, unlike get_cookies() which only sees the current page
+                    cookies = self.driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+                    self.identity.save_cookies(cookies)
+                except Exception as e:
+                    print(f"Error saving identity cookies: {e}")
             try:
                 self.driver.quit()
                 print('Driver is closed!')
             except Exception as e:
                 print(f"Error quitting driver: {e}")
         
-        # Cleanup instance directories
+        # Cleanup instance directories in the background
         try:
-            if os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir, ignore_errors=True)
-            if os.path.exists(self.profile_dir):
-                shutil.rmtree(self.profile_dir, ignore_errors=True)
+            reaper.discard(self.temp_dir)
+            # Identity profiles persist; IdentityStore discards retired ones
+            if not self.identity:
+                reaper.discard(self.profile_dir)
         except Exception as e:
             print(f"Error during cleanup: {e}")
         
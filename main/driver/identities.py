@@ -0,0 +1,312 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+from .instance_dirs import reaper
+from .startup_cache import PROFILE_LOCK_FILES
+
+
+# Next to the scraper modules, so identities do not depend on the working directory
+DEFAULT_IDENTITY_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "identities")
+STATE_FILE = "identities.json"
+
+
+class Identity:
+    """
+    A persistent browser identity: profile directory, cookie jar, User-Agent
+    and proxy that always travel together.
+
+    Keeping them bound means a browser relaunched on an identity comes back
+    with the cookies it earned on that IP instead of starting cold.
+    """
+
+    def __init__(self, identity_id, proxy, root, user_agent=None, history=None, pages=0, captchas=0,
+                 created_at=None, last_used=None, retired=False):
+        self.identity_id = identity_id
+        self.proxy = proxy
+        self.root = root
+        self.user_agent = user_agent
+        self.history = list(history or [])  # 1 = captcha, 0 = clean page
+        self.pages = pages
+        self.captchas = captchas
+        self.created_at = created_at or time.time()
+        self.last_used = last_used
+        self.retired = retired
+        self._lock_fd = None
+
+    @property
+    def directory(self):
+        return os.path.join(self.root, self.identity_id)
+
+    @property
+    def profile_dir(self):
+        return os.path.join(self.directory, "profile")
+
+    @property
+    def cookie_path(self):
+        return os.path.join(self.directory, "cookies.json")
+
+    @property
+    def is_warm(self):
+        """True once the profile has been used by a browser"""
+        return os.path.isdir(self.profile_dir) and bool(os.listdir(self.profile_dir))
+
+    def captcha_rate(self):
+        """Captcha fraction over the recent page history"""
+        return sum(self.history) / len(self.history) if self.history else 0.0
+
+    def load_cookies(self):
+        """Cookies saved by the last browser on this identity"""
+        try:
+            with open(self.cookie_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def save_cookies(self, cookies):
+        """Write the cookie jar atomically"""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.cookie_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cookies, f)
+        os.replace(tmp_path, self.cookie_path)
+
+    def clear_profile_locks(self):
+        """Remove Chrome singleton files left behind by a crashed browser"""
+        for name in PROFILE_LOCK_FILES:
+            path = os.path.join(self.profile_dir, name)
+            if os.path.lexists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def acquire(self):
+        """
+        Take the cross-process lease lock for this identity.
+
+        Returns:
+            bool: False if another process holds it
+        """
+        import fcntl
+        os.makedirs(self.directory, exist_ok=True)
+        fd = os.open(os.path.join(self.directory, "lease.lock"), os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def release_lock(self):
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    @property
+    def leased(self):
+        return self._lock_fd is not None
+
+    def to_dict(self):
+        return {
+            "proxy": self.proxy,
+            "user_agent": self.user_agent,
+            "history": self.history,
+            "pages": self.pages,
+            "captchas": self.captchas,
+            "created_at": self.created_at,
+            "last_used": self.last_used,
+            "retired": self.retired,
+        }
+
+
+class IdentityStore:
+    """
+    Managed set of persistent identities, ``per_proxy`` for each proxy.
+
+    ``lease`` hands an identity to one browser at a time (guarded by a file
+    lock, so worker processes sharing the root never share a profile).
+    ``record`` adds page outcomes; once an identity's captcha rate over the
+    last ``window`` pages reaches ``captcha_threshold`` it is retired, its
+    profile and cookies are discarded and a fresh identity takes its slot.
+    """
+
+    def __init__(self, proxies, root=DEFAULT_IDENTITY_ROOT, per_proxy=2, captcha_threshold=0.3,
+                 window=20, min_samples=5, logger=None):
+        """
+        Initialize the store.
+
+        Args:
+            proxies (list): "host:port" proxies; None entries mean a direct connection
+            root (str): Directory holding identity profiles, cookie jars and state
+            per_proxy (int): Active identities kept for each proxy
+            captcha_threshold (float): Captcha rate that retires an identity
+            window (int): Recent pages considered for the captcha rate
+            min_samples (int): Pages required before an identity can be retired
+            logger: Logger instance
+        """
+        self.proxies = list(proxies or [None])
+        self.root = root
+        self.per_proxy = per_proxy
+        self.captcha_threshold = captcha_threshold
+        self.window = window
+        self.min_samples = min_samples
+        self.logger = logger
+
+        self._lock = threading.Lock()
+        self.state_path = os.path.join(root, STATE_FILE)
+        os.makedirs(root, exist_ok=True)
+        self.identities = {
+            identity_id: Identity(identity_id, root=root, **entry)
+            for identity_id, entry in self._load().items()
+        }
+        self.stats = {"leased": 0, "warm_leases": 0, "created": 0, "retired": 0}
+
+    def _log(self, level, message):
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(message)
+
+    def _load(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read identity state: {e}")
+            return {}
+
+    def _save(self, identity):
+        import fcntl
+
+        # Merge into the file so identities leased by other processes keep their entries.
+        # Worker processes share the root, so the read-merge-write holds an exclusive lock.
+        try:
+            with open(f"{self.state_path}.lock", "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                state = self._load()
+                state[identity.identity_id] = identity.to_dict()
+                tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(state, f, indent=2)
+                os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"Could not save identity state: {e}")
+
+    def _refresh(self):
+        # Pick up identities created or retired by other processes
+        for identity_id, entry in self._load().items():
+            current = self.identities.get(identity_id)
+            if current is None:
+                self.identities[identity_id] = Identity(identity_id, root=self.root, **entry)
+            elif not current.leased:
+                current.__dict__.update(entry)
+
+    def _active(self, proxy):
+        return [i for i in self.identities.values() if i.proxy == proxy and not i.retired]
+
+    def lease(self, proxies=None):
+        """
+        Lease the best free identity, creating one if a proxy is below ``per_proxy``.
+
+        Args:
+            proxies (list, optional): Only consider these proxies (e.g. those
+                whose circuit breaker is closed)
+
+        Returns:
+            Identity or None: None when every identity is in use
+        """
+        allowed = [p for p in self.proxies if proxies is None or p in proxies]
+        if not allowed:
+            return None
+        with self._lock:
+            self._refresh()
+            candidates = sorted(
+                (i for i in self.identities.values()
+                 if not i.retired and not i.leased and i.proxy in allowed),
+                # Warm, clean identities first
+                key=lambda i: (i.captcha_rate(), not i.is_warm, i.last_used or 0)
+            )
+            for identity in candidates:
+                if identity.acquire():
+                    return self._leased(identity)
+
+            proxy = min(allowed, key=lambda p: len(self._active(p)))
+            if len(self._active(proxy)) >= self.per_proxy:
+                return None
+            identity = Identity(str(uuid.uuid4())[:8], proxy, self.root)
+            if not identity.acquire():
+                return None
+            self.identities[identity.identity_id] = identity
+            self.stats["created"] += 1
+            self._log("info", f"Created identity {identity.identity_id} on proxy {proxy}")
+            return self._leased(identity)
+
+    def _leased(self, identity):
+        self.stats["leased"] += 1
+        if identity.is_warm:
+            self.stats["warm_leases"] += 1
+        identity.last_used = time.time()
+        self._save(identity)
+        return identity
+
+    def record(self, identity, pages=1, captchas=0):
+        """
+        Add page outcomes for a leased identity.
+
+        Args:
+            identity (Identity): Leased identity
+            pages (int): Pages loaded, including captcha pages
+            captchas (int): Pages that showed a captcha
+
+        Returns:
+            bool: True if the identity was retired by this call
+        """
+        with self._lock:
+            clean = max(0, pages - captchas)
+            identity.history = (identity.history + [0] * clean + [1] * captchas)[-self.window:]
+            identity.pages += pages
+            identity.captchas += captchas
+            retire = (len(identity.history) >= self.min_samples
+                      and identity.captcha_rate() >= self.captcha_threshold)
+            if retire:
+                identity.retired = True
+                self.stats["retired"] += 1
+            self._save(identity)
+
+        if retire:
+            self._log("warning", f"Retiring identity {identity.identity_id} "
+                                 f"(captcha rate {identity.captcha_rate():.0%} on {identity.proxy})")
+        return retire
+
+    def release(self, identity):
+        """
+        Return an identity after its browser closed, discarding it if retired.
+
+        Args:
+            identity (Identity): Leased identity
+        """
+        if identity is None:
+            return
+        identity.release_lock()
+        if identity.retired:
+            reaper.discard(identity.directory)
+
+    def summary(self):
+        """
+        Identity counters for the run log.
+
+        Returns:
+            dict: Lease counters plus active identities and their captcha rates
+        """
+        with self._lock:
+            active = {
+                i.identity_id: round(i.captcha_rate(), 2)
+                for i in self.identities.values() if not i.retired
+            }
+        return dict(self.stats, active=active)
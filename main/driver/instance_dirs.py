@@ -0,0 +1,157 @@
+import atexit
+import errno
+import os
+import queue
+import shutil
+import threading
+import uuid
+
+
+DEFAULT_MIN_FREE_MB = 256
+FICLONE = 0x40049409  # Linux ioctl: share extents with another file (reflink)
+
+
+def resolve_instance_root(instance_root=None, min_free_mb=DEFAULT_MIN_FREE_MB, fallback=None):
+    """
+    Choose the directory that holds per-instance profile and driver dirs.
+
+    A RAM-backed root such as ``/dev/shm`` is only used when it exists and
+    has at least ``min_free_mb`` free, otherwise the fallback (normally the
+    working directory) is used.
+
+    Args:
+        instance_root (str, optional): Preferred root, e.g. '/dev/shm/pitchbook'
+        min_free_mb (int): Minimum free space required on the preferred root
+        fallback (str, optional): Root to use when the preferred one is unusable
+
+    Returns:
+        str: Root directory for instance directories
+    """
+    fallback = fallback or os.getcwd()
+    if not instance_root:
+        return fallback
+
+    try:
+        os.makedirs(instance_root, exist_ok=True)
+        free_mb = shutil.disk_usage(instance_root).free / (1024 * 1024)
+    except OSError as e:
+        print(f"Instance root {instance_root} unavailable ({e}), using {fallback}")
+        return fallback
+
+    if free_mb < min_free_mb:
+        print(f"Instance root {instance_root} has {free_mb:.0f} MB free "
+              f"(< {min_free_mb} MB), using {fallback}")
+        return fallback
+    return instance_root
+
+
+def _reflink(src, dst):
+    """Clone a file's extents into dst (btrfs/xfs); raises OSError if unsupported"""
+    import fcntl
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    shutil.copystat(src, dst)
+
+
+def copy_file_fast(src, dst, hardlink=False):
+    """
+    Copy a file using the cheapest mechanism the filesystem supports.
+
+    Tries a hardlink (only when requested, for files nobody writes to), then
+    a reflink, then falls back to a regular copy.
+
+    Args:
+        src (str): Source file
+        dst (str): Destination file
+        hardlink (bool): Allow sharing the inode with the source
+    """
+    if hardlink:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    try:
+        _reflink(src, dst)
+        return
+    except (OSError, ImportError):
+        if os.path.exists(dst):
+            os.remove(dst)
+    shutil.copy2(src, dst)
+
+
+def clone_tree(src, dst):
+    """
+    Copy a directory tree with reflinks where available.
+
+    Profile files are never hardlinked: Chrome updates its SQLite databases
+    in place, which would write through to the shared template.
+
+    Args:
+        src (str): Source directory
+        dst (str): Destination directory
+    """
+    shutil.copytree(src, dst, symlinks=True, dirs_exist_ok=True, copy_function=copy_file_fast)
+
+
+class DirectoryReaper:
+    """
+    Background thread that deletes instance directories.
+
+    ``discard`` renames the directory out of the way (instant on the same
+    filesystem) and queues it, so CloseDriver returns without waiting on
+    ``shutil.rmtree``.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="dir-reaper", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            path = self._queue.get()
+            try:
+                shutil.rmtree(path, ignore_errors=True)
+            finally:
+                self._queue.task_done()
+
+    def discard(self, path):
+        """
+        Schedule a directory for deletion.
+
+        Args:
+            path (str): Directory to delete
+        """
+        if not path or not os.path.exists(path):
+            return
+
+        trash_path = os.path.join(os.path.dirname(path), f".trash-{uuid.uuid4().hex[:8]}")
+        try:
+            os.rename(path, trash_path)
+        except OSError as e:
+            if e.errno == errno.ENOENT:
+                return
+            trash_path = path
+
+        self._ensure_started()
+        self._queue.put(trash_path)
+
+    def pending(self):
+        """Number of directories waiting to be deleted"""
+        return self._queue.qsize()
+
+    def drain(self):
+        """Block until every queued directory has been deleted"""
+        if self._thread is not None:
+            self._queue.join()
+
+
+reaper = DirectoryReaper()
+atexit.register(reaper.drain)
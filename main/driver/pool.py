@@ -0,0 +1,251 @@
+import random
+import threading
+import time
+
+from .get_driver import StartDriver
+from .proxy_pool import CHOOSE_TIMEOUT
+from .startup_cache import timed, format_timings
+
+
+class DriverPool:
+    """
+    Pool of warm StartDriver instances shared between scraper classes.
+
+    Launching Chrome and injecting stealth costs more than the pages we load,
+    so browsers are checked out, used and checked back in instead of being
+    closed after every URL. A browser is only recycled when the caller reports
+    a captcha/error, when it fails the health check, or when it has served
+    ``max_pages_per_browser`` pages.
+    """
+
+    def __init__(self, driver_type='undetected', max_size=1, max_pages_per_browser=25,
+                 on_create=None, logger=None, resource_policy=None, proxies=None, identities=None,
+                 proxy_pool=None):
+        """
+        Initialize the pool.
+
+        Args:
+            driver_type (str): Type of driver - 'normal' or 'undetected'
+            max_size (int): Maximum number of live browsers
+            max_pages_per_browser (int): Pages a browser may serve before it is recycled
+            on_create (callable, optional): Called with the new WebDriver (e.g. to apply stealth)
+            logger: Logger instance
+            resource_policy (ResourcePolicy, optional): Request blocking applied to every browser
+            proxies (list, optional): "host:port" proxies; each new browser gets one at random
+            identities (IdentityStore, optional): Persistent identities leased to new
+                browsers on the proxy chosen by ``proxy_pool`` (without one, their
+                proxy replaces the random choice from ``proxies``)
+            proxy_pool (ProxyPool, optional): Health-weighted proxy choice with circuit
+                breakers, used instead of a random choice from ``proxies``
+        """
+        self.driver_type = driver_type
+        self.max_size = max_size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.on_create = on_create
+        self.logger = logger
+        self.resource_policy = resource_policy
+        self.proxies = list(proxies or [])
+        self.identities = identities
+        self.proxy_pool = proxy_pool
+
+        self._idle = []
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.stats = {
+            "launched": 0,
+            "reused": 0,
+            "recycled": 0,
+            "unhealthy": 0,
+        }
+
+    def _log(self, level, message):
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(message)
+
+    def _launch(self):
+        """Start a new browser, returning the StartDriver instance or None"""
+        if self.proxy_pool:
+            # choose() takes the single trial of a half-open circuit; this browser is then that trial
+            proxy = self.proxy_pool.choose(timeout=CHOOSE_TIMEOUT)
+            if proxy is None:
+                self._log("warning", "⚠ No healthy proxy available, not launching a browser")
+                return None
+        else:
+            proxy = random.choice(self.proxies) if self.proxies else None
+        identity = None
+        if self.identities:
+            identity = self.identities.lease(proxies=[proxy] if self.proxy_pool else None)
+        if self.identities and identity is None:
+            self._log("warning", "⚠ No free identity, launching a throwaway profile")
+        instance = StartDriver(
+            driver_type=self.driver_type,
+            resource_policy=self.resource_policy,
+            proxy=proxy,
+            identity=identity,
+            proxy_pool=self.proxy_pool
+        )
+        try:
+            driver = instance.get_driver()
+            if not driver:
+                instance.CloseDriver()
+                self._release_identity(instance)
+                if self.proxy_pool:
+                    self.proxy_pool.release_trial(instance.proxy)
+                return None
+            if self.on_create:
+                with timed(instance.launch_timings, 'on_create'):
+                    self.on_create(driver)
+        except Exception as e:
+            self._log("error", f"✗ Error launching pooled driver: {e}")
+            instance.CloseDriver()
+            self._release_identity(instance)
+            if self.proxy_pool:
+                self.proxy_pool.release_trial(instance.proxy)
+            return None
+
+        instance.pages_served = 0
+        instance.outcome_recorded = False
+        self.stats["launched"] += 1
+        self._log("info", f"✓ Launched pooled driver {instance.instance_id}: "
+                          f"{format_timings(instance.launch_timings)}")
+        return instance
+
+    def report_page(self, instance, state, elapsed=None):
+        """
+        Feed a page outcome of a leased browser into the proxy health scores.
+
+        Args:
+            instance (StartDriver): Leased driver instance
+            state (str): Readiness state ('ready', 'captcha', 'timeout', 'error', ...)
+            elapsed (float, optional): Seconds until the page was ready
+        """
+        if self.proxy_pool and instance is not None and instance.proxy:
+            self.proxy_pool.record_page(instance.proxy, state, elapsed)
+            instance.outcome_recorded = True
+
+    def is_healthy(self, instance):
+        """
+        Check that a browser still responds to commands.
+
+        Args:
+            instance (StartDriver): Pooled driver instance
+
+        Returns:
+            bool: True if the browser can be reused
+        """
+        if instance is None or instance.driver is None:
+            return False
+        try:
+            instance.driver.execute_script("return document.readyState")
+            return bool(instance.driver.window_handles)
+        except Exception:
+            return False
+
+    def checkout(self, timeout=None):
+        """
+        Get a browser from the pool, launching one if below ``max_size``.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free browser
+
+        Returns:
+            StartDriver or None: Driver instance with a started WebDriver
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                if self._idle:
+                    instance = self._idle.pop()
+                    self.stats["reused"] += 1
+                    return instance
+                if self._live < self.max_size:
+                    self._live += 1
+                    break
+
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    self._log("warning", "⚠ Timed out waiting for a pooled driver")
+                    return None
+                self._cond.wait(remaining)
+
+        # Launch outside the lock so other threads can check in meanwhile
+        instance = self._launch()
+        if instance is None:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+        return instance
+
+    def checkin(self, instance, recycle=False, pages=1, captchas=0):
+        """
+        Return a browser to the pool.
+
+        Args:
+            instance (StartDriver): Driver instance obtained from checkout
+            recycle (bool): Close the browser instead of reusing it (captcha, errors)
+            pages (int): Number of pages loaded during this lease
+            captchas (int): How many of those pages showed a captcha
+        """
+        if instance is None:
+            return
+
+        instance.pages_served = getattr(instance, "pages_served", 0) + pages
+        instance.collect_resource_stats()
+
+        retired = False
+        if self.identities and instance.identity:
+            retired = self.identities.record(instance.identity, pages=pages, captchas=captchas)
+
+        reason = None
+        if retired:
+            reason = "identity retired"
+        elif recycle:
+            reason = "recycle requested"
+        elif instance.pages_served >= self.max_pages_per_browser:
+            reason = f"served {instance.pages_served} pages"
+        elif not self.is_healthy(instance):
+            reason = "failed health check"
+            self.stats["unhealthy"] += 1
+
+        with self._cond:
+            if reason is None and not self._closed:
+                self._idle.append(instance)
+                self._cond.notify()
+                return
+
+        self._retire(instance, reason or "pool closed")
+
+    def _retire(self, instance, reason):
+        """Close a browser and free its slot"""
+        self._log("info", f"Recycling driver {instance.instance_id}: {reason}")
+        try:
+            instance.CloseDriver()
+        except Exception as e:
+            self._log("error", f"✗ Error closing pooled driver: {e}")
+        self._release_identity(instance)
+        if self.proxy_pool and not getattr(instance, "outcome_recorded", True):
+            # A half-open trial taken at launch must not stay in flight forever
+            self.proxy_pool.release_trial(instance.proxy)
+        with self._cond:
+            self._live -= 1
+            self.stats["recycled"] += 1
+            self._cond.notify()
+
+    def _release_identity(self, instance):
+        if self.identities and instance.identity:
+            self.identities.release(instance.identity)
+
+    def close_all(self):
+        """Close every idle browser and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for instance in idle:
+            self._retire(instance, "pool closed")
@@ -0,0 +1,378 @@
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_PROBE_URL = "https://pitchbook.com/robots.txt"
+
+# How long launches wait for a circuit to half-open before giving up
+CHOOSE_TIMEOUT = 60
+
+
+class ProxyPool:
+    """
+    Health-scored proxy selection with per-proxy circuit breakers.
+
+    Every proxy keeps exponentially weighted averages of latency, success
+    rate and captcha rate. ``choose`` picks among proxies whose circuit is
+    closed, weighted by ``success * (1 - captcha) / latency``. A proxy that
+    fails ``failure_threshold`` times in a row, or whose captcha rate reaches
+    ``captcha_threshold``, is opened for ``open_seconds``. After that one
+    trial request is allowed (half-open): success closes the circuit,
+    failure reopens it for twice as long, up to ``max_open_seconds``.
+    """
+
+    def __init__(self, proxies, state_path="proxy_state.json", alpha=0.3, failure_threshold=3,
+                 captcha_threshold=0.8, open_seconds=60, max_open_seconds=1800,
+                 probe_url=DEFAULT_PROBE_URL, logger=None):
+        """
+        Initialize the pool.
+
+        Args:
+            proxies (list): "host:port" proxies
+            state_path (str, optional): JSON file the state is exported to. None disables export.
+            alpha (float): EWMA weight of the newest sample
+            failure_threshold (int): Consecutive failures that open the circuit
+            captcha_threshold (float): Captcha rate that opens the circuit
+            open_seconds (float): First open period before a half-open trial
+            max_open_seconds (float): Cap for the doubling open period
+            probe_url (str): URL fetched through each proxy by ``probe_all``
+            logger: Logger instance
+        """
+        self.state_path = state_path
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.captcha_threshold = captcha_threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.probe_url = probe_url
+        self.logger = logger
+
+        self._cond = threading.Condition()
+        self.state = {proxy: self._new_entry() for proxy in proxies}
+        # Snapshots are numbered under _cond and written in order under _save_lock
+        self._save_lock = threading.Lock()
+        self._version = 0
+        self._saved_version = 0
+
+    @staticmethod
+    def _new_entry():
+        return {
+            "circuit": CLOSED,
+            "latency": None,
+            "success_rate": 1.0,
+            "captcha_rate": 0.0,
+            "consecutive_failures": 0,
+            "open_until": None,
+            "open_period": None,
+            "trial_in_flight": False,
+            "requests": 0,
+            "failures": 0,
+            "captchas": 0,
+            "last_error": None,
+        }
+
+    def _log(self, level, message):
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(message)
+
+    def __len__(self):
+        return len(self.state)
+
+    @property
+    def proxies(self):
+        return list(self.state)
+
+    def _ewma(self, current, sample):
+        return sample if current is None else self.alpha * sample + (1 - self.alpha) * current
+
+    def _is_available(self, entry, now):
+        if entry["circuit"] == CLOSED:
+            return True
+        if entry["circuit"] == OPEN and now >= entry["open_until"]:
+            return True
+        return entry["circuit"] == HALF_OPEN and not entry["trial_in_flight"]
+
+    def available(self):
+        """
+        Proxies that may be used right now. This does not take the trial of a
+        half-open circuit, so callers that send traffic must get their proxy from choose.
+        """
+        now = time.time()
+        with self._cond:
+            return [proxy for proxy, entry in self.state.items() if self._is_available(entry, now)]
+
+    def _weight(self, entry):
+        latency = max(entry["latency"] or 1.0, 0.05)
+        return max(entry["success_rate"] * (1 - entry["captcha_rate"]), 0.01) / latency
+
+    def choose(self, wait=True, timeout=None, exclude=()):
+        """
+        Pick a proxy, weighted by health.
+
+        Args:
+            wait (bool): When every circuit is open, sleep until the first one half-opens
+            timeout (float, optional): Maximum seconds to wait; None waits indefinitely,
+                so callers on scraping threads should pass CHOOSE_TIMEOUT
+            exclude (iterable): Proxies not to return
+
+        Returns:
+            str or None: Proxy, or None if none is available in time
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._cond:
+            while True:
+                now = time.time()
+                candidates = [
+                    (proxy, entry) for proxy, entry in self.state.items()
+                    if proxy not in exclude and self._is_available(entry, now)
+                ]
+                if candidates:
+                    # An expired open circuit gets exactly one trial request
+                    trials = [(p, e) for p, e in candidates if e["circuit"] != CLOSED]
+                    if trials:
+                        proxy, entry = trials[0]
+                        entry["circuit"] = HALF_OPEN
+                        entry["trial_in_flight"] = True
+                        self._log("info", f"Proxy {proxy} half-open, sending a trial request")
+                        return proxy
+                    proxies, entries = zip(*candidates)
+                    return random.choices(proxies, weights=[self._weight(e) for e in entries])[0]
+
+                if not wait:
+                    return None
+                if deadline is not None and now >= deadline:
+                    return None
+                # Only circuits still open have a known wake-up time; half-open
+                # trials in flight end with a record_* or release_trial, which notify
+                reopen = [
+                    e["open_until"] for p, e in self.state.items()
+                    if p not in exclude and e["circuit"] == OPEN and e["open_until"] and e["open_until"] > now
+                ]
+                wake_at = min(reopen) if reopen else None
+                if deadline is not None:
+                    wake_at = deadline if wake_at is None else min(wake_at, deadline)
+                self._cond.wait(None if wake_at is None else max(0.01, wake_at - now))
+
+    def _open(self, proxy, entry, reason):
+        previous = entry["open_period"]
+        period = min(self.max_open_seconds, previous * 2) if previous else self.open_seconds
+        entry["circuit"] = OPEN
+        entry["open_period"] = period
+        entry["open_until"] = time.time() + period
+        entry["trial_in_flight"] = False
+        # Waiters may be blocked on this proxy's trial; give them its reopen time
+        self._cond.notify_all()
+        self._log("warning", f"Proxy {proxy} circuit open for {period:.0f}s ({reason})")
+
+    def record_success(self, proxy, latency=None):
+        """
+        Record a good page through a proxy.
+
+        Args:
+            proxy (str): Proxy used
+            latency (float, optional): Seconds the request or page load took
+        """
+        if proxy not in self.state:
+            return
+        with self._cond:
+            entry = self.state[proxy]
+            entry["requests"] += 1
+            entry["success_rate"] = self._ewma(entry["success_rate"], 1.0)
+            entry["captcha_rate"] = self._ewma(entry["captcha_rate"], 0.0)
+            if latency is not None:
+                entry["latency"] = self._ewma(entry["latency"], latency)
+            entry["consecutive_failures"] = 0
+            if entry["circuit"] != CLOSED:
+                self._log("info", f"Proxy {proxy} circuit closed")
+            entry["circuit"] = CLOSED
+            entry["open_until"] = None
+            entry["open_period"] = None
+            entry["trial_in_flight"] = False
+            self._cond.notify_all()
+            snapshot = self._snapshot()
+        self._save(snapshot)
+
+    def record_failure(self, proxy, reason="error"):
+        """
+        Record a network error or timeout through a proxy.
+
+        Args:
+            proxy (str): Proxy used
+            reason (str): Short failure description
+        """
+        if proxy not in self.state:
+            return
+        with self._cond:
+            entry = self.state[proxy]
+            entry["requests"] += 1
+            entry["failures"] += 1
+            entry["last_error"] = str(reason)[:200]
+            entry["success_rate"] = self._ewma(entry["success_rate"], 0.0)
+            entry["consecutive_failures"] += 1
+            if entry["circuit"] != CLOSED:
+                self._open(proxy, entry, f"trial failed: {reason}")
+            elif entry["circuit"] == CLOSED and entry["consecutive_failures"] >= self.failure_threshold:
+                self._open(proxy, entry, f"{entry['consecutive_failures']} consecutive failures")
+            snapshot = self._snapshot()
+        self._save(snapshot)
+
+    def record_captcha(self, proxy):
+        """Record a captcha page served through a proxy"""
+        if proxy not in self.state:
+            return
+        with self._cond:
+            entry = self.state[proxy]
+            entry["requests"] += 1
+            entry["captchas"] += 1
+            entry["captcha_rate"] = self._ewma(entry["captcha_rate"], 1.0)
+            # The proxy answered, so this is not a connectivity failure
+            entry["consecutive_failures"] = 0
+            if entry["circuit"] != CLOSED:
+                self._open(proxy, entry, "trial hit a captcha")
+            elif entry["circuit"] == CLOSED and entry["captcha_rate"] >= self.captcha_threshold:
+                self._open(proxy, entry, f"captcha rate {entry['captcha_rate']:.0%}")
+            snapshot = self._snapshot()
+        self._save(snapshot)
+
+    def record_page(self, proxy, state, elapsed=None):
+        """
+        Record a browser page outcome from its readiness state.
+
+        Args:
+            proxy (str): Proxy the browser uses
+            state (str): 'ready'/'loaded', 'captcha', or anything else for a failure
+            elapsed (float, optional): Seconds until the page was ready
+        """
+        if state in ('ready', 'loaded'):
+            self.record_success(proxy, elapsed)
+        elif state == 'captcha':
+            self.record_captcha(proxy)
+        else:
+            self.record_failure(proxy, state)
+
+    def release_trial(self, proxy):
+        """Give back a half-open trial that was never used"""
+        with self._cond:
+            entry = self.state.get(proxy)
+            if entry and entry["circuit"] == HALF_OPEN:
+                entry["trial_in_flight"] = False
+                self._cond.notify_all()
+
+    def _probe(self, proxy, timeout):
+        started = time.time()
+        try:
+            response = requests.get(
+                self.probe_url,
+                proxies={"http": f"http://{proxy}", "https": f"http://{proxy}"},
+                timeout=timeout
+            )
+            if response.status_code >= 500 or response.status_code == 407:
+                return proxy, None, f"status {response.status_code}"
+            return proxy, time.time() - started, None
+        except requests.RequestException as e:
+            return proxy, None, e.__class__.__name__
+
+    def probe_all(self, timeout=10):
+        """
+        Probe every proxy in parallel and seed latency and circuit state.
+
+        Dead proxies fail ``failure_threshold`` probes' worth at once, so
+        they are opened before any browser is launched through them.
+
+        Returns:
+            dict: ``proxy -> latency`` in seconds, None for failed probes
+        """
+        proxies = self.proxies
+        if not proxies:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(proxies)) as executor:
+            results = list(executor.map(lambda p: self._probe(p, timeout), proxies))
+
+        latencies = {}
+        for proxy, latency, error in results:
+            latencies[proxy] = latency
+            if error is None:
+                self.record_success(proxy, latency)
+            else:
+                for _ in range(self.failure_threshold):
+                    self.record_failure(proxy, f"probe: {error}")
+        self._log("info", "Proxy probes: " + ", ".join(
+            f"{p}={'dead' if l is None else f'{l:.2f}s'}" for p, l in latencies.items()
+        ))
+        return latencies
+
+    def snapshot(self):
+        """
+        Current proxy health for monitoring.
+
+        Returns:
+            dict: ``proxy -> {'circuit', 'latency', 'success_rate', 'captcha_rate', 'weight', ...}``
+        """
+        with self._cond:
+            return {
+                proxy: dict(entry, weight=round(self._weight(entry), 3))
+                for proxy, entry in self.state.items()
+            }
+
+    def _snapshot(self):
+        """Numbered copy of the state for _save; call with _cond held"""
+        self._version += 1
+        return self._version, {
+            proxy: dict(entry, weight=round(self._weight(entry), 3))
+            for proxy, entry in self.state.items()
+        }
+
+    def _save(self, snapshot):
+        if not self.state_path:
+            return
+        version, entries = snapshot
+        with self._save_lock:
+            # A newer snapshot was already written by another thread
+            if version <= self._saved_version:
+                return
+            # Merge into the file so processes using other proxies keep their entries
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+            state.update(entries)
+            try:
+                tmp_path = f"{self.state_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(state, f, indent=2)
+                os.replace(tmp_path, self.state_path)
+                self._saved_version = version
+            except OSError as e:
+                print(f"Could not save proxy state: {e}")
+
+
+# Print the exported proxy state
+if __name__ == "__main__":
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "proxy_state.json"
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            exported = json.load(f)
+    else:
+        exported = {}
+    for proxy, entry in sorted(exported.items()):
+        latency = f"{entry['latency']:.2f}s" if entry["latency"] is not None else "-"
+        print(
+            f"{proxy:<24} circuit={entry['circuit']:<9} latency={latency} "
+            f"ok={entry['success_rate']:.2f} captcha={entry['captcha_rate']:.2f} "
+            f"weight={entry['weight']} failures={entry['failures']} last_error={entry['last_error']}"
+        )
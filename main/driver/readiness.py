@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# States reported while none of a page kind's conditions is met yet
+PENDING_STATES = ('loading', 'loaded')
+
+
+class ReadinessCondition:
+    """A state that is reached when a selector or a text marker is present"""
+
+    def __init__(self, state, selector=None, text=None):
+        """
+        Args:
+            state (str): State returned when the condition is met, e.g. 'ready' or 'captcha'
+            selector (str, optional): CSS selector that must match an element
+            text (str, optional): Text that must appear in the body
+        """
+        if not selector and not text:
+            raise ValueError("A readiness condition needs a selector or a text marker")
+        self.state = state
+        self.selector = selector
+        self.text = text
+
+    def to_js(self):
+        checks = []
+        if self.selector:
+            checks.append(f"document.querySelector({json.dumps(self.selector)})")
+        if self.text:
+            checks.append(f"bodyText().indexOf({json.dumps(self.text)}) !== -1")
+        return f"if ({' && '.join(checks)}) return {json.dumps(self.state)};"
+
+
+class PageKind:
+    """
+    Readiness rules for one kind of page.
+
+    Conditions are checked in order and the first one met ends the wait.
+    If the document finished loading but no condition matched, the wait
+    ends after ``settle_after_load`` seconds with state 'loaded' (e.g. a
+    search page without results), or at ``timeout`` with state 'timeout'.
+    """
+
+    def __init__(self, name, conditions, timeout=30, settle_after_load=None):
+        """
+        Args:
+            name (str): Page kind name used in stats
+            conditions (list): ReadinessCondition objects, in priority order
+            timeout (float): Ceiling for the wait in seconds
+            settle_after_load (float, optional): Seconds to keep waiting after the
+                load event before accepting a page that matched no condition
+        """
+        self.name = name
+        self.conditions = list(conditions)
+        self.timeout = timeout
+        self.settle_after_load = settle_after_load
+        # Bare expression for CDP Runtime.evaluate, script form for WebDriver
+        self.expression = self._build_expression()
+        self.script = "return " + self.expression
+
+    def _build_expression(self):
+        body = "\n    ".join(condition.to_js() for condition in self.conditions)
+        return (
+            "(function () {\n"
+            "    var text = null;\n"
+            "    function bodyText() {\n"
+            "        if (text === null) text = document.body ? document.body.innerText : '';\n"
+            "        return text;\n"
+            "    }\n"
+            f"    {body}\n"
+            "    return document.readyState === 'complete' ? 'loaded' : 'loading';\n"
+            "})();"
+        )
+
+
+class ReadinessStats:
+    """Thread-safe record of how long pages took to become ready"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}  # kind -> list of (state, seconds)
+
+    def record(self, kind_name, state, seconds):
+        with self._lock:
+            self.samples.setdefault(kind_name, []).append((state, seconds))
+
+    def reset(self):
+        """Drop all samples (e.g. between benchmark runs)"""
+        with self._lock:
+            self.samples = {}
+
+    def summary(self):
+        """
+        Summarize readiness per page kind.
+
+        Returns:
+            dict: ``kind -> {'count', 'p50', 'max', 'states'}``
+        """
+        with self._lock:
+            samples = {kind: list(values) for kind, values in self.samples.items()}
+
+        result = {}
+        for kind, values in samples.items():
+            durations = sorted(seconds for _, seconds in values)
+            states = {}
+            for state, _ in values:
+                states[state] = states.get(state, 0) + 1
+            result[kind] = {
+                'count': len(values),
+                'p50': round(durations[len(durations) // 2], 2),
+                'max': round(durations[-1], 2),
+                'states': states,
+            }
+        return result
+
+
+readiness_stats = ReadinessStats()
+
+
+def wait_for_page(driver, kind, timeout=None, poll_interval=0.25, stats=readiness_stats):
+    """
+    Wait until one of a page kind's conditions is met.
+
+    Args:
+        driver (WebDriver): Driver whose current tab is checked
+        kind (PageKind): Readiness rules for the page
+        timeout (float, optional): Overrides the page kind's ceiling
+        poll_interval (float): Seconds between checks
+        stats (ReadinessStats, optional): Where to record the outcome
+
+    Returns:
+        tuple: (state, seconds) - the matched state, 'loaded' or 'timeout'
+    """
+    timeout = kind.timeout if timeout is None else timeout
+    start = time.time()
+    loaded_at = []
+
+    def check(d):
+        try:
+            state = d.execute_script(kind.script)
+        except WebDriverException:
+            # Document is being replaced mid-navigation
+            return False
+        if state not in PENDING_STATES:
+            return state
+        if state == 'loaded' and kind.settle_after_load is not None:
+            if not loaded_at:
+                loaded_at.append(time.time())
+            elif time.time() - loaded_at[0] >= kind.settle_after_load:
+                return state
+        return False
+
+    try:
+        state = WebDriverWait(driver, timeout, poll_frequency=poll_interval).until(check)
+    except TimeoutException:
+        state = 'timeout'
+
+    elapsed = time.time() - start
+    if stats is not None:
+        stats.record(kind.name, state, elapsed)
+    return state, elapsed
@@ -0,0 +1,168 @@
+import json
+import threading
+
+
+# URL patterns per resource type, for Network.setBlockedURLs (which matches URLs, not types)
+RESOURCE_TYPE_PATTERNS = {
+    'Image': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp'],
+    'Font': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+    'Media': ['mp4', 'webm', 'ogg', 'mp3', 'wav', 'm3u8', 'mov'],
+    'Stylesheet': ['css'],
+}
+
+DEFAULT_BLOCKED_TYPES = ('Image', 'Font', 'Media')
+
+DEFAULT_BLOCKED_DOMAINS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googleadservices.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'facebook.net',
+    'facebook.com',
+    'linkedin.com',
+    'licdn.com',
+    'hotjar.com',
+    'segment.com',
+    'segment.io',
+    'hubspot.com',
+    'hs-scripts.com',
+    'hs-analytics.net',
+    'bing.com',
+    'clarity.ms',
+    'adsrvr.org',
+    'quantserve.com',
+    'optimizely.com',
+    'vimeo.com',
+    'youtube.com',
+    'ytimg.com',
+)
+
+# Rough transfer sizes used to estimate bytes saved by blocked requests
+ESTIMATED_BYTES = {
+    'Image': 40_000,
+    'Font': 60_000,
+    'Media': 500_000,
+    'Stylesheet': 30_000,
+    'Script': 80_000,
+    'Other': 10_000,
+}
+
+
+class ResourcePolicy:
+    """
+    Blocks resources we never parse (images, fonts, video, trackers) via CDP.
+
+    ``apply`` installs ``Network.setBlockedURLs`` on a target; ``collect``
+    reads the driver's performance log to count what was loaded and what
+    was blocked, building a per-run bandwidth report.
+    """
+
+    def __init__(self, blocked_types=DEFAULT_BLOCKED_TYPES, blocked_domains=DEFAULT_BLOCKED_DOMAINS,
+                 extra_patterns=()):
+        """
+        Initialize the policy.
+
+        Args:
+            blocked_types (iterable): Resource types to block (keys of RESOURCE_TYPE_PATTERNS)
+            blocked_domains (iterable): Third-party domains whose requests are blocked
+            extra_patterns (iterable): Additional Network.setBlockedURLs patterns
+        """
+        self.blocked_types = tuple(blocked_types)
+        self.blocked_domains = tuple(blocked_domains)
+        self.extra_patterns = tuple(extra_patterns)
+
+        self._lock = threading.Lock()
+        self.report = {
+            'requests_loaded': 0,
+            'bytes_loaded': 0,
+            'requests_blocked': 0,
+            'estimated_bytes_saved': 0,
+            'blocked_by_type': {},
+        }
+
+    def url_patterns(self):
+        """Build the URL patterns passed to Network.setBlockedURLs"""
+        patterns = []
+        for resource_type in self.blocked_types:
+            for ext in RESOURCE_TYPE_PATTERNS.get(resource_type, []):
+                patterns.append(f'*.{ext}')
+                patterns.append(f'*.{ext}?*')
+        for domain in self.blocked_domains:
+            patterns.append(f'*://{domain}/*')
+            patterns.append(f'*://*.{domain}/*')
+        patterns.extend(self.extra_patterns)
+        return patterns
+
+    def apply(self, driver):
+        """
+        Enable request blocking on the driver's current target.
+
+        Blocking is per target, so this must run for every new tab as well.
+
+        Args:
+            driver (WebDriver): Chrome WebDriver
+        """
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.url_patterns()})
+
+    def collect(self, driver):
+        """
+        Drain the performance log and add its network events to the report.
+
+        Args:
+            driver (WebDriver): Chrome WebDriver started with performance logging
+
+        Returns:
+            dict: Counts for the drained events
+        """
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return {}
+
+        request_types = {}
+        loaded = blocked = bytes_loaded = bytes_saved = 0
+        blocked_by_type = {}
+
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError, TypeError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+
+            if method == 'Network.requestWillBeSent':
+                request_types[params.get('requestId')] = params.get('type', 'Other')
+            elif method == 'Network.loadingFinished':
+                loaded += 1
+                bytes_loaded += int(params.get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                resource_type = params.get('type') or request_types.get(params.get('requestId'), 'Other')
+                blocked += 1
+                blocked_by_type[resource_type] = blocked_by_type.get(resource_type, 0) + 1
+                bytes_saved += ESTIMATED_BYTES.get(resource_type, ESTIMATED_BYTES['Other'])
+
+        with self._lock:
+            self.report['requests_loaded'] += loaded
+            self.report['bytes_loaded'] += bytes_loaded
+            self.report['requests_blocked'] += blocked
+            self.report['estimated_bytes_saved'] += bytes_saved
+            for resource_type, count in blocked_by_type.items():
+                by_type = self.report['blocked_by_type']
+                by_type[resource_type] = by_type.get(resource_type, 0) + count
+
+        return {'loaded': loaded, 'blocked': blocked, 'bytes_loaded': bytes_loaded}
+
+    def summary(self):
+        """One-line summary of the run's bandwidth report"""
+        with self._lock:
+            report = dict(self.report)
+        return (
+            f"loaded {report['requests_loaded']} requests "
+            f"({report['bytes_loaded'] / 1_048_576:.1f} MB), "
+            f"blocked {report['requests_blocked']} requests "
+            f"(~{report['estimated_bytes_saved'] / 1_048_576:.1f} MB saved), "
+            f"by type: {report['blocked_by_type']}"
+        )
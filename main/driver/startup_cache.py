@@ -0,0 +1,195 @@
+import os
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+
+from .utils import find_chrome_binary, STARTUP_CACHE_DIR
+from .instance_dirs import clone_tree, copy_file_fast
+
+
+# Files Chrome leaves behind that must not be cloned into a new instance
+PROFILE_LOCK_FILES = ('SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile')
+
+
+@contextmanager
+def timed(timings, stage):
+    """
+    Record the wall-clock duration of a block into a timings dict.
+
+    Args:
+        timings (dict): Dict receiving ``stage -> seconds``
+        stage (str): Name of the measured stage
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def format_timings(timings):
+    """Format a timings dict as a one-line launch breakdown"""
+    parts = [f"{stage}={seconds:.2f}s" for stage, seconds in timings.items()]
+    parts.append(f"total={sum(timings.values()):.2f}s")
+    return " ".join(parts)
+
+
+class StartupCache:
+    """
+    Host-wide cache of the artifacts StartDriver needs before Chrome starts.
+
+    Keeps one undetected_chromedriver binary per Chrome version that is
+    already patched, so uc does not re-patch on every launch, and one
+    pre-initialized profile per Chrome version that is cloned into each
+    instance instead of letting Chrome populate an empty directory.
+    """
+
+    def __init__(self, cache_dir=None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str, optional): Cache root. Defaults to ``startup_cache`` next to the scraper modules.
+        """
+        self.cache_dir = cache_dir or STARTUP_CACHE_DIR
+        self._lock = threading.Lock()
+
+    def chromedriver_path(self, version):
+        """Path of the cached patched chromedriver for a Chrome version"""
+        return os.path.join(self.cache_dir, 'chromedriver', str(version), 'chromedriver')
+
+    def profile_template_path(self, version):
+        """Path of the cached template profile for a Chrome version"""
+        return os.path.join(self.cache_dir, 'profiles', str(version))
+
+    def get_patched_chromedriver(self, version):
+        """
+        Return the cached patched chromedriver, downloading and patching it once.
+
+        Args:
+            version (int): Chrome major version
+
+        Returns:
+            str: Path to the patched chromedriver binary
+        """
+        path = self.chromedriver_path(version)
+        if os.path.isfile(path):
+            return path
+
+        with self._lock:
+            if os.path.isfile(path):
+                return path
+
+            import undetected_chromedriver as uc
+            patcher = uc.Patcher(version_main=version)
+            patcher.auto()
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            shutil.copy2(patcher.executable_path, tmp_path)
+            os.replace(tmp_path, path)
+            print(f"Cached patched chromedriver for Chrome {version}: {path}")
+        return path
+
+    def install_chromedriver(self, version, dest_dir):
+        """
+        Copy the cached patched chromedriver into an instance directory.
+
+        Each instance gets its own path so concurrent launches never race on
+        the same executable. The binary is never modified after patching, so
+        it is hardlinked when source and destination share a filesystem.
+
+        Args:
+            version (int): Chrome major version
+            dest_dir (str): Instance directory
+
+        Returns:
+            str: Path to the instance's chromedriver
+        """
+        source = self.get_patched_chromedriver(version)
+        os.makedirs(dest_dir, exist_ok=True)
+        dest = os.path.join(dest_dir, os.path.basename(source))
+        if os.path.exists(dest):
+            os.remove(dest)
+        copy_file_fast(source, dest, hardlink=True)
+        return dest
+
+    def get_profile_template(self, version, timeout=30):
+        """
+        Return the template profile for a Chrome version, building it once.
+
+        The template is created by running Chrome headless against
+        about:blank so that it writes its first-run state to disk.
+
+        Args:
+            version (int): Chrome major version
+            timeout (int): Seconds to wait for Chrome to initialize the profile
+
+        Returns:
+            str or None: Template directory, or None if Chrome is unavailable
+        """
+        path = self.profile_template_path(version)
+        if os.path.isdir(path):
+            return path
+
+        binary = find_chrome_binary()
+        if not binary:
+            return None
+
+        with self._lock:
+            if os.path.isdir(path):
+                return path
+
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            os.makedirs(tmp_path)
+            command = [
+                binary,
+                '--headless=new',
+                f'--user-data-dir={tmp_path}',
+                '--no-first-run',
+                '--no-default-browser-check',
+                '--no-sandbox',
+                '--disable-gpu',
+                '--dump-dom',
+                'about:blank',
+            ]
+            try:
+                subprocess.run(command, capture_output=True, timeout=timeout)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                print(f"Error building template profile: {e}")
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                return None
+
+            for name in PROFILE_LOCK_FILES:
+                lock_path = os.path.join(tmp_path, name)
+                if os.path.lexists(lock_path):
+                    os.remove(lock_path)
+
+            try:
+                os.replace(tmp_path, path)
+            except OSError:
+                # Another process finished first
+                shutil.rmtree(tmp_path, ignore_errors=True)
+            print(f"Cached template profile for Chrome {version}: {path}")
+        return path
+
+    def clone_profile(self, version, dest):
+        """
+        Populate an instance profile directory from the template (reflink
+        copy where the filesystem supports it).
+
+        Args:
+            version (int): Chrome major version
+            dest (str): Instance profile directory
+
+        Returns:
+            bool: True if the template was cloned
+        """
+        template = self.get_profile_template(version)
+        if not template:
+            return False
+        clone_tree(template, dest)
+        return True
@@ -0,0 +1,165 @@
+import time
+
+
+# Set on a tab's current document right before it navigates away. The new
+# document starts without it, so a readiness check that still sees the flag is
+# looking at the previous page and must not accept it.
+STALE_MARK = "window.__tabSetStale = true;"
+STALE_GUARD = "if (window.__tabSetStale) return 'loading';\n"
+# The same guard for a bare CDP Runtime.evaluate expression
+STALE_EXPRESSION_GUARD = "window.__tabSetStale ? 'loading' : "
+
+
+class TabSet:
+    """
+    A group of tabs in one Chrome process that load pages concurrently.
+
+    Navigation is started with CDP ``Page.navigate`` on each tab's target, which
+    returns once the request is issued instead of waiting for the load event,
+    so pages load side by side while the caller polls each tab for readiness.
+    Before navigating, the tab's old document is marked stale and readiness
+    checks ignore marked documents, so a reused tab never reports the previous
+    company's page as ready under the new URL (whatever the driver's
+    pageLoadStrategy). With ``isolate=True`` every tab lives in its own CDP
+    browser context, so cookies and storage are not shared between tabs.
+    """
+
+    def __init__(self, driver, size=4, isolate=True, on_tab_open=None):
+        """
+        Initialize the tab set.
+
+        Args:
+            driver (WebDriver): Started Chrome WebDriver
+            size (int): Number of tabs to open
+            isolate (bool): Open each tab in a separate browser context
+            on_tab_open (callable, optional): Called with the driver while switched
+                into each new tab (e.g. to apply stealth, which is per-target)
+        """
+        self.driver = driver
+        self.size = size
+        self.isolate = isolate
+        self.on_tab_open = on_tab_open
+
+        self.handles = []
+        self.contexts = []
+        self.original_handle = None
+
+    def open(self):
+        """Open the tabs and return their window handles"""
+        self.original_handle = self.driver.current_window_handle
+
+        for _ in range(self.size):
+            if self.isolate:
+                context_id = self.driver.execute_cdp_cmd('Target.createBrowserContext', {})['browserContextId']
+                self.contexts.append(context_id)
+                # chromedriver uses target ids as window handles
+                handle = self.driver.execute_cdp_cmd('Target.createTarget', {
+                    'url': 'about:blank',
+                    'browserContextId': context_id
+                })['targetId']
+            else:
+                self.driver.switch_to.new_window('tab')
+                handle = self.driver.current_window_handle
+
+            self.handles.append(handle)
+            if self.on_tab_open:
+                self.driver.switch_to.window(handle)
+                self.on_tab_open(self.driver)
+
+        return self.handles
+
+    def navigate(self, handle, url):
+        """Start loading a URL in a tab without waiting for it"""
+        self.driver.switch_to.window(handle)
+        self.driver.execute_script(STALE_MARK)
+        self.driver.execute_cdp_cmd('Page.navigate', {'url': url})
+
+    def evaluate(self, handle, script):
+        """Run a script in a tab and return its result"""
+        self.driver.switch_to.window(handle)
+        return self.driver.execute_script(script)
+
+    def page_source(self, handle):
+        """Get the page source of a tab"""
+        self.driver.switch_to.window(handle)
+        return self.driver.page_source
+
+    def run(self, urls, ready_script, timeout=30, poll_interval=0.25, retry_states=(), before_navigate=None,
+            on_retry=None):
+        """
+        Load URLs across the tabs and yield each page as soon as it is ready.
+
+        Args:
+            urls (list): URLs to load
+            ready_script (str): JavaScript returning a state string. Any state other
+                than 'loading'/'loaded' finishes the page.
+            timeout (float): Seconds before a page is given up as 'timeout'
+            poll_interval (float): Pause between polling rounds
+            retry_states (dict): ``state -> max retries`` for states that should
+                reload the URL instead of finishing (e.g. {'captcha': 5})
+            before_navigate (callable, optional): Called with each URL before it is loaded
+                (e.g. to apply pacing)
+            on_retry (callable, optional): Called with (url, state) when a URL is requeued
+
+        Yields:
+            tuple: (url, state, page_source, seconds_to_ready)
+        """
+        ready_script = STALE_GUARD + ready_script
+        pending = list(urls)
+        retries = {}
+        busy = {}  # handle -> (url, started_at)
+
+        while pending or busy:
+            for handle in self.handles:
+                if handle not in busy and pending:
+                    url = pending.pop(0)
+                    if before_navigate:
+                        before_navigate(url)
+                    self.navigate(handle, url)
+                    busy[handle] = (url, time.time())
+
+            for handle, (url, started_at) in list(busy.items()):
+                elapsed = time.time() - started_at
+                try:
+                    state = self.evaluate(handle, ready_script)
+                except Exception:
+                    state = 'loading'
+
+                if state in ('loading', 'loaded'):
+                    if elapsed < timeout:
+                        continue
+                    state = 'timeout'
+
+                if state in retry_states and retries.get(url, 0) < retry_states[state]:
+                    retries[url] = retries.get(url, 0) + 1
+                    del busy[handle]
+                    pending.append(url)
+                    if on_retry:
+                        on_retry(url, state)
+                    continue
+
+                source = self.page_source(handle)
+                del busy[handle]
+                yield url, state, source, elapsed
+
+            if busy:
+                time.sleep(poll_interval)
+
+    def close(self):
+        """Close the tabs and dispose their browser contexts"""
+        for handle in self.handles:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception as e:
+                print(f"Error closing tab: {e}")
+        for context_id in self.contexts:
+            try:
+                self.driver.execute_cdp_cmd('Target.disposeBrowserContext', {'browserContextId': context_id})
+            except Exception as e:
+                print(f"Error disposing browser context: {e}")
+        self.handles = []
+        self.contexts = []
+
+        if self.original_handle:
+            self.driver.switch_to.window(self.original_handle)
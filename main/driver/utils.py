@@ -1,20 +1,97 @@
 from datetime import datetime, timedelta
+import json
+import os
 import re
+import shutil
 import subprocess
+import threading
+
+
+DEFAULT_CHROME_VERSION = 143
+CHROME_BINARIES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser']
+# Next to the scraper modules, so the cache does not depend on the working directory
+STARTUP_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'startup_cache')
+VERSION_CACHE_FILE = os.path.join(STARTUP_CACHE_DIR, 'chrome_version.json')
+
+# Per-process memo of detected versions, keyed by "<binary>:<mtime>"
+_version_memo = {}
+_version_lock = threading.Lock()
 
 
 def run_command(command):
-    result = subprocess.run(command, shell=True, capture_output=True, text=True)
+    """Run a command (list of args, or a shell string) and return (stdout, stderr)"""
+    result = subprocess.run(command, shell=isinstance(command, str), capture_output=True, text=True)
     return result.stdout, result.stderr
 
 
-def get_chrome_version():
-    """Get the installed Chrome version"""
-    command = "google-chrome --version"
-    stdout, stderr = run_command(command)
-    
-    if stdout:
-        version = stdout.strip().split(' ')[-1].split('.')[0]
+def find_chrome_binary():
+    """Return the resolved path of the installed Chrome binary, or None"""
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return os.path.realpath(path)
+    return None
+
+
+def _read_version_cache(cache_file):
+    try:
+        with open(cache_file, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_version_cache(cache_file, cache):
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Could not write Chrome version cache: {e}")
+
+
+def get_chrome_version(cache_file=VERSION_CACHE_FILE):
+    """
+    Get the installed Chrome major version.
+
+    The result is memoized per process and on disk, keyed by the binary's
+    path and mtime, so `google-chrome --version` only runs again after Chrome
+    is upgraded.
+
+    Args:
+        cache_file (str): JSON file holding the on-disk version cache
+
+    Returns:
+        int: Chrome major version
+    """
+    binary = find_chrome_binary()
+    if not binary:
+        return DEFAULT_CHROME_VERSION
+
+    try:
+        key = f"{binary}:{os.path.getmtime(binary)}"
+    except OSError:
+        return DEFAULT_CHROME_VERSION
+
+    with _version_lock:
+        if key in _version_memo:
+            return _version_memo[key]
+
+        cache = _read_version_cache(cache_file)
+        if key in cache:
+            _version_memo[key] = cache[key]
+            return cache[key]
+
+        stdout, stderr = run_command([binary, '--version'])
+        if not stdout:
+            return DEFAULT_CHROME_VERSION
+
+        version = int(stdout.strip().split(' ')[-1].split('.')[0])
         print("Chrome Version:", version)
-        return int(version)
-    return 143  # Default version
+
+        _version_memo[key] = version
+        cache[key] = version
+        _write_version_cache(cache_file, cache)
+        return version
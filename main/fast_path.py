@@ -0,0 +1,233 @@
+"""
+HTTP fast path for PitchBook profiles.
+Fetches pages with plain requests sessions that carry cookies harvested from a
+browser that recently passed the challenge; Chrome is only needed on a miss.
+"""
+
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from details import HEADERS, CAPTCHA_MARKER
+
+
+READY_MARKER = "pp-search-wrap__title"
+CHALLENGE_STATUS = (403, 429, 503)
+
+# Fetch state -> ProxyPool page state; 'missing' still means the proxy delivered a page
+PROXY_OUTCOMES = {"ready": "ready", "missing": "ready", "challenge": "captcha", "error": "error"}
+
+
+class HttpFastPath:
+    """
+    Pooled ``requests`` sessions keyed by proxy.
+
+    Challenge cookies are bound to the client IP and User-Agent, so each
+    session is seeded from a browser on the same proxy and sends that
+    browser's User-Agent. A session is dropped when it meets a challenge or
+    its cookies are older than ``max_cookie_age``; the next successful
+    browser page seeds it again.
+
+    ``fetch`` returns one of:
+        'ready': profile HTML with the company title
+        'challenge': captcha page or blocking status code
+        'missing': page loaded but the title selector is absent
+        'error': network error or unexpected status
+        'no_session': no fresh cookies to use yet
+    """
+
+    def __init__(self, pacer=None, max_cookie_age=1800, timeout=20, pool_size=8, logger=None, proxy_pool=None):
+        """
+        Initialize the fast path.
+
+        Args:
+            pacer (AIMDPacer, optional): Per-proxy pacing shared with the browsers
+            max_cookie_age (float): Seconds harvested cookies are trusted
+            timeout (float): Request timeout in seconds
+            pool_size (int): Connections kept alive per session
+            logger: Logger instance
+            proxy_pool (ProxyPool, optional): Picks sessions by proxy health, skipping
+                open circuits, and receives latency, error and captcha outcomes
+        """
+        self.pacer = pacer
+        self.proxy_pool = proxy_pool
+        self.max_cookie_age = max_cookie_age
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.logger = logger
+
+        self._lock = threading.Lock()
+        self._sessions = {}  # proxy -> {'session', 'seeded_at'}
+        self.stats = {"requests": 0, "hits": 0, "challenge": 0, "missing": 0, "error": 0, "no_session": 0}
+
+    def _log(self, level, message):
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(message)
+
+    def _new_session(self, proxy, user_agent):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(HEADERS)
+        session.headers.update({
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        if user_agent:
+            session.headers["User-Agent"] = user_agent
+        if proxy:
+            session.proxies = {"http": f"http://{proxy}", "https": f"http://{proxy}"}
+        return session
+
+    def seed_from_driver(self, instance):
+        """
+        Copy cookies and User-Agent from a browser that just loaded a page.
+
+        Args:
+            instance (StartDriver): Leased driver instance (its proxy keys the session)
+        """
+        try:
+            cookies = instance.driver.get_cookies()
+            user_agent = instance.driver.execute_script("return navigator.userAgent")
+        except Exception as e:
+            self._log("warning", f"Could not harvest cookies: {e}")
+            return
+
+        proxy = instance.proxy
+        with self._lock:
+            entry = self._sessions.get(proxy)
+            if entry is None or entry["session"].headers.get("User-Agent") != user_agent:
+                if entry is not None:
+                    entry["session"].close()
+                entry = {"session": self._new_session(proxy, user_agent)}
+                self._sessions[proxy] = entry
+            for cookie in cookies:
+                entry["session"].cookies.set(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie.get("domain"),
+                    path=cookie.get("path", "/")
+                )
+            entry["seeded_at"] = time.time()
+
+    def invalidate(self, proxy):
+        """Drop the session of a proxy whose cookies stopped working"""
+        with self._lock:
+            entry = self._sessions.pop(proxy, None)
+        if entry is not None:
+            entry["session"].close()
+
+    def _pick(self):
+        now = time.time()
+        with self._lock:
+            for proxy, entry in list(self._sessions.items()):
+                if now - entry["seeded_at"] > self.max_cookie_age:
+                    entry["session"].close()
+                    del self._sessions[proxy]
+            seeded = list(self._sessions)
+        if not seeded:
+            return False, None, None
+
+        if self.proxy_pool:
+            # choose() takes the single trial of a half-open circuit; this request is then that trial
+            managed = self.proxy_pool.proxies
+            proxy = self.proxy_pool.choose(wait=False, exclude=[p for p in managed if p not in seeded])
+            if proxy is None:
+                # Direct sessions have no circuit
+                unmanaged = [p for p in seeded if p not in managed]
+                if not unmanaged:
+                    return False, None, None
+                proxy = random.choice(unmanaged)
+        else:
+            proxy = random.choice(seeded)
+
+        with self._lock:
+            entry = self._sessions.get(proxy)
+        if entry is None:
+            # Invalidated since it was picked
+            if self.proxy_pool:
+                self.proxy_pool.release_trial(proxy)
+            return False, None, None
+        return True, proxy, entry["session"]
+
+    def classify(self, status_code, html):
+        """Classify a response as ready, challenge, missing or error"""
+        if status_code in CHALLENGE_STATUS or (html and CAPTCHA_MARKER in html):
+            return "challenge"
+        if status_code != 200:
+            return "error"
+        if READY_MARKER not in html:
+            return "missing"
+        return "ready"
+
+    def fetch(self, url):
+        """
+        Fetch a profile over plain HTTP.
+
+        Args:
+            url (str): Profile URL
+
+        Returns:
+            tuple: (state, html); html is None unless state is 'ready'
+        """
+        found, proxy, session = self._pick()
+        if not found:
+            with self._lock:
+                self.stats["requests"] += 1
+                self.stats["no_session"] += 1
+            return "no_session", None
+
+        if self.pacer:
+            self.pacer.wait_turn(proxy, reason="http fast path")
+        started = time.time()
+        try:
+            response = session.get(url, timeout=self.timeout)
+            state = self.classify(response.status_code, response.text)
+        except requests.RequestException as e:
+            self._log("warning", f"Fast path request failed: {e}")
+            state = "error"
+        if self.proxy_pool and proxy:
+            self.proxy_pool.record_page(proxy, PROXY_OUTCOMES[state], time.time() - started)
+
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["hits" if state == "ready" else state] += 1
+
+        if state == "challenge":
+            self.invalidate(proxy)
+            if self.pacer:
+                self.pacer.failure(proxy, "captcha")
+        elif state == "ready" and self.pacer:
+            self.pacer.success(proxy)
+        return state, response.text if state == "ready" else None
+
+    def hit_rate(self):
+        """Fraction of fetches served without a browser"""
+        with self._lock:
+            requests_made = self.stats["requests"]
+            return self.stats["hits"] / requests_made if requests_made else 0.0
+
+    def summary(self):
+        """
+        Fast path counters for the run log.
+
+        Returns:
+            dict: Counters per outcome plus 'hit_rate' and live 'sessions'
+        """
+        hit_rate = self.hit_rate()
+        with self._lock:
+            return dict(self.stats, hit_rate=round(hit_rate, 3), sessions=len(self._sessions))
+
+    def close(self):
+        """Close every pooled session"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for entry in sessions:
+            entry["session"].close()
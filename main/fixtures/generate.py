@@ -0,0 +1,238 @@
+"""
+Regenerate the anonymized PitchBook page corpus used by bench_parsers.py.
+Markup follows the live profile and search pages; every name, number and
+link is synthetic. Output is deterministic, so the checked-in files only
+change when this script does.
+
+    python fixtures/generate.py
+"""
+
+import os
+import random
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+WORDS = ["Quantum", "Lattice", "Harbor", "Vector", "Cobalt", "Meridian", "Juniper", "Atlas",
+         "Nimbus", "Sable", "Orchid", "Summit", "Beacon", "Cinder", "Delta", "Ember"]
+SUFFIXES = ["Labs", "Capital", "Partners", "Systems", "Ventures", "Holdings", "Networks", "Bio"]
+DEAL_TYPES = ["Seed Round", "Early Stage VC", "Later Stage VC", "Angel (individual)", "Debt - General"]
+
+
+def company_name(rng):
+    return f"{rng.choice(WORDS)} {rng.choice(WORDS)} {rng.choice(SUFFIXES)}"
+
+
+def page(title, body, rng, script_kb):
+    # Live pages carry large inline state blobs and tracking scripts; they are
+    # pure parse cost and never read by the extractors
+    blob = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(script_kb * 1024))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title} | PitchBook</title>
+<link rel="stylesheet" href="/static/css/profile.css">
+<script>window.__STATE__ = "{blob}";</script>
+</head>
+<body>
+<header class="pp-header"><nav><a href="/">PitchBook</a><a href="/profiles/search">Search</a></nav></header>
+<main class="pp-main">
+{body}
+</main>
+<footer class="pp-footer"><p>&copy; PitchBook Data, Inc.</p><!-- build 4f2a --></footer>
+</body>
+</html>
+"""
+
+
+def overview(rng):
+    items = [("Year Founded", str(rng.randint(1990, 2023))), ("Status", "Private"),
+             ("Employees", str(rng.randint(5, 5000))), ("Latest Deal Type", rng.choice(DEAL_TYPES)),
+             ("Financing Rounds", str(rng.randint(1, 12)))]
+    return "\n".join(
+        f'<div class="pp-overview-item" data-pp-overview-item="">'
+        f'<span class="dont-break text-small">{label}</span>'
+        f'<span class="pp-overview-item__title"> {value} </span></div>'
+        for label, value in items
+    )
+
+
+def general_info(rng, name):
+    domain = name.lower().replace(" ", "") + ".example"
+    return f"""<div class="general-info">
+<p class="pp-description_text">{name} develops {rng.choice(WORDS).lower()} software
+ for <b>enterprise</b> &amp; public sector customers.</p>
+<div class="pp-contact-info_item"><h5>Website</h5><a title="www.{domain}" href="https://www.{domain}">www.{domain}</a></div>
+<div class="pp-contact-info_item"><div class="font-weight-bold">Ownership Status</div><div class="font-weight-regular">Privately Held (backing)</div></div>
+<div class="pp-contact-info_item"><div class="font-weight-bold">Primary Industry</div><div class="font-weight-regular">Business/Productivity Software</div></div>
+<div class="pp-contact-info_corporate-office"><ul><li>{rng.randint(1, 999)} Market Street</li><li> Springfield </li><li>United States</li></ul></div>
+<div class="info-item__social"><div><a aria-label="LinkedIn link" href="https://www.linkedin.com/company/{rng.randint(1000, 9999)}">in</a><a aria-label="Twitter link" href="https://twitter.com/{rng.randint(1000, 9999)}">tw</a></div></div>
+</div>"""
+
+
+def table(section_id, headers, rows, rng, locked_rate=0.0):
+    head = "".join(f"<th>{h}</th>" for h in headers)
+    body = []
+    for row in rows:
+        cells = []
+        for value in row:
+            if rng.random() < locked_rate:
+                cells.append('<td><div class="data-table__gray-box">&nbsp;</div></td>')
+            elif rng.random() < 0.2:
+                cells.append(f'<td title="{value}"><span>{value[:8]}&hellip;</span></td>')
+            else:
+                cells.append(f"<td>{value}</td>")
+        body.append(f"<tr>{''.join(cells)}</tr>")
+    return (f'<section id="{section_id}" class="pp-section"><h2>{section_id.title()}</h2>'
+            f'<table class="data-table"><thead><tr>{head}</tr></thead>'
+            f'<tbody>\n' + "\n".join(body) + '\n</tbody></table></section>')
+
+
+def funding_rows(rng, count):
+    return [[rng.choice(DEAL_TYPES), f"{rng.randint(1, 28):02d}-{rng.choice(['Jan', 'Mar', 'Jul', 'Nov'])}-{rng.randint(2005, 2024)}",
+             f"{rng.randint(1, 900)}.{rng.randint(0, 99):02d}", f"{rng.randint(5, 5000)}.00", rng.choice(["Completed", "Announced"])]
+            for _ in range(count)]
+
+
+def investor_rows(rng, count):
+    return [[company_name(rng), rng.choice(["Venture Capital", "Angel Group", "Corporate VC", "PE/Buyout"]),
+             rng.choice(["Yes", "No"]), f"{rng.randint(1, 28):02d}-Jan-{rng.randint(2005, 2024)}"]
+            for _ in range(count)]
+
+
+def patent_rows(rng, count):
+    return [[f"US-{rng.randint(1000000, 9999999)}-B{rng.randint(1, 2)}", f"Method and system for {rng.choice(WORDS).lower()} processing",
+             rng.choice(["Active", "Pending", "Expired"]), f"{rng.randint(2005, 2024)}"]
+            for _ in range(count)]
+
+
+def faqs(rng, name, count):
+    items = "".join(f"<li><h3> What does {name} do? ({i}) </h3><p>{name} builds software. Answer {i}.</p></li>"
+                    for i in range(count))
+    return f'<div class="pp-faqs-table"><ul>{items}</ul></div>'
+
+
+def research(rng, count):
+    items = "".join(
+        f'<a class="pp-related-research__item" href="/news/reports/q{rng.randint(1, 4)}-{rng.randint(2019, 2024)}-{i}">'
+        f'<span class="pp-related-research__item-title">{rng.choice(WORDS)} Market Report {i}</span>'
+        f'<span class="pp-related-research__item-release">{rng.choice(["Jan", "Apr", "Aug"])} {rng.randint(2019, 2024)}</span></a>'
+        for i in range(count)
+    )
+    return f'<div id="research" class="pp-related-research">{items}</div>'
+
+
+def profile(rng, funding=8, captable=6, competitors=10, investors=12, patents=5, faq_count=5,
+            research_count=4, locked_rate=0.0, script_kb=64):
+    name = company_name(rng)
+    parts = [
+        f'<div class="pp-search-wrap"><h1 class="pp-search-wrap__title"> {name} </h1></div>',
+        overview(rng),
+        general_info(rng, name),
+    ]
+    if funding:
+        parts.append(table("funding", ["Deal Type", "Date", "Amount", "Raised to Date", "Deal Status"],
+                           funding_rows(rng, funding), rng, locked_rate))
+    if captable:
+        parts.append(table("captable", ["Series", "Shares Authorized", "Par Value", "Liquidation Preference"],
+                           [[f"Series {chr(65 + i % 26)}", str(rng.randint(10000, 9000000)), "$0.0001", "1x"]
+                            for i in range(captable)], rng, locked_rate))
+    if competitors:
+        parts.append(table("competitors", ["Company Name", "Financing Status", "Location", "Employees"],
+                           [[company_name(rng), "Venture Capital-Backed", "Springfield, US", str(rng.randint(5, 900))]
+                            for _ in range(competitors)], rng, locked_rate))
+    if investors:
+        parts.append(table("investors", ["Investor Name", "Investor Type", "Holding", "Investor Since"],
+                           investor_rows(rng, investors), rng, locked_rate))
+    if patents:
+        parts.append(table("patents", ["Patent ID", "Title", "Status", "Year"],
+                           patent_rows(rng, patents), rng, locked_rate))
+    if faq_count:
+        parts.append(faqs(rng, name, faq_count))
+    if research_count:
+        parts.append(research(rng, research_count))
+    return page(name, "\n".join(parts), rng, script_kb)
+
+
+def search(rng, results, script_kb=32):
+    rows = "".join(
+        f'<div class="search-result"><a href="/profiles/company/{rng.randint(10000, 999999)}-{rng.randint(10, 99)}'
+        f'{"?src=search" if i % 3 == 0 else ""}">{company_name(rng)}</a>'
+        f'<a href="/profiles/investor/{rng.randint(10000, 99999)}-{rng.randint(10, 99)}">Investor</a></div>'
+        for i in range(results)
+    )
+    body = (f'<div class="pp-search-wrap"><h1 class="pp-search-wrap__title">Search results</h1></div>'
+            f'<div class="search-results">{rows}</div>')
+    return page("Search", body, rng, script_kb)
+
+
+FIXTURES = {
+    "profile_small.html": lambda rng: profile(rng, funding=1, captable=0, competitors=0, investors=2, patents=0,
+                                              faq_count=1, research_count=0, script_kb=16),
+    "profile_typical.html": lambda rng: profile(rng),
+    "profile_huge_tables.html": lambda rng: profile(rng, funding=60, captable=40, competitors=100, investors=600,
+                                                    patents=400, faq_count=10, research_count=12),
+    "profile_locked.html": lambda rng: profile(rng, funding=20, investors=30, locked_rate=0.4),
+    "search_few.html": lambda rng: search(rng, 3),
+    "search_many.html": lambda rng: search(rng, 50),
+}
+
+
+def without_tbody(html):
+    # Servers may omit <tbody>; browsers always insert it
+    return html.replace("<tbody>", "").replace("</tbody>", "")
+
+
+def block_in_description(html):
+    # A <div> inside <p> is invalid: browsers close the <p> before the <div>
+    # and leave an empty <p></p> for the stray </p>
+    raw = html.replace("customers.</p>", "customers. <div>Backed by public grants.</div> Founded in Springfield.</p>", 1)
+    dom = html.replace("customers.</p>", "customers. </p><div>Backed by public grants.</div> Founded in Springfield.<p></p>", 1)
+    return raw, dom
+
+
+def entities_and_comments(html):
+    # Entities and comments as served; browsers keep both through page_source
+    html = html.replace("</h1>", "<!-- ab:title --></h1>", 1)
+    html = html.replace("software\n for", "software&nbsp;for&#8239;&#x1F680;<!-- tracking -->\n for", 1)
+    html = html.replace("<td>", "<td><!-- cell -->&lsquo;", 1)
+    return html.replace("Market Street</li>", "Market Street&#44; Suite&#160;4 &lt;rear&gt;</li>", 1)
+
+
+def raw_cases(rng):
+    """
+    Pages as a server sends them, paired with what a browser serializes them
+    to (driver.page_source). The parser backends are only guaranteed to agree
+    on the serialized form.
+
+    Returns:
+        dict: case -> (raw html, browser-serialized html)
+    """
+    base = profile(rng, funding=3, captable=2, competitors=2, investors=3, patents=1, faq_count=2,
+                   research_count=1, script_kb=1)
+    served = entities_and_comments(base)
+    return {
+        "no_tbody": (without_tbody(base), base),
+        "block_in_p": block_in_description(base),
+        "entities_comments": (served, served),
+    }
+
+
+RAW_DIR = os.path.join(HERE, "raw")
+
+
+if __name__ == "__main__":
+    for name, build in FIXTURES.items():
+        with open(os.path.join(HERE, name), "w", encoding="utf-8") as f:
+            f.write(build(random.Random(name)))
+        print(f"wrote {name} ({os.path.getsize(os.path.join(HERE, name)) // 1024} KB)")
+
+    # Parity fixtures live apart from the benchmark corpus
+    os.makedirs(RAW_DIR, exist_ok=True)
+    for case, (raw, dom) in raw_cases(random.Random("raw")).items():
+        for suffix, html in (("raw", raw), ("dom", dom)):
+            name = f"{case}.{suffix}.html"
+            with open(os.path.join(RAW_DIR, name), "w", encoding="utf-8") as f:
+                f.write(html)
+            print(f"wrote raw/{name}")
@@ -0,0 +1,192 @@
+"""
+Adaptive per-proxy request pacing.
+Delays shrink additively while pages succeed and grow multiplicatively on captchas.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+import logging
+
+
+DIRECT = "direct"
+
+
+class AIMDPacer:
+    """
+    AIMD pacing controller keyed by proxy.
+
+    Each proxy has a delay between navigations. Every successful page
+    subtracts ``decrease_step`` seconds (down to ``min_delay``); every
+    captcha or "Unknown" result multiplies it by ``backoff_factor`` (up to
+    ``max_delay``). State is persisted to ``state_path`` so a new run starts
+    at the last known safe rate.
+    """
+
+    def __init__(self, state_path="pacing_state.json", initial_delay=15.0, min_delay=2.0,
+                 max_delay=180.0, decrease_step=1.0, backoff_factor=2.0, jitter=0.25):
+        """
+        Initialize the pacer.
+
+        Args:
+            state_path (str, optional): JSON file for persisted state. None keeps state in memory.
+            initial_delay (float): Delay in seconds for proxies without state
+            min_delay (float): Lower bound for the delay
+            max_delay (float): Upper bound for the delay
+            decrease_step (float): Seconds removed from the delay per success
+            backoff_factor (float): Multiplier applied to the delay per failure
+            jitter (float): Random +/- fraction applied to each wait
+        """
+        self.state_path = state_path
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.decrease_step = decrease_step
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+
+        self._lock = threading.Lock()
+        self._last_request = {}
+        self._dirty = set()
+        self.state = self._load()
+
+    def _load(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read pacing state: {e}")
+            return {}
+
+    def _save(self):
+        if not self.state_path:
+            return
+        # Merge into the file so processes pacing other proxies keep their entries
+        state = self._load()
+        state.update({key: self.state[key] for key in self._dirty})
+        try:
+            tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"Could not save pacing state: {e}")
+
+    def _entry(self, key):
+        key = key or DIRECT
+        if key not in self.state:
+            self.state[key] = {
+                "delay": self.initial_delay,
+                "successes": 0,
+                "failures": 0,
+                "last_failure": None,
+                "updated_at": time.time(),
+            }
+        return self.state[key]
+
+    def delay(self, key):
+        """Current delay in seconds for a proxy"""
+        with self._lock:
+            return self._entry(key)["delay"]
+
+    def rate(self, key):
+        """Current pace for a proxy in pages per minute"""
+        return 60.0 / self.delay(key)
+
+    def reserve_turn(self, key):
+        """
+        Reserve the proxy's next navigation slot without sleeping.
+
+        Args:
+            key (str): Proxy ("host:port") or None for direct connections
+
+        Returns:
+            float: Seconds the caller must wait before navigating
+        """
+        key = key or DIRECT
+        with self._lock:
+            delay = self._entry(key)["delay"] * random.uniform(1 - self.jitter, 1 + self.jitter)
+            last = self._last_request.get(key)
+            now = time.time()
+            sleep_time = max(0.0, last + delay - now) if last else 0.0
+            # Reserve the slot so concurrent callers on the same proxy queue up
+            self._last_request[key] = now + sleep_time
+        return sleep_time
+
+    def wait_turn(self, key, reason=""):
+        """
+        Sleep until the proxy's delay has passed since its last navigation.
+
+        Args:
+            key (str): Proxy ("host:port") or None for direct connections
+            reason (str): Reason for logging
+        """
+        sleep_time = self.reserve_turn(key)
+        if sleep_time > 0:
+            message = f"Pacing {key or DIRECT}: sleeping {sleep_time:.2f} seconds"
+            if reason:
+                message += f" for {reason}"
+            try:
+                logging.info(message)
+            except:
+                print(message)
+            time.sleep(sleep_time)
+
+    def success(self, key):
+        """Additively shrink the proxy's delay after a good page"""
+        with self._lock:
+            entry = self._entry(key)
+            entry["delay"] = max(self.min_delay, entry["delay"] - self.decrease_step)
+            entry["successes"] += 1
+            entry["updated_at"] = time.time()
+            self._dirty.add(key or DIRECT)
+            self._save()
+
+    def failure(self, key, reason="captcha"):
+        """
+        Multiplicatively grow the proxy's delay after a captcha or bad page.
+
+        Args:
+            key (str): Proxy or None for direct connections
+            reason (str): Failure kind, e.g. 'captcha' or 'unknown'
+        """
+        with self._lock:
+            entry = self._entry(key)
+            entry["delay"] = min(self.max_delay, entry["delay"] * self.backoff_factor)
+            entry["failures"] += 1
+            entry["last_failure"] = reason
+            entry["updated_at"] = time.time()
+            self._dirty.add(key or DIRECT)
+            self._save()
+
+    def snapshot(self):
+        """
+        Current pacing state for operators.
+
+        Returns:
+            dict: ``proxy -> {'delay', 'pages_per_min', 'successes', 'failures', ...}``
+        """
+        with self._lock:
+            return {
+                key: dict(entry, pages_per_min=round(60.0 / entry["delay"], 2))
+                for key, entry in self.state.items()
+            }
+
+
+# Print the persisted pacing state
+if __name__ == "__main__":
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "pacing_state.json"
+    pacer = AIMDPacer(state_path=path)
+    for proxy, entry in sorted(pacer.snapshot().items()):
+        print(
+            f"{proxy:<24} delay={entry['delay']:.1f}s "
+            f"rate={entry['pages_per_min']}/min "
+            f"ok={entry['successes']} fail={entry['failures']} "
+            f"last_failure={entry['last_failure']}"
+        )
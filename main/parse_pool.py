@@ -0,0 +1,163 @@
+"""
+Process pool for profile extraction.
+Scrapers hand captured page source to the pool and get a future back, so a
+browser moves on to its next URL while the page is parsed in another process.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from details import extract_pitchbook_data, cached_profile, archive_result, completed_future
+
+
+def _parse_job(html_content, url, sections, backend, submitted_at):
+    """Worker: extract one page and report how long it waited and how long it took"""
+    started = time.time()
+    data = extract_pitchbook_data(html_content, url, backend=backend, sections=sections)
+    return data, started - submitted_at, time.time() - started
+
+
+class ParsePool:
+    """
+    Bounded parse stage backed by a ProcessPoolExecutor.
+
+    At most ``max_pending`` pages are queued or parsing at once; ``submit``
+    blocks past that, so a burst of fast page loads cannot pile unbounded HTML
+    into memory. Time is split into 'queued' (submit until a worker starts,
+    including the transfer of the page) and 'parse' (extraction in the worker).
+    """
+
+    def __init__(self, workers=None, max_pending=None, backend=None, logger=None):
+        """
+        Initialize the parse pool.
+
+        Args:
+            workers (int, optional): Parser processes; defaults to all cores
+            max_pending (int, optional): Pages queued or parsing before submit
+                blocks; defaults to 4 per worker
+            backend (str, optional): Parser backend; defaults to config.json
+            logger: Logger instance
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.backend = backend
+        self.logger = logger
+
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        # spawn: workers must not inherit browser handles, sockets or threads
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self.stats = {
+            "submitted": 0, "completed": 0, "failed": 0, "cached": 0,
+            "pending": 0, "max_pending_seen": 0,
+            "blocked_seconds": 0.0, "queued_seconds": 0.0, "parse_seconds": 0.0,
+        }
+
+    def _log(self, level, message):
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(message)
+
+    def submit(self, html_content, url, sections=None, on_result=None):
+        """
+        Queue a page for extraction, blocking while the pool is full.
+
+        Args:
+            html_content (str): Page source
+            url (str): Profile URL
+            sections (iterable, optional): Only extract these SECTIONS
+            on_result (callable, optional): Called with the data before the
+                future resolves (runs on the pool's result thread)
+
+        Returns:
+            Future: Resolves to the extracted dict
+        """
+        waited = time.time()
+        self._slots.acquire()
+        blocked = time.time() - waited
+
+        with self._lock:
+            self.stats["submitted"] += 1
+            self.stats["pending"] += 1
+            self.stats["max_pending_seen"] = max(self.stats["max_pending_seen"], self.stats["pending"])
+            self.stats["blocked_seconds"] += blocked
+
+        result = Future()
+        try:
+            job = self._executor.submit(_parse_job, html_content, url,
+                                        list(sections) if sections is not None else None,
+                                        self.backend, time.time())
+        except Exception:
+            self._finish(failed=True)
+            raise
+
+        def done(job):
+            try:
+                data, queued, parse = job.result()
+            except Exception as e:
+                self._finish(failed=True)
+                self._log("error", f"Parse failed for {url}: {e}")
+                result.set_exception(e)
+                return
+            self._finish(queued=queued, parse=parse)
+            if on_result:
+                try:
+                    on_result(data)
+                except Exception as e:
+                    self._log("warning", f"Result hook failed for {url}: {e}")
+            result.set_result(data)
+
+        job.add_done_callback(done)
+        return result
+
+    def _finish(self, failed=False, queued=0.0, parse=0.0):
+        self._slots.release()
+        with self._lock:
+            self.stats["pending"] -= 1
+            self.stats["failed" if failed else "completed"] += 1
+            self.stats["queued_seconds"] += queued
+            self.stats["parse_seconds"] += parse
+
+    def submit_profile(self, html_content, url, archive=None, sections=None):
+        """
+        Pool counterpart of details.parse_profile: archive the page, reuse a
+        cached extraction, otherwise parse in a worker and cache the result.
+
+        Returns:
+            Future: Resolves to the extracted dict
+        """
+        if archive is None:
+            return self.submit(html_content, url, sections)
+
+        entry, data = cached_profile(html_content, url, archive, sections)
+        if data is not None:
+            with self._lock:
+                self.stats["cached"] += 1
+            return completed_future(data)
+
+        on_result = lambda data: archive_result(archive, entry, data, sections)
+        return self.submit(html_content, url, sections, on_result=on_result)
+
+    def summary(self):
+        """
+        Parse stage counters for the run log.
+
+        Returns:
+            dict: Counters plus mean queued and parse milliseconds per page
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        done = stats["completed"]
+        stats["queued_ms_mean"] = round(stats["queued_seconds"] / done * 1000, 1) if done else 0.0
+        stats["parse_ms_mean"] = round(stats["parse_seconds"] / done * 1000, 1) if done else 0.0
+        for key in ("blocked_seconds", "queued_seconds", "parse_seconds"):
+            stats[key] = round(stats[key], 2)
+        return stats
+
+    def close(self, wait=True):
+        """Shut the worker processes down, finishing queued pages when wait is True"""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
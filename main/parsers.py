@@ -0,0 +1,433 @@
+"""
+HTML parser backends for the PitchBook extractors.
+Every backend exposes the small part of the BeautifulSoup Tag API the
+extractors use, so extract_pitchbook_data returns the same dict on each for
+browser-serialized pages (driver.page_source). On raw server markup the tree
+builders disagree: lxml and lexbor close a <p> at a nested block element where
+html.parser keeps nesting, and lexbor inserts the <tbody> a table left out.
+Entities and comments parse the same everywhere. See test_parsers.py.
+"""
+
+import functools
+import json
+import os
+import re
+
+
+DEFAULT_BACKEND = "bs4"
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.json")
+
+
+def attrs_match(attrs, container):
+    """
+    Whether an element's attributes match a section container.
+
+    Args:
+        attrs (dict): Element attributes; class may be a string or a list
+        container (tuple): (attribute, value); 'class' matches one class name,
+            other attributes match exactly, and a None value matches presence
+
+    Returns:
+        bool: True on a match
+    """
+    attr, value = container
+    if attr not in attrs:
+        return False
+    if value is None:
+        return True
+    # selectolax reports valueless attributes as None
+    found = attrs[attr] or ""
+    if attr == "class":
+        return value in (found.split() if isinstance(found, str) else found)
+    return found == value
+
+
+def container_css(container):
+    """CSS selector equivalent to attrs_match for a container"""
+    attr, value = container
+    if value is None:
+        return f"[{attr}]"
+    if attr == "class":
+        return f".{value}"
+    if attr == "id":
+        return f"#{value}"
+    return f'[{attr}="{value}"]'
+
+
+_SIMPLE_CSS = re.compile(r'^(?:\.(?P<cls>[\w-]+)|#(?P<id>[\w-]+)|\[(?P<attr>[\w-]+)(?:="(?P<value>[^"]*)")?\])$')
+
+
+def css_containers(css):
+    """
+    Inverse of container_css for a selector list.
+
+    Args:
+        css (str): Comma-separated selectors
+
+    Returns:
+        list or None: (attribute, value) pairs, or None if any selector is more
+            than a single class, id or attribute test
+    """
+    containers = []
+    for part in css.split(","):
+        match = _SIMPLE_CSS.match(part.strip())
+        if not match or match["attr"] == "class":
+            return None
+        if match["cls"]:
+            containers.append(("class", match["cls"]))
+        elif match["id"]:
+            containers.append(("id", match["id"]))
+        else:
+            containers.append((match["attr"], match["value"]))
+    return containers
+
+
+def container_strainer(containers):
+    """
+    SoupStrainer that only builds the given section containers and their subtrees.
+
+    Args:
+        containers (list): (attribute, value) pairs, see attrs_match
+
+    Returns:
+        SoupStrainer: Strainer for BeautifulSoup(parse_only=...)
+    """
+    from bs4 import SoupStrainer
+
+    def match(name, attrs):
+        return any(attrs_match(attrs or {}, container) for container in containers)
+
+    if hasattr(SoupStrainer, "allow_tag_creation"):
+        # bs4 >= 4.13 passes only the tag name to a name function; the tag-creation hook sees the attributes
+        class ContainerStrainer(SoupStrainer):
+            includes_everything = False
+
+            def allow_tag_creation(self, nsprefix, name, attrs):
+                return match(name, attrs)
+
+        return ContainerStrainer()
+    # Older versions call a name function with (name, attrs) while parsing
+    return SoupStrainer(match)
+
+
+@functools.lru_cache(maxsize=256)
+def _lxml_xpath(css):
+    from cssselect import HTMLTranslator
+    from lxml import etree
+    # descendant:: rather than cssselect's descendant-or-self::, as Tag.select never matches itself
+    return etree.XPath(HTMLTranslator().css_to_xpath(css, prefix="descendant::"))
+
+
+class LxmlSelector:
+    """Compiled CSS selector (XPath) for LxmlNode"""
+
+    __slots__ = ("xpath",)
+
+    def __init__(self, css):
+        self.xpath = _lxml_xpath(css)
+
+    def select(self, node):
+        return [LxmlNode(el) for el in self.xpath(node.el)]
+
+    def select_one(self, node):
+        found = self.xpath(node.el)
+        return LxmlNode(found[0]) if found else None
+
+
+class SelectolaxSelector:
+    """lexbor parses selectors natively, so compiling only keeps the string"""
+
+    __slots__ = ("css",)
+
+    def __init__(self, css):
+        self.css = css
+
+    def select(self, node):
+        return node.select(self.css)
+
+    def select_one(self, node):
+        return node.select_one(self.css)
+
+
+class AttrsSelector:
+    """
+    Selector list of single class, id or attribute tests for BeautifulSoup.
+    Matching attributes in Python skips soupsieve's per-element selector
+    machinery, which dominated extraction on large pages.
+    """
+
+    __slots__ = ("containers",)
+
+    def __init__(self, containers):
+        self.containers = containers
+
+    def _iter(self, node):
+        for el in node.descendants:
+            # Strings have no attrs; tags without attributes cannot match
+            attrs = getattr(el, "attrs", None)
+            if attrs and any(attrs_match(attrs, container) for container in self.containers):
+                yield el
+
+    def select(self, node):
+        return list(self._iter(node))
+
+    def select_one(self, node):
+        return next(self._iter(node), None)
+
+
+def _strip_join(strings, separator):
+    # Same rule as Tag.get_text(separator, strip=True)
+    return separator.join(s.strip() for s in strings if s.strip())
+
+
+class LxmlNode:
+    """lxml element with the Tag methods used by the extractors"""
+
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    def _strings(self, el=None):
+        el = self.el if el is None else el
+        if el.text:
+            yield el.text
+        for child in el:
+            # Comments and processing instructions have a non-string tag
+            if isinstance(child.tag, str):
+                yield from self._strings(child)
+            if child.tail:
+                yield child.tail
+
+    @property
+    def text(self):
+        return "".join(self._strings())
+
+    def get_text(self, separator="", strip=False):
+        if strip:
+            return _strip_join(self._strings(), separator)
+        return separator.join(self._strings())
+
+    @property
+    def attrs(self):
+        return self.el.attrib
+
+    def get(self, name, default=None):
+        return self.el.get(name, default)
+
+    def select(self, css):
+        return LxmlSelector(css).select(self)
+
+    def select_one(self, css):
+        return LxmlSelector(css).select_one(self)
+
+    def find_all(self, name):
+        return [LxmlNode(el) for el in self.el.iterdescendants(name)]
+
+    def find(self, name):
+        return next((LxmlNode(el) for el in self.el.iterdescendants(name)), None)
+
+
+class SelectolaxNode:
+    """selectolax (lexbor) node with the Tag methods used by the extractors"""
+
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def _strings(self):
+        for node in self.node.traverse(include_text=True):
+            if node.tag == "-text":
+                yield node.text_content
+
+    @property
+    def text(self):
+        return "".join(self._strings())
+
+    def get_text(self, separator="", strip=False):
+        if strip:
+            return _strip_join(self._strings(), separator)
+        return separator.join(self._strings())
+
+    @property
+    def attrs(self):
+        return self.node.attributes
+
+    def get(self, name, default=None):
+        value = self.node.attributes.get(name, default)
+        # Valueless attributes come back as None; BeautifulSoup gives ''
+        return "" if value is None and name in self.node.attributes else value
+
+    def select(self, css):
+        return [SelectolaxNode(node) for node in self.node.css(css)]
+
+    def select_one(self, css):
+        node = self.node.css_first(css)
+        return SelectolaxNode(node) if node is not None else None
+
+    def find_all(self, name):
+        return self.select(name)
+
+    def find(self, name):
+        return self.select_one(name)
+
+
+class ParserBackend:
+    """Parses HTML into a root node and releases it afterwards"""
+
+    name = None
+
+    def parse(self, html, containers=None):
+        """
+        Parse a page.
+
+        Args:
+            html (str): Page source
+            containers (list, optional): (attribute, value) pairs of the only
+                subtrees the caller will read; backends may ignore it
+
+        Returns:
+            Root node
+        """
+        raise NotImplementedError
+
+    def compile(self, css):
+        """
+        Compile a CSS selector once for repeated use.
+
+        Returns:
+            Object with select(node) and select_one(node)
+        """
+        raise NotImplementedError
+
+    def release(self, root):
+        """Free the parsed tree to bound peak memory"""
+
+
+class BeautifulSoupBackend(ParserBackend):
+    """BeautifulSoup with the stdlib html.parser (the original behavior)"""
+
+    name = "bs4"
+
+    def parse(self, html, containers=None):
+        from bs4 import BeautifulSoup
+        # Partial parse: tokenize everything but only build the requested subtrees
+        parse_only = container_strainer(containers) if containers else None
+        return BeautifulSoup(html, "html.parser", parse_only=parse_only)
+
+    def compile(self, css):
+        containers = css_containers(css)
+        if containers:
+            return AttrsSelector(containers)
+        import soupsieve
+        return soupsieve.compile(css)
+
+    def release(self, root):
+        root.decompose()
+
+
+class LxmlBackend(ParserBackend):
+    """lxml.html with cssselect"""
+
+    name = "lxml"
+
+    def parse(self, html, containers=None):
+        # lxml builds the full tree in C faster than a strained bs4 parse
+        import lxml.html
+        return LxmlNode(lxml.html.document_fromstring(html))
+
+    def compile(self, css):
+        return LxmlSelector(css)
+
+    def release(self, root):
+        root.el.clear()
+
+
+class SelectolaxBackend(ParserBackend):
+    """selectolax on the lexbor engine"""
+
+    name = "selectolax"
+
+    def parse(self, html, containers=None):
+        from selectolax.lexbor import LexborHTMLParser
+        return SelectolaxNode(LexborHTMLParser(html).root)
+
+    def compile(self, css):
+        return SelectolaxSelector(css)
+
+    def release(self, root):
+        # lexbor refuses to decompose the root itself
+        for child in list(root.node.iter()):
+            child.decompose()
+
+
+BACKENDS = {
+    BeautifulSoupBackend.name: BeautifulSoupBackend,
+    LxmlBackend.name: LxmlBackend,
+    SelectolaxBackend.name: SelectolaxBackend,
+}
+
+_backends = {}
+_configured = []
+
+
+def configured_backend_name():
+    """Backend named by config.json "parser_backend" (read once), defaulting to bs4"""
+    if not _configured:
+        try:
+            with open(CONFIG_PATH, "r") as f:
+                _configured.append(json.load(f).get("parser_backend", DEFAULT_BACKEND))
+        except (OSError, ValueError):
+            _configured.append(DEFAULT_BACKEND)
+    return _configured[0]
+
+
+def get_backend(name=None):
+    """
+    Get a parser backend instance.
+
+    Falls back to bs4 when the requested backend's package is not installed.
+
+    Args:
+        name (str, optional): 'bs4', 'lxml' or 'selectolax'. Defaults to config.json.
+
+    Returns:
+        ParserBackend: Backend instance (cached per name)
+    """
+    name = name or configured_backend_name()
+    if name not in _backends:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown parser backend: {name} (choose from {', '.join(BACKENDS)})")
+        backend = BACKENDS[name]()
+        try:
+            backend.release(backend.parse("<html><body></body></html>"))
+        except ImportError as e:
+            print(f"Parser backend {name} unavailable ({e}), using {DEFAULT_BACKEND}")
+            backend = BeautifulSoupBackend()
+        _backends[name] = backend
+    return _backends[name]
+
+
+# Compare backends on saved pages: python parsers.py page1.html page2.html ...
+# Save page_source rather than raw HTTP bodies; see the module docstring
+if __name__ == "__main__":
+    import sys
+    from details import extract_pitchbook_data
+
+    failures = 0
+    for path in sys.argv[1:]:
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+        results = {}
+        for name in BACKENDS:
+            data = extract_pitchbook_data(html, path, backend=name)
+            data.pop("scraped_at")
+            results[name] = json.dumps(data, sort_keys=True)
+        reference = results[DEFAULT_BACKEND]
+        for name, result in results.items():
+            if result != reference:
+                failures += 1
+                print(f"✗ {path}: {name} differs from {DEFAULT_BACKEND}")
+        print(f"{path}: compared {len(results)} backends")
+    sys.exit(1 if failures else 0)
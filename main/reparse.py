@@ -0,0 +1,259 @@
+"""
+Offline re-parse of archived profile HTML.
+Runs the current extract_pitchbook_data over the archive on all cores and
+writes back only the sections whose hash changed, with the same updates
+(details.build_change_update) a scrape would send.
+"""
+
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from datetime import datetime
+
+from pymongo import MongoClient, UpdateOne
+
+from archive import HtmlArchive, DEFAULT_ARCHIVE_DIR, UNKNOWN, blob_path, read_blob
+from details import extract_pitchbook_data, build_change_update, EXTRACTOR_VERSION
+from logger import CustomLogger
+
+
+_worker_state = {}
+
+
+def _init_worker(objects_dir):
+    import zstandard
+    _worker_state["objects_dir"] = objects_dir
+    _worker_state["decompressor"] = zstandard.ZstdDecompressor()
+
+
+def _parse_row(row):
+    """Worker: decompress an archived page from its memory map and extract it"""
+    fetch_id, url, sha256 = row
+    try:
+        html = read_blob(blob_path(_worker_state["objects_dir"], sha256), _worker_state["decompressor"])
+        data = extract_pitchbook_data(html, url)
+    except Exception as e:
+        return fetch_id, url, sha256, None, f"{e.__class__.__name__}: {e}"
+    # The page was scraped when it was archived, not now
+    data.pop("scraped_at", None)
+    return fetch_id, url, sha256, data, None
+
+
+class Reparser:
+    """
+    Re-parse the newest usable archived copy of every profile and write back changes.
+
+    Progress is checkpointed after every flushed batch (last archive fetch id
+    and extractor version), so an interrupted run resumes where it stopped.
+    Bumping EXTRACTOR_VERSION starts a fresh pass.
+    """
+
+    def __init__(self, archive, collection=None, workers=None, batch_size=500,
+                 checkpoint_path="reparse_checkpoint.json", dry_run=False, force=False, insert=False, logger=None):
+        """
+        Initialize the re-parser.
+
+        Args:
+            archive (HtmlArchive): Archive to read pages from
+            collection: PITCHBOOK.OrganizationDetails, or None to only parse
+            workers (int, optional): Parser processes; defaults to all cores
+            batch_size (int): Documents per bulk write
+            checkpoint_path (str): Resume state file
+            dry_run (bool): Compare against the database without writing
+            force (bool): Parse pages whose result is already cached for this EXTRACTOR_VERSION
+            insert (bool): Also create documents for archived profiles the
+                database does not have; by default they are counted as 'missing'
+            logger: Logger instance
+        """
+        self.archive = archive
+        self.collection = collection
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path
+        self.dry_run = dry_run
+        self.force = force
+        self.insert = insert
+        self.logger = logger or CustomLogger(log_folder="logs")
+
+        self.stats = {"parsed": 0, "skipped": 0, "unknown": 0, "changed": 0, "unchanged": 0, "inserted": 0,
+                      "missing": 0, "conflicts": 0, "errors": 0}
+        self.last_id = 0
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if checkpoint.get("extractor_version") != EXTRACTOR_VERSION:
+            self.logger.info("Extractor version changed, starting a fresh pass")
+            return 0
+        return checkpoint.get("last_id", 0)
+
+    def save_checkpoint(self):
+        checkpoint = {
+            "last_id": self.last_id,
+            "extractor_version": EXTRACTOR_VERSION,
+            "updated_at": datetime.utcnow().isoformat(),
+            "stats": self.stats,
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _rows(self):
+        for row in self.archive.iter_latest("profile", after_id=self.last_id):
+            if not self.force and self.archive.cached_result(row[2], EXTRACTOR_VERSION) is not None:
+                # Parsed by this extractor when it was scraped, the stored document is current
+                self.stats["skipped"] += 1
+                continue
+            yield row
+
+    def flush(self, batch):
+        """
+        Write the sections of a batch whose hash differs from the database.
+
+        Changed sections are written together with their section hashes and
+        content_hash (details.build_change_update), so later scrapes compare
+        against what the re-parse wrote. Unchanged documents are not touched:
+        a re-parse is not a sighting, so 'last_seen_at' is never written.
+        Profiles without a stored document are skipped unless ``insert`` is set.
+        Updates are guarded by the stored content_hash: a document a scrape
+        rewrote in the meantime holds newer content and is left alone
+        (counted as 'conflicts').
+
+        Args:
+            batch (list): Extracted data dicts
+
+        Returns:
+            set: source_urls skipped because the database has no document for them
+        """
+        if not batch or self.collection is None:
+            return set()
+
+        urls = [data["source_url"] for data in batch]
+        stored = {
+            doc["source_url"]: doc
+            for doc in self.collection.find(
+                {"source_url": {"$in": urls}}, {"source_url": 1, "section_hashes": 1, "content_hash": 1}
+            )
+        }
+
+        now = datetime.utcnow()
+        operations, missing, guarded = [], set(), 0
+        for data in batch:
+            if data["source_url"] not in stored and not self.insert:
+                self.stats["missing"] += 1
+                missing.add(data["source_url"])
+                continue
+            query, update, upsert, changed = build_change_update(data, stored.get(data["source_url"]))
+            if not changed:
+                self.stats["unchanged"] += 1
+                continue
+            self.stats["inserted" if upsert else "changed"] += 1
+            update["$set"].pop("last_seen_at", None)
+            update["$set"]["reparsed_at"] = now
+            operations.append(UpdateOne(query, update, upsert=upsert))
+            guarded += not upsert
+
+        if operations and not self.dry_run:
+            result = self.collection.bulk_write(operations, ordered=False)
+            # Upserts of documents that exist by now count as matches too
+            inserts = len(operations) - guarded
+            conflicts = guarded - (result.matched_count - (inserts - result.upserted_count))
+            if conflicts > 0:
+                self.stats["changed"] -= conflicts
+                self.stats["conflicts"] += conflicts
+                self.logger.warning(f"{conflicts} documents were rewritten by a scrape during the re-parse, left as is")
+        return missing
+
+    def run(self, restart=False):
+        """
+        Re-parse the archive.
+
+        Args:
+            restart (bool): Ignore the checkpoint and start from the beginning
+
+        Returns:
+            dict: Counters for parsed, skipped, unknown, changed, unchanged, inserted, missing, conflicts and errors
+        """
+        self.last_id = 0 if restart else self.load_checkpoint()
+        started = time.time()
+        self.logger.info(f"Re-parsing archive from fetch id {self.last_id} with {self.workers} workers")
+
+        rows = self._rows()
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(self.workers, initializer=_init_worker, initargs=(self.archive.objects_dir,)) as pool:
+            while True:
+                # A bounded window keeps memory flat however large the archive is
+                window = list(itertools.islice(rows, self.batch_size))
+                if not window:
+                    break
+
+                batch, hashes = [], []
+                chunksize = max(1, len(window) // (self.workers * 4))
+                for fetch_id, url, sha256, data, error in pool.imap(_parse_row, window, chunksize):
+                    if error:
+                        self.stats["errors"] += 1
+                        self.logger.error(f"Failed to parse {url} ({sha256[:12]}): {error}")
+                        continue
+                    if data.get("company_name") == "Unknown":
+                        # Challenge or half-loaded page: never overwrite a stored profile with it
+                        self.stats["unknown"] += 1
+                        self.logger.warning(f"Skipping {url} ({sha256[:12]}): extracted to Unknown")
+                        if not self.dry_run:
+                            self.archive.set_state(fetch_id, UNKNOWN)
+                        continue
+                    self.stats["parsed"] += 1
+                    batch.append(data)
+                    hashes.append(sha256)
+
+                missing = self.flush(batch)
+                if not self.dry_run:
+                    # Cache only after the write, so a skipped page always has a current document
+                    for sha256, data in zip(hashes, batch):
+                        if data["source_url"] not in missing:
+                            self.archive.store_result(sha256, EXTRACTOR_VERSION, data)
+                self.last_id = window[-1][0]
+                self.save_checkpoint()
+
+                elapsed = time.time() - started
+                self.logger.info(f"Re-parsed {self.stats['parsed']} pages "
+                                 f"({self.stats['parsed'] / elapsed:.1f}/s): {self.stats}")
+
+        self.save_checkpoint()
+        return self.stats
+
+
+if __name__ == "__main__":
+    import argparse
+    from main import DEFAULT_MONGO_URI
+
+    parser = argparse.ArgumentParser(description="Re-parse archived PitchBook profiles with the current extractor")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE_DIR, help="Archive directory")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: all cores)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Documents per bulk write")
+    parser.add_argument("--checkpoint", default="reparse_checkpoint.json", help="Resume state file")
+    parser.add_argument("--mongo-uri", default=DEFAULT_MONGO_URI, help="MongoDB connection URI")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint")
+    parser.add_argument("--force", action="store_true", help="Also parse pages already parsed by this extractor")
+    parser.add_argument("--dry-run", action="store_true", help="Count changes without writing")
+    parser.add_argument("--insert", action="store_true",
+                        help="Also insert archived profiles that have no document in the database")
+    args = parser.parse_args()
+
+    client = MongoClient(args.mongo_uri, serverSelectionTimeoutMS=5000)
+    reparser = Reparser(
+        HtmlArchive(args.archive),
+        collection=client.PITCHBOOK['OrganizationDetails'],
+        workers=args.workers,
+        batch_size=args.batch_size,
+        checkpoint_path=args.checkpoint,
+        dry_run=args.dry_run,
+        force=args.force,
+        insert=args.insert
+    )
+    print(reparser.run(restart=args.restart))
@@ -0,0 +1,292 @@
+"""
+Declarative extraction schema for PitchBook profile pages.
+Selectors are compiled once per parser backend. One selector pass over the
+page finds every section container, and each section only reads its own subtree.
+"""
+
+import functools
+import re
+
+from parsers import attrs_match, container_css
+
+
+_KEY_CHARS = re.compile(r"[^a-z0-9]+")
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_key(text: str) -> str:
+    """Normalize text for use as dictionary key (memoized: labels repeat on every page)"""
+    text = text.strip().lower()
+    text = _KEY_CHARS.sub("_", text)
+    return text.strip("_")
+
+
+def clean_text(el):
+    """Extract and clean text from a parsed element"""
+    return el.get_text(" ", strip=True) if el else None
+
+
+class Section:
+    """
+    One named part of the extracted dict, read from a container element.
+
+    Subclasses declare their CSS selectors in ``selectors``; they are compiled
+    once per backend and handed to ``extract`` as a name -> selector dict.
+    """
+
+    selectors = {}
+    # Whether only the first container in document order is read
+    first_only = True
+
+    def __init__(self, name, container):
+        """
+        Args:
+            name (str): Key in the extracted dict
+            container (tuple): (attribute, value) identifying the container element
+        """
+        self.name = name
+        self.container = container
+
+    def extract(self, containers, sel, root):
+        """
+        Extract the section.
+
+        Args:
+            containers (list): Matching containers in document order (only the
+                first when first_only), possibly empty
+            sel (dict): Compiled selectors
+            root: Parsed page, for selectors that must see the whole page
+
+        Returns:
+            Section value
+        """
+        raise NotImplementedError
+
+
+class ItemsSection(Section):
+    """Key/value pairs where every container is one item (the overview strip)"""
+
+    first_only = False
+
+    def __init__(self, name, container, label, value):
+        super().__init__(name, container)
+        self.selectors = {"label": label, "value": value}
+
+    def extract(self, containers, sel, root):
+        items = {}
+        for item in containers:
+            label_elem = sel["label"].select_one(item)
+            value_elem = sel["value"].select_one(item)
+            if label_elem and value_elem:
+                items[normalize_key(label_elem.text)] = value_elem.text.strip()
+        return items
+
+
+class GeneralInfoSection(Section):
+    """Description, contact items, corporate office and social links"""
+
+    selectors = {
+        "description": ".pp-description_text",
+        "contact_items": ".pp-contact-info_item",
+        "contact_label": "h5, .font-weight-bold",
+        "contact_value": "a, .font-weight-regular",
+        "office": ".pp-contact-info_corporate-office",
+        "office_lines": "ul li",
+        "socials": ".info-item__social div a",
+    }
+
+    def extract(self, containers, sel, root):
+        info = {}
+        if not containers:
+            return info
+        section = containers[0]
+
+        desc_elem = sel["description"].select_one(section)
+        if desc_elem:
+            info['description'] = clean_text(desc_elem)
+
+        for item in sel["contact_items"].select(section):
+            label_elem = sel["contact_label"].select_one(item)
+            if label_elem:
+                label = label_elem.text.strip()
+                value_elem = sel["contact_value"].select_one(item)
+                if value_elem:
+                    info[normalize_key(label)] = value_elem.get('title') or value_elem.text.strip()
+
+        office_elem = sel["office"].select_one(section)
+        if office_elem:
+            address_lines = [li.text.strip() for li in sel["office_lines"].select(office_elem)]
+            info['corporate_office'] = ", ".join(address_lines)
+
+        socials = {}
+        for social in sel["socials"].select(section):
+            platform = social.get('aria-label', '').replace(' link', '').lower()
+            if platform:
+                socials[platform] = social.get('href')
+        if socials:
+            info['social_links'] = socials
+
+        return info
+
+
+class TableSection(Section):
+    """Rows of the first table in the container, keyed by normalized headers"""
+
+    selectors = {"locked": ".data-table__gray-box"}
+
+    def extract(self, containers, sel, root):
+        if not containers:
+            return []
+        table = containers[0].find('table')
+        if not table:
+            return []
+
+        headers = [normalize_key(th.text) for th in table.find_all('th')]
+        rows = []
+        tbody = table.find('tbody')
+        if not tbody:
+            return []
+
+        for tr in tbody.find_all('tr'):
+            cells = tr.find_all('td')
+            if len(cells) == len(headers):
+                row_data = {}
+                for i, cell in enumerate(cells):
+                    if sel["locked"].select_one(cell):
+                        row_data[headers[i]] = "[Locked/Blurred]"
+                    else:
+                        row_data[headers[i]] = cell.get('title') or cell.text.strip()
+                rows.append(row_data)
+        return rows
+
+
+class ListSection(Section):
+    """
+    A list of records, one per item element inside the container.
+
+    Each field is the stripped text of a sub-selector (None when absent); an
+    item missing a required field is skipped. ``link`` adds a field built
+    from an attribute of the item itself.
+    """
+
+    first_only = False
+
+    def __init__(self, name, container, items, fields, required, link=None):
+        """
+        Args:
+            name (str): Key in the extracted dict
+            container (tuple): (attribute, value) of the list container
+            items (str): Item selector relative to the container
+            fields (dict): Field name -> selector relative to the item
+            required (tuple): Fields an item must have to be kept
+            link (tuple, optional): (field, attribute, prefix)
+        """
+        super().__init__(name, container)
+        self.fields = list(fields)
+        self.required = required
+        self.link = link
+        self.selectors = dict(fields, items=items,
+                              all_items=f"{container_css(container)} {items}")
+
+    def extract(self, containers, sel, root):
+        if not containers:
+            return []
+        if len(containers) == 1:
+            items = sel["items"].select(containers[0])
+        else:
+            # Several (possibly nested) containers: one page-wide select keeps document order without duplicates
+            items = sel["all_items"].select(root)
+
+        records = []
+        for item in items:
+            record = {}
+            for field in self.fields:
+                elem = sel[field].select_one(item)
+                record[field] = elem.text.strip() if elem else None
+            if any(record[field] is None for field in self.required):
+                continue
+            if self.link:
+                field, attr, prefix = self.link
+                value = item.get(attr)
+                record[field] = prefix + value if value else None
+            records.append(record)
+        return records
+
+
+class ProfileSchema:
+    """
+    Ordered set of sections plus the company title.
+
+    ``extract`` runs one selector-list pass that returns every container of
+    the requested sections in document order. Each container is routed to its
+    section by attribute match, and sections then only query their own subtree.
+    """
+
+    def __init__(self, title, sections):
+        """
+        Args:
+            title (tuple): (attribute, value) of the company name element
+            sections (list): Section objects in output order
+        """
+        self.title = title
+        self.sections = {section.name: section for section in sections}
+        self._compiled = {}
+
+    def compiled(self, backend, names):
+        """Selectors for a backend and section selection, compiled on first use"""
+        key = (backend.name, tuple(names))
+        if key not in self._compiled:
+            containers = [self.title] + [self.sections[name].container for name in names]
+            self._compiled[key] = (
+                backend.compile(", ".join(dict.fromkeys(container_css(c) for c in containers))),
+                {name: {field: backend.compile(css) for field, css in self.sections[name].selectors.items()}
+                 for name in names}
+            )
+        return self._compiled[key]
+
+    def extract(self, root, backend, names):
+        """
+        Extract the title and the named sections.
+
+        Args:
+            root: Parsed page from ``backend``
+            backend (ParserBackend): Backend that parsed the page
+            names (list): Section names in output order
+
+        Returns:
+            tuple: (company title element or None, {section name: value})
+        """
+        union, selectors = self.compiled(backend, names)
+        title = None
+        found = {name: [] for name in names}
+        for element in union.select(root):
+            attrs = element.attrs
+            if title is None and attrs_match(attrs, self.title):
+                title = element
+            for name in names:
+                section = self.sections[name]
+                if attrs_match(attrs, section.container) and not (section.first_only and found[name]):
+                    found[name].append(element)
+
+        return title, {name: self.sections[name].extract(found[name], selectors[name], root) for name in names}
+
+
+PROFILE_SCHEMA = ProfileSchema(
+    title=('class', 'pp-search-wrap__title'),
+    sections=[
+        ItemsSection('overview', ('data-pp-overview-item', None),
+                     label='.dont-break.text-small', value='.pp-overview-item__title'),
+        GeneralInfoSection('general_info', ('class', 'general-info')),
+        TableSection('valuation_funding', ('id', 'funding')),
+        TableSection('cap_table', ('id', 'captable')),
+        TableSection('competitors', ('id', 'competitors')),
+        TableSection('investors', ('id', 'investors')),
+        TableSection('patents', ('id', 'patents')),
+        ListSection('faqs', ('class', 'pp-faqs-table'), items='li',
+                    fields={'question': 'h3', 'answer': 'p'}, required=('question', 'answer')),
+        ListSection('related_research', ('id', 'research'), items='.pp-related-research__item',
+                    fields={'title': '.pp-related-research__item-title',
+                            'date': '.pp-related-research__item-release'},
+                    required=('title',), link=('url', 'href', "https://pitchbook.com")),
+    ]
+)
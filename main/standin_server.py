@@ -0,0 +1,209 @@
+"""
+Local stand-in for pitchbook.com, used to load-test the scraper.
+Serves search and profile pages from the fixture corpus with configurable
+latency, captcha injection and error rates.
+
+    python standin_server.py --port 8765 --latency 0.3 --captcha-rate 0.05
+    python main.py --base-url http://127.0.0.1:8765 --mongo-uri mongodb://localhost:27017
+"""
+
+import glob
+import hashlib
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from details import CAPTCHA_MARKER
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+CAPTCHA_PAGE = f"""<!DOCTYPE html>
+<html><head><title>Just a moment...</title></head>
+<body><div class="challenge"><h1>{CAPTCHA_MARKER}</h1><p>Complete the check to continue.</p></div></body></html>
+"""
+
+ERROR_PAGE = """<!DOCTYPE html>
+<html><head><title>Error</title></head><body><h1>Something went wrong</h1></body></html>
+"""
+
+
+def _digest(text):
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:12], 16)
+
+
+class StandinState:
+    """Shared configuration and request counters of a stand-in server"""
+
+    def __init__(self, latency=0.2, jitter=0.5, captcha_rate=0.0, error_rate=0.0, results_per_search=3,
+                 fixtures_dir=FIXTURES_DIR, seed=None):
+        """
+        Args:
+            latency (float): Mean response delay in seconds
+            jitter (float): Delay varies uniformly by +/- this fraction of ``latency``
+            captcha_rate (float): Fraction of page requests answered with a captcha (403)
+            error_rate (float): Fraction of page requests answered with a 500
+            results_per_search (int): Profile links on every search page
+            fixtures_dir (str): Directory with profile_*.html fixtures
+            seed (int, optional): Seed for injected failures and delays
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.captcha_rate = captcha_rate
+        self.error_rate = error_rate
+        self.results_per_search = results_per_search
+
+        self.profiles = []
+        for path in sorted(glob.glob(os.path.join(fixtures_dir, "profile_*.html"))):
+            with open(path, "r", encoding="utf-8") as f:
+                self.profiles.append(f.read())
+        if not self.profiles:
+            raise FileNotFoundError(f"No profile fixtures in {fixtures_dir}")
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts = {"search": 0, "profile": 0, "captcha": 0, "error": 0, "not_found": 0}
+
+    def count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counts)
+
+    def delay(self):
+        with self._lock:
+            return max(0.0, self.latency * (1 + self._random.uniform(-self.jitter, self.jitter)))
+
+    def injected_failure(self):
+        """'captcha', 'error' or None for the next page request"""
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.captcha_rate:
+            return "captcha"
+        if roll < self.captcha_rate + self.error_rate:
+            return "error"
+        return None
+
+    def search_page(self, query):
+        digest = _digest(query)
+        links = "".join(
+            f'<div class="search-result"><a href="/profiles/company/{(digest + i * 7919) % 900000 + 100000}-{i:02d}">'
+            f'{query} {i + 1}</a></div>'
+            for i in range(self.results_per_search)
+        )
+        return (f'<!DOCTYPE html><html><head><title>Search | PitchBook</title></head><body>'
+                f'<div class="search-results">{links}</div></body></html>')
+
+    def profile_page(self, company_id):
+        return self.profiles[_digest(company_id) % len(self.profiles)]
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "PitchBookStandin/1.0"
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate a load test
+        pass
+
+    def _send(self, status, body):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        # Challenge cookie, so the HTTP fast path has something to carry over
+        self.send_header("Set-Cookie", "pb_session=standin; Path=/")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        state = self.server.state
+        parts = urlsplit(self.path)
+        time.sleep(state.delay())
+
+        if parts.path == "/profiles/search":
+            kind = "search"
+        elif parts.path.startswith("/profiles/company/"):
+            kind = "profile"
+        elif parts.path == "/":
+            self._send(200, "<html><body>PitchBook stand-in</body></html>")
+            return
+        else:
+            state.count("not_found")
+            self._send(404, ERROR_PAGE)
+            return
+
+        failure = state.injected_failure()
+        if failure:
+            state.count(failure)
+            self._send(403 if failure == "captcha" else 500, CAPTCHA_PAGE if failure == "captcha" else ERROR_PAGE)
+            return
+
+        state.count(kind)
+        if kind == "search":
+            query = parse_qs(parts.query).get("q", [""])[0]
+            self._send(200, state.search_page(query))
+        else:
+            self._send(200, state.profile_page(parts.path.rsplit("/", 1)[-1]))
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, state):
+        super().__init__(address, StandinHandler)
+        self.state = state
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_server(host="127.0.0.1", port=0, **options):
+    """
+    Start a stand-in server on a background thread.
+
+    Args:
+        host (str): Bind address
+        port (int): Port; 0 picks a free one
+        **options: StandinState options (latency, captcha_rate, error_rate, ...)
+
+    Returns:
+        StandinServer: Running server; ``base_url`` is the site root to scrape,
+            ``state.snapshot()`` the request counters and ``shutdown()`` stops it
+    """
+    server = StandinServer((host, port), StandinState(**options))
+    threading.Thread(target=server.serve_forever, name="standin-server", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve fixture PitchBook pages locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean response delay in seconds")
+    parser.add_argument("--captcha-rate", type=float, default=0.0, help="Fraction of captcha responses")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--results", type=int, default=3, help="Profile links per search page")
+    args = parser.parse_args()
+
+    server = StandinServer((args.host, args.port), StandinState(
+        latency=args.latency, captcha_rate=args.captcha_rate, error_rate=args.error_rate,
+        results_per_search=args.results
+    ))
+    print(f"Serving PitchBook stand-in on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"Requests: {server.state.snapshot()}")
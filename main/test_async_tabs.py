@@ -0,0 +1,77 @@
+"""
+Test script for the asyncio engine's tab navigation.
+Drives AsyncTab against a stand-in DevTools connection; no Chrome needed.
+"""
+
+import asyncio
+import sys
+from async_scraper import AsyncTab
+from driver.readiness import PageKind, ReadinessCondition
+from driver.tabs import STALE_MARK
+
+print("="*60)
+print("Async Tab Validation")
+print("="*60)
+
+
+class FakePage:
+    """
+    A tab whose navigation commits only after a few readiness polls.
+    Until then the previous document, which already matches 'ready', stays current.
+    """
+
+    def __init__(self, commit_after=3):
+        self.commit_after = commit_after
+        self.window = {}
+        self.state = "ready"
+        self.polls_since_navigate = None
+
+    async def send(self, method, params=None, session_id=None, timeout=30):
+        if method == "Page.navigate":
+            self.polls_since_navigate = 0
+            return {}
+        expression = params["expression"]
+        if expression == STALE_MARK:
+            self.window["__tabSetStale"] = True
+            return {"result": {"value": True}}
+
+        if self.polls_since_navigate is not None:
+            self.polls_since_navigate += 1
+            if self.polls_since_navigate > self.commit_after:
+                # The new document starts with a fresh window
+                self.window = {}
+                self.polls_since_navigate = None
+        stale = expression.startswith("window.__tabSetStale ?") and self.window.get("__tabSetStale")
+        return {"result": {"value": "loading" if stale else self.state}}
+
+
+async def load(tab, kind):
+    await tab.navigate("https://pitchbook.com/profiles/company/1-02")
+    return await tab.wait_for(kind, poll_interval=0.01)
+
+
+try:
+    # Test 1: The previous document cannot satisfy readiness
+    print("\n[Test 1] Testing stale-document guard...")
+    kind = PageKind("test", [ReadinessCondition("ready", selector=".x")], timeout=2)
+    page = FakePage(commit_after=3)
+    tab = AsyncTab(page, "target", "session", "context")
+    state, _ = asyncio.run(load(tab, kind))
+    assert state == "ready"
+    assert page.polls_since_navigate is None and page.window == {}, "ready was accepted before the commit"
+    print("✓ wait_for keeps polling until the navigation has replaced the document")
+
+    # Test 2: A navigation that never commits times out
+    print("\n[Test 2] Testing navigation that never commits...")
+    page = FakePage(commit_after=10**6)
+    tab = AsyncTab(page, "target", "session", "context")
+    state, elapsed = asyncio.run(load(tab, PageKind("test", kind.conditions, timeout=0.2)))
+    assert state == "timeout" and elapsed >= 0.2, state
+    print("✓ A stale page is reported as a timeout, not as ready")
+
+    print("\n" + "="*60)
+    print("✓ ALL TESTS PASSED")
+    print("="*60)
+except AssertionError as e:
+    print(f"✗ Test failed: {e}")
+    sys.exit(1)
@@ -0,0 +1,125 @@
+"""
+Test script for the background writer thread and connection-error retries.
+Runs against an in-memory stand-in for the collection; no mongod needed.
+"""
+
+import sys
+import threading
+from pymongo.errors import AutoReconnect
+from pymongo.results import BulkWriteResult
+from db_writer import BulkWriter, BackgroundWriter, INSERTED, ERROR
+
+print("="*60)
+print("Background Writer Validation")
+print("="*60)
+
+
+class FakeCollection:
+    """
+    Inserts every upsert. bulk_write raises AutoReconnect ``connection_errors``
+    times, and blocks while ``gate`` is cleared.
+    """
+
+    def __init__(self, connection_errors=0):
+        self.docs = {}
+        self.connection_errors = connection_errors
+        self.bulk_writes = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self.writing = threading.Event()
+
+    def find(self, query, projection=None):
+        return []
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_writes += 1
+        self.writing.set()
+        self.gate.wait()
+        if self.connection_errors:
+            self.connection_errors -= 1
+            raise AutoReconnect("primary stepped down")
+        upserted = []
+        for index, op in enumerate(operations):
+            url = op._filter["source_url"]
+            if url not in self.docs:
+                upserted.append({"index": index, "_id": url})
+            self.docs.setdefault(url, {}).update(op._doc["$set"])
+        return BulkWriteResult({"upserted": upserted, "nUpserted": len(upserted)}, True)
+
+
+class QuietLogger:
+    def __getattr__(self, level):
+        return lambda message: None
+
+
+def company(i):
+    return {"source_url": f"https://pitchbook.com/profiles/company/1-{i:02d}", "company_name": f"Company {i}"}
+
+
+try:
+    # Test 1: Connection errors are retried, not reported as errors
+    print("\n[Test 1] Testing retry on connection errors...")
+    collection = FakeCollection(connection_errors=2)
+    writer = BulkWriter(collection, logger=QuietLogger(), retry_delay=0.01)
+    writer.add(company(1))
+    assert writer.flush() == [] and writer.pending() == 1 and writer.backoff() > 0
+    result = writer.drain()
+    assert result == [(company(1)["source_url"], INSERTED, None)], result
+    assert collection.bulk_writes == 3 and writer.stats["retries"] == 2
+
+    collection = FakeCollection(connection_errors=10)
+    writer = BulkWriter(collection, logger=QuietLogger(), retry_delay=0.01, max_retries=2)
+    writer.add(company(1))
+    result = writer.drain()
+    assert [outcome for _, outcome, _ in result] == [ERROR] and collection.bulk_writes == 3
+    print("✓ Batches are re-buffered with backoff and only fail after max_retries")
+
+    # Test 2: A full queue blocks submit
+    print("\n[Test 2] Testing backpressure...")
+    collection = FakeCollection()
+    collection.gate.clear()
+    background = BackgroundWriter(BulkWriter(collection, logger=QuietLogger(), max_batch=1),
+                                  max_queue=2, logger=QuietLogger())
+    assert background.submit(company(1))
+    assert collection.writing.wait(2), "the writer thread never started a write"
+    assert background.submit(company(2)) and background.submit(company(3)) and background.depth() == 2
+    assert not background.submit(company(4), timeout=0.1), "a full queue must not take more"
+    blocked = threading.Thread(target=background.submit, args=(company(5),))
+    blocked.start()
+    blocked.join(0.1)
+    assert blocked.is_alive(), "submit must block while the queue is full"
+    collection.gate.set()
+    blocked.join(2)
+    assert not blocked.is_alive() and background.summary()["blocked"] == 2
+    print("✓ submit blocks while the writer is behind, and gives up after its timeout")
+
+    # Test 3: flush returns what was written since the previous flush
+    print("\n[Test 3] Testing flush outcomes...")
+    outcomes = background.flush(timeout=5)
+    assert sorted(key for key, _, _ in outcomes) == [company(i)["source_url"] for i in (1, 2, 3, 5)], outcomes
+    assert all(outcome == INSERTED for _, outcome, _ in outcomes)
+    assert background.flush(timeout=5) == []
+    print("✓ flush waits for the queue and reports each document once")
+
+    # Test 4: close drains the queue and the writer's buffer
+    print("\n[Test 4] Testing close...")
+    background = BackgroundWriter(BulkWriter(collection, logger=QuietLogger(), max_batch=100, max_delay=60),
+                                  logger=QuietLogger())
+    for i in range(6, 10):
+        background.submit(company(i))
+    background.close(timeout=5)
+    assert all(company(i)["source_url"] in collection.docs for i in range(6, 10)), "close left documents unwritten"
+    assert background.writer.pending() == 0 and background.depth() == 0
+    try:
+        background.submit(company(10))
+        assert False, "a closed writer must refuse documents"
+    except RuntimeError:
+        pass
+    print("✓ close writes everything queued or buffered, then refuses new documents")
+
+    print("\n" + "="*60)
+    print("✓ ALL TESTS PASSED")
+    print("="*60)
+except AssertionError as e:
+    print(f"✗ Test failed: {e}")
+    sys.exit(1)
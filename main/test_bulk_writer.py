@@ -0,0 +1,172 @@
+"""
+Test script for batched profile upserts (BulkWriter).
+Runs against an in-memory stand-in for the collections; no mongod needed.
+"""
+
+import copy
+import sys
+from pymongo.errors import BulkWriteError
+from pymongo.results import BulkWriteResult
+from details import section_hashes, content_hash
+from db_writer import BulkWriter, INSERTED, UPDATED, UNCHANGED, ERROR
+
+print("="*60)
+print("Bulk Writer Validation")
+print("="*60)
+
+
+class FakeCollection:
+    """
+    Applies UpdateOne $set/$setOnInsert to dicts keyed by source_url.
+    The first find returns ``reads`` when given: copies another writer has since changed.
+    """
+
+    def __init__(self, docs=(), write_errors=(), reads=None):
+        self.docs = {doc["source_url"]: copy.deepcopy(doc) for doc in docs}
+        self.write_errors = set(write_errors)  # source_urls the server rejects
+        self.reads = {doc["source_url"]: copy.deepcopy(doc) for doc in reads} if reads is not None else None
+        self.bulk_writes = []
+
+    def find(self, query, projection=None):
+        docs = self.docs if self.reads is None else self.reads
+        self.reads = None
+        return [copy.deepcopy(docs[url]) for url in query["source_url"]["$in"] if url in docs]
+
+    def _apply(self, doc, fields):
+        for key, value in fields.items():
+            target = doc
+            *parents, leaf = key.split(".")
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[leaf] = value
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_writes.append(len(operations))
+        upserted, errors, matched = [], [], 0
+        for index, op in enumerate(operations):
+            url = op._filter["source_url"]
+            if url in self.write_errors:
+                errors.append({"index": index, "code": 121, "errmsg": "Document failed validation"})
+                continue
+            doc = self.docs.get(url)
+            # A None value also matches a missing field, as in MongoDB
+            if doc is not None and any(doc.get(field) != value for field, value in op._filter.items()):
+                continue
+            if doc is None:
+                if not op._upsert:
+                    continue
+                doc = self.docs[url] = {"source_url": url, "_id": url}
+                self._apply(doc, op._doc.get("$setOnInsert", {}))
+                upserted.append({"index": index, "_id": url})
+            else:
+                matched += 1
+            self._apply(doc, op._doc["$set"])
+        result = {"upserted": upserted, "nUpserted": len(upserted), "nMatched": matched}
+        if errors:
+            raise BulkWriteError(dict(result, writeErrors=errors))
+        return BulkWriteResult(result, True)
+
+
+class FakeStats:
+    """Records run_stats updates"""
+
+    def __init__(self):
+        self.updates = []
+
+    def update_one(self, query, update):
+        self.updates.append((query, update))
+
+
+class QuietLogger:
+    def __getattr__(self, level):
+        return lambda message: None
+
+
+profile = {
+    "source_url": "https://pitchbook.com/profiles/company/1-01",
+    "company_name": "Acme",
+    "general_info": {"Employees": "10"},
+    "financials": {"Revenue": "1M"},
+    "scraped_at": "2026-01-01T00:00:00",
+}
+urls = [f"https://pitchbook.com/profiles/company/1-0{i}" for i in range(1, 5)]
+
+try:
+    # Test 1: Outcomes of one batch
+    print("\n[Test 1] Testing BulkWriter outcomes...")
+    existing = dict(profile, source_url=urls[1])
+    collection = FakeCollection(
+        docs=[dict(existing, section_hashes=section_hashes(existing)),
+              dict(profile, source_url=urls[2], section_hashes=section_hashes(profile))],
+        write_errors=[urls[3]]
+    )
+    outcomes = {}
+    writer = BulkWriter(collection, logger=QuietLogger(), max_batch=100,
+                        on_outcome=lambda key, outcome, error: outcomes.__setitem__(key, outcome))
+    writer.add(dict(profile, source_url=urls[0]))                         # new
+    writer.add(dict(existing, general_info={"Employees": "12"}))          # changed
+    writer.add(dict(profile, source_url=urls[2]))                         # same content
+    writer.add(dict(profile, source_url=urls[3]))                         # rejected by the server
+    result = writer.flush()
+    assert [outcome for _, outcome, _ in result] == [INSERTED, UPDATED, UNCHANGED, ERROR], result
+    assert result[3][2] == "Document failed validation"
+    assert outcomes == {key: outcome for key, outcome, _ in result}
+    assert collection.docs[urls[1]]["general_info"] == {"Employees": "12"}
+    assert writer.stats[INSERTED] == writer.stats[UPDATED] == writer.stats[UNCHANGED] == writer.stats[ERROR] == 1
+    print("✓ inserted, updated, unchanged and write errors are told apart")
+
+    # Test 2: One bulk_write and one $inc per batch
+    print("\n[Test 2] Testing batching and added_count folding...")
+    collection, stats = FakeCollection(docs=[dict(profile, source_url=urls[3])]), FakeStats()
+    writer = BulkWriter(collection, stats, logger=QuietLogger(), max_batch=4)
+    assert writer.add(dict(profile, source_url=urls[0])) == []
+    writer.add(dict(profile, source_url=urls[1]))
+    writer.add(dict(profile, source_url=urls[2]))
+    result = writer.add(dict(profile, source_url=urls[3]))
+    assert len(result) == 4 and writer.pending() == 0, "a full batch is flushed by add"
+    assert collection.bulk_writes == [4]
+    assert stats.updates == [({"_id": "update_run_stats"}, {"$inc": {"added_count": 3}})], stats.updates
+
+    writer.add(dict(profile, source_url=urls[0]))
+    writer.flush()
+    assert len(stats.updates) == 1, "a batch without inserts must not touch run_stats"
+    print("✓ N companies cost one bulk_write and a single $inc of the inserted count")
+
+    # Test 3: Two writes of one company in a batch
+    print("\n[Test 3] Testing merging within a batch...")
+    collection = FakeCollection()
+    writer = BulkWriter(collection, logger=QuietLogger())
+    writer.add({"source_url": urls[0], "company_name": "Acme", "financials": {"Revenue": "1M"}})
+    writer.add({"source_url": urls[0], "financials": {"Revenue": "2M"}})
+    result = writer.flush()
+    assert result == [(urls[0], INSERTED, None)] and collection.bulk_writes == [1]
+    doc = collection.docs[urls[0]]
+    assert doc["company_name"] == "Acme" and doc["financials"] == {"Revenue": "2M"}
+    print("✓ Later fields win, as sequential $set would leave them")
+
+    # Test 4: Documents changed after the hashes were read are written in full
+    print("\n[Test 4] Testing the content_hash guard...")
+    def stored(data):
+        return dict(data, section_hashes=section_hashes(data), content_hash=content_hash(section_hashes(data)))
+    same = dict(profile, source_url=urls[1])
+    other = dict(profile, source_url=urls[0], company_name="Acme Inc", general_info={"Employees": "11"})
+    collection = FakeCollection(docs=[stored(other), stored(same)],
+                                reads=[stored(dict(profile, source_url=urls[0])), stored(same)])
+    writer = BulkWriter(collection, logger=QuietLogger())
+    writer.add(dict(profile, source_url=urls[0], financials={"Revenue": "2M"}))
+    writer.add(dict(same, financials={"Revenue": "3M"}))
+    result = writer.flush()
+    assert [outcome for _, outcome, _ in result] == [UPDATED, UPDATED] and collection.bulk_writes == [2, 1], result
+    doc = collection.docs[urls[0]]
+    assert doc["company_name"] == "Acme" and doc["financials"] == {"Revenue": "2M"}, "the stale diff was applied"
+    written = dict(profile, financials={"Revenue": "2M"})
+    assert doc["content_hash"] == content_hash(section_hashes(written)) and result[0][2] is None
+    assert collection.docs[urls[1]]["financials"] == {"Revenue": "3M"}
+    print("✓ A stale diff matches nothing and the company is rewritten in full")
+
+    print("\n" + "="*60)
+    print("✓ ALL TESTS PASSED")
+    print("="*60)
+except AssertionError as e:
+    print(f"✗ Test failed: {e}")
+    sys.exit(1)
@@ -0,0 +1,180 @@
+"""
+Test script for change-only updates and re-parse writes
+(the writers: test_bulk_writer.py, test_background_writer.py).
+Runs against an in-memory stand-in for the collection; no mongod needed.
+"""
+
+import copy
+import sys
+from pymongo.results import BulkWriteResult, UpdateResult
+from details import build_upsert, build_change_update, section_hashes, content_hash, save_to_db
+
+print("="*60)
+print("DB Writer Validation")
+print("="*60)
+
+
+class FakeCollection:
+    """
+    Applies UpdateOne $set/$setOnInsert to dicts keyed by source_url.
+    Reads return ``reads`` when given: the copies another writer has since changed.
+    """
+
+    def __init__(self, docs=(), reads=None):
+        self.docs = {doc["source_url"]: copy.deepcopy(doc) for doc in docs}
+        self.reads = {doc["source_url"]: copy.deepcopy(doc) for doc in reads} if reads is not None else None
+
+    def find(self, query, projection=None):
+        docs = self.docs if self.reads is None else self.reads
+        return [copy.deepcopy(docs[url]) for url in query["source_url"]["$in"] if url in docs]
+
+    def find_one(self, query, projection=None):
+        found = self.find({"source_url": {"$in": [query["source_url"]]}})
+        return found[0] if found else None
+
+    def _matches(self, doc, query):
+        # A None value also matches a missing field, as in MongoDB
+        return all(doc.get(field) == value for field, value in query.items())
+
+    def _apply(self, doc, fields):
+        for key, value in fields.items():
+            target = doc
+            *parents, leaf = key.split(".")
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[leaf] = value
+
+    def _write(self, query, update, upsert):
+        """Returns (matched, upserted)"""
+        url = query["source_url"]
+        doc = self.docs.get(url)
+        if doc is not None and not self._matches(doc, query):
+            return False, False
+        if doc is None:
+            if not upsert:
+                return False, False
+            doc = self.docs[url] = {"source_url": url, "_id": url}
+            self._apply(doc, update.get("$setOnInsert", {}))
+            self._apply(doc, update["$set"])
+            return False, True
+        self._apply(doc, update["$set"])
+        return True, False
+
+    def update_one(self, query, update, upsert=False):
+        matched, upserted = self._write(query, update, upsert)
+        return UpdateResult({"n": int(matched or upserted), "nModified": int(matched),
+                             "upserted": query["source_url"] if upserted else None}, True)
+
+    def bulk_write(self, operations, ordered=True):
+        upserted, matched = [], 0
+        for index, op in enumerate(operations):
+            hit, inserted = self._write(op._filter, op._doc, op._upsert)
+            matched += hit
+            if inserted:
+                upserted.append({"index": index, "_id": op._filter["source_url"]})
+        return BulkWriteResult({"upserted": upserted, "nUpserted": len(upserted), "nMatched": matched}, True)
+
+
+class QuietLogger:
+    def __getattr__(self, level):
+        return lambda message: None
+
+
+profile = {
+    "source_url": "https://pitchbook.com/profiles/company/1-01",
+    "company_name": "Acme",
+    "general_info": {"Employees": "10"},
+    "financials": {"Revenue": "1M"},
+    "scraped_at": "2026-01-01T00:00:00",
+}
+
+try:
+    # Test 1: Full upserts leave the caller's dict alone
+    print("\n[Test 1] Testing build_upsert...")
+    data = dict(profile)
+    query, update = build_upsert(data)
+    assert data == profile, "build_upsert modified its input"
+    assert query == {"source_url": profile["source_url"]}
+    assert "updated_at" in update["$set"] and "created_at" in update["$setOnInsert"]
+    assert update["$set"]["section_hashes"] == section_hashes(profile)
+    print("✓ build_upsert builds a copy with updated_at and hashes")
+
+    # Test 2: Only changed sections are written
+    print("\n[Test 2] Testing build_change_update...")
+    query, update, upsert, changed = build_change_update(dict(profile), None)
+    assert upsert and changed == ["company_name", "financials", "general_info"]
+    stored = {"section_hashes": section_hashes(profile), "content_hash": content_hash(section_hashes(profile))}
+
+    query, update, upsert, changed = build_change_update(dict(profile), stored)
+    assert not upsert and changed == [] and list(update["$set"]) == ["last_seen_at"]
+    assert query == {"source_url": profile["source_url"], "content_hash": stored["content_hash"]}
+
+    edited = dict(profile, financials={"Revenue": "2M"})
+    query, update, upsert, changed = build_change_update(edited, stored)
+    assert changed == ["financials"]
+    written = update["$set"]
+    assert written["financials"] == {"Revenue": "2M"} and "general_info" not in written
+    assert written["section_hashes.financials"] == section_hashes(edited)["financials"]
+    assert written["content_hash"] == content_hash(section_hashes(edited))
+
+    partial = {"source_url": profile["source_url"], "financials": {"Revenue": "2M"}}
+    query, update, upsert, changed = build_change_update(partial, stored)
+    assert changed == ["financials"] and update["$set"]["content_hash"] == content_hash(section_hashes(edited))
+    print("✓ Unchanged scrapes bump last_seen_at only, changes $set their sections")
+
+    urls = [f"https://pitchbook.com/profiles/company/1-0{i}" for i in range(1, 5)]
+
+    # Test 3: Re-parse writes through the same change updates
+    print("\n[Test 3] Testing Reparser.flush...")
+    from reparse import Reparser
+    collection = FakeCollection(docs=[dict(profile, section_hashes=section_hashes(profile), last_seen_at="seen")])
+    reparser = Reparser(archive=None, collection=collection, logger=QuietLogger())
+    fixed = dict(profile, financials={"Revenue": "3M"})
+    del fixed["scraped_at"]
+    missing = reparser.flush([fixed, dict(fixed, source_url=urls[1])])
+    reparser.flush([dict(fixed)])
+    doc = collection.docs[profile["source_url"]]
+    assert doc["financials"] == {"Revenue": "3M"} and doc["last_seen_at"] == "seen" and "reparsed_at" in doc
+    assert doc["section_hashes"]["financials"] == section_hashes(fixed)["financials"]
+    assert missing == {urls[1]} and urls[1] not in collection.docs, "profiles without a document must be skipped"
+    assert reparser.stats["changed"] == 1 and reparser.stats["missing"] == 1 and reparser.stats["unchanged"] == 1
+    assert reparser.stats["inserted"] == 0
+
+    reparser = Reparser(archive=None, collection=collection, insert=True, logger=QuietLogger())
+    assert reparser.flush([dict(fixed, source_url=urls[1])]) == set() and reparser.stats["inserted"] == 1
+    assert "last_seen_at" not in collection.docs[urls[1]], "a re-parse is not a sighting"
+
+    newer = dict(fixed, financials={"Revenue": "4M"})
+    rewritten = dict(newer, section_hashes=section_hashes(newer), content_hash=content_hash(section_hashes(newer)))
+    collection = FakeCollection(docs=[rewritten], reads=[dict(profile, section_hashes=section_hashes(profile),
+                                                               content_hash=content_hash(section_hashes(profile)))])
+    reparser = Reparser(archive=None, collection=collection, logger=QuietLogger())
+    reparser.flush([dict(fixed)])
+    assert collection.docs[profile["source_url"]]["financials"] == {"Revenue": "4M"}, "a newer scrape was overwritten"
+    assert reparser.stats["conflicts"] == 1 and reparser.stats["changed"] == 0
+    print("✓ Re-parsed sections are written with their hashes, unchanged, unknown and rewritten profiles are skipped")
+
+    # Test 4: save_to_db falls back to a full write when the stored copy changed
+    print("\n[Test 4] Testing save_to_db against a concurrent write...")
+    old = dict(profile, section_hashes=section_hashes(profile), content_hash=content_hash(section_hashes(profile)))
+    other = dict(profile, general_info={"Employees": "11"}, company_name="Acme Inc")
+    current = dict(other, section_hashes=section_hashes(other), content_hash=content_hash(section_hashes(other)))
+    collection = FakeCollection(docs=[current], reads=[old])
+    scraped = dict(profile, financials={"Revenue": "5M"})
+    save_to_db(scraped, collection, None, QuietLogger())
+    doc = collection.docs[profile["source_url"]]
+    assert doc["financials"] == {"Revenue": "5M"} and doc["company_name"] == "Acme"
+    assert doc["section_hashes"] == section_hashes(scraped) and doc["content_hash"] == content_hash(section_hashes(scraped))
+
+    collection = FakeCollection(docs=[old])
+    save_to_db(scraped, collection, None, QuietLogger())
+    doc = collection.docs[profile["source_url"]]
+    assert doc["financials"] == {"Revenue": "5M"} and doc["content_hash"] == content_hash(section_hashes(scraped))
+    print("✓ A stale read never leaves a half-applied diff behind")
+
+    print("\n" + "="*60)
+    print("✓ ALL TESTS PASSED")
+    print("="*60)
+except AssertionError as e:
+    print(f"✗ Test failed: {e}")
+    sys.exit(1)
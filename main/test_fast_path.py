@@ -0,0 +1,42 @@
+"""
+Test script for the HTTP fast path's response classification.
+Needs no browser, proxy or network.
+"""
+
+import sys
+from details import CAPTCHA_MARKER
+from fast_path import HttpFastPath, READY_MARKER, PROXY_OUTCOMES
+
+print("="*60)
+print("HTTP Fast Path Validation")
+print("="*60)
+
+
+class QuietLogger:
+    def __getattr__(self, level):
+        return lambda message: None
+
+
+try:
+    # Test 1: Challenge classification
+    print("\n[Test 1] Testing fast path classification...")
+    fast_path = HttpFastPath(logger=QuietLogger())
+    profile = f'<h1 class="{READY_MARKER}">Acme</h1>'
+    assert fast_path.classify(200, profile) == "ready"
+    assert fast_path.classify(200, profile + CAPTCHA_MARKER) == "challenge", "a captcha outranks the title"
+    for status in (403, 429, 503):
+        assert fast_path.classify(status, "") == "challenge"
+    assert fast_path.classify(200, "<html><body></body></html>") == "missing"
+    assert fast_path.classify(404, profile) == "error" and fast_path.classify(500, "") == "error"
+    assert PROXY_OUTCOMES["challenge"] == "captcha" and PROXY_OUTCOMES["missing"] == "ready"
+    assert fast_path.fetch("https://pitchbook.com/profiles/company/1-01") == ("no_session", None)
+    assert fast_path.summary()["no_session"] == 1
+    print("✓ Captcha markers and blocking statuses are challenges, a missing title is not ready")
+
+
+    print("\n" + "="*60)
+    print("✓ ALL TESTS PASSED")
+    print("="*60)
+except AssertionError as e:
+    print(f"✗ Test failed: {e}")
+    sys.exit(1)
@@ -0,0 +1,82 @@
+"""
+Test script for persistent identity leases.
+Two stores on one root stand in for worker processes; no browser needed.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from driver.identities import Identity, IdentityStore
+
+print("="*60)
+print("Identity Lease Validation")
+print("="*60)
+
+
+class QuietLogger:
+    def __getattr__(self, level):
+        return lambda message: None
+
+
+tmp = tempfile.mkdtemp(prefix="test_identities_")
+
+try:
+    # Test 1: Identity leases
+    print("\n[Test 1] Testing identity leases...")
+    root = os.path.join(tmp, "identities")
+    options = dict(root=root, per_proxy=2, captcha_threshold=0.5, window=5, min_samples=3, logger=QuietLogger())
+    node_a = IdentityStore(["p1:1"], **options)
+    first, second = node_a.lease(), node_a.lease()
+    assert first and second and first.identity_id != second.identity_id
+    assert node_a.lease() is None, "per_proxy identities are all leased"
+
+    # A second store on the same root stands in for another worker process
+    node_b = IdentityStore(["p1:1"], **options)
+    assert node_b.lease() is None, "leases held elsewhere must not be handed out"
+    node_a.release(first)
+    taken = node_b.lease()
+    assert taken is not None and taken.identity_id == first.identity_id, "a released lease is free again"
+
+    assert not node_b.record(taken, pages=2, captchas=1), "too few samples to retire"
+    assert node_b.record(taken, pages=2, captchas=1) and taken.retired
+    node_b.release(taken)
+    fresh = node_a.lease()
+    assert fresh is not None and fresh.identity_id not in (first.identity_id, second.identity_id)
+    node_a.release(second)
+    node_a.release(fresh)
+    with open(os.path.join(root, "identities.json"), "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert {first.identity_id, second.identity_id, fresh.identity_id} <= set(saved), \
+        "saves from one store must keep the other store's entries"
+
+    # A lease ends with its holder's process, even when it never released it
+    holder = subprocess.Popen(
+        [sys.executable, "-c", "import sys, time\n"
+         "from driver.identities import IdentityStore\n"
+         f"identity = IdentityStore(['p1:1'], root={root!r}, per_proxy=2).lease()\n"
+         "print('leased', identity.identity_id, flush=True)\n"
+         "time.sleep(30)"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), stdout=subprocess.PIPE, text=True
+    )
+    held = next(line.split()[1] for line in holder.stdout if line.startswith("leased "))
+    probe = Identity(held, "p1:1", root)
+    assert not probe.acquire(), "an identity leased by a live process must stay locked"
+    holder.kill()
+    holder.wait()
+    assert probe.acquire(), "a killed holder's lease must expire"
+    probe.release_lock()
+    print("✓ One holder per identity across stores, released or orphaned leases return, "
+          "retired ones are replaced")
+
+
+    print("\n" + "="*60)
+    print("✓ ALL TESTS PASSED")
+    print("="*60)
+except AssertionError as e:
+    print(f"✗ Test failed: {e}")
+    sys.exit(1)
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
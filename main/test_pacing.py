@@ -0,0 +1,54 @@
+"""
+Test script for per-proxy AIMD pacing.
+Needs no browser, proxy or mongod.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pacing import AIMDPacer, DIRECT
+
+print("="*60)
+print("Pacing Validation")
+print("="*60)
+
+
+class QuietLogger:
+    def __getattr__(self, level):
+        return lambda message: None
+
+
+tmp = tempfile.mkdtemp(prefix="test_pacing_")
+
+try:
+    # Test 1: AIMD pacing
+    print("\n[Test 1] Testing AIMD pacing...")
+    pacer = AIMDPacer(state_path=os.path.join(tmp, "pacing.json"), initial_delay=10, min_delay=2,
+                      max_delay=40, decrease_step=1, backoff_factor=2, jitter=0)
+    for _ in range(3):
+        pacer.success("p1")
+    assert pacer.delay("p1") == 7, pacer.delay("p1")
+    pacer.failure("p1")
+    assert pacer.delay("p1") == 14
+    pacer.failure("p1")
+    pacer.failure("p1")
+    assert pacer.delay("p1") == 40, "failures must stop at max_delay"
+    for _ in range(50):
+        pacer.success("p1")
+    assert pacer.delay("p1") == 2, "successes must stop at min_delay"
+    assert pacer.delay("p2") == 10 and pacer.delay(None) == pacer.delay(DIRECT) == 10
+    assert pacer.reserve_turn("p1") == 0
+    assert 1.9 < pacer.reserve_turn("p1") <= 2.0
+    reloaded = AIMDPacer(state_path=os.path.join(tmp, "pacing.json"))
+    assert reloaded.delay("p1") == 2 and reloaded.snapshot()["p1"]["failures"] == 3
+    print("✓ Delay shrinks by a step per success, doubles per failure, stays in bounds and persists")
+
+    print("\n" + "="*60)
+    print("✓ ALL TESTS PASSED")
+    print("="*60)
+except AssertionError as e:
+    print(f"✗ Test failed: {e}")
+    sys.exit(1)
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
@@ -0,0 +1,85 @@
+"""
+Test script for parser backend parity.
+Compares every installed backend with bs4 on the fixture corpus and on the
+raw-markup cases in fixtures/raw/ (regenerate with fixtures/generate.py).
+"""
+
+import glob
+import os
+import sys
+from details import extract_pitchbook_data
+from parsers import BACKENDS, DEFAULT_BACKEND, get_backend
+
+print("="*60)
+print("Parser Parity Validation")
+print("="*60)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+TABLES = ("valuation_funding", "cap_table", "competitors", "investors", "patents")
+
+
+def extract(path, backend):
+    with open(path, "r", encoding="utf-8") as f:
+        data = extract_pitchbook_data(f.read(), os.path.basename(path), backend=backend)
+    data.pop("scraped_at")
+    return data
+
+
+def raw_case(case, suffix):
+    return os.path.join(FIXTURES, "raw", f"{case}.{suffix}.html")
+
+
+backends = [name for name in BACKENDS if name != DEFAULT_BACKEND and get_backend(name).name == name]
+if not backends:
+    print("Skipping: neither lxml nor selectolax is installed")
+    sys.exit(0)
+print(f"Comparing {', '.join(backends)} with {DEFAULT_BACKEND}")
+
+try:
+    # Test 1: Browser-serialized pages extract identically
+    print("\n[Test 1] Testing browser-serialized pages...")
+    pages = sorted(glob.glob(os.path.join(FIXTURES, "profile_*.html")) +
+                   glob.glob(os.path.join(FIXTURES, "raw", "*.dom.html")))
+    assert pages, "no fixtures, run fixtures/generate.py"
+    for path in pages:
+        reference = extract(path, DEFAULT_BACKEND)
+        for backend in backends:
+            assert extract(path, backend) == reference, f"{backend} differs on {os.path.basename(path)}"
+    print(f"✓ {len(pages)} pages identical on every backend")
+
+    # Test 2: Entities and comments in raw markup
+    print("\n[Test 2] Testing entities and comments...")
+    reference = extract(raw_case("entities_comments", "raw"), DEFAULT_BACKEND)
+    assert "software\u00a0for\u202f\U0001F680" in reference["general_info"]["description"]
+    assert "tracking" not in reference["general_info"]["description"]
+    assert "Market Street, Suite\u00a04 <rear>" in reference["general_info"]["corporate_office"]
+    for backend in backends:
+        assert extract(raw_case("entities_comments", "raw"), backend) == reference, backend
+    print("✓ Entities decode and comments drop out the same way everywhere")
+
+    # Test 3: Known differences on raw markup (documented in parsers.py and the README)
+    print("\n[Test 3] Testing documented raw-markup differences...")
+    no_tbody = {backend: extract(raw_case("no_tbody", "raw"), backend) for backend in [DEFAULT_BACKEND] + backends}
+    for backend, data in no_tbody.items():
+        tables = [data[name] for name in TABLES]
+        if backend == "selectolax":
+            # lexbor inserts the missing <tbody>, like a browser
+            assert tables == [extract(raw_case("no_tbody", "dom"), backend)[name] for name in TABLES]
+        else:
+            assert tables == [[]] * len(TABLES), backend
+
+    description = {backend: extract(raw_case("block_in_p", "raw"), backend)["general_info"]["description"]
+                   for backend in [DEFAULT_BACKEND] + backends}
+    serialized = extract(raw_case("block_in_p", "dom"), DEFAULT_BACKEND)["general_info"]["description"]
+    assert description[DEFAULT_BACKEND].endswith("Backed by public grants. Founded in Springfield.")
+    for backend in backends:
+        # lxml and lexbor close the <p> at the <div>, as the browser does
+        assert description[backend] == serialized, backend
+    print("✓ Missing <tbody> and blocks inside <p> differ only on raw markup, as documented")
+
+    print("\n" + "="*60)
+    print("✓ ALL TESTS PASSED")
+    print("="*60)
+except AssertionError as e:
+    print(f"✗ Test failed: {e}")
+    sys.exit(1)
@@ -0,0 +1,128 @@
+"""
+Test script for the proxy circuit breakers and the callers that take half-open trials.
+Needs no browser, proxy or mongod.
+"""
+
+import sys
+import time
+import driver.pool
+from driver.pool import DriverPool
+from driver.proxy_pool import ProxyPool, CLOSED, OPEN, HALF_OPEN
+from fast_path import HttpFastPath
+
+print("="*60)
+print("Proxy Pool Validation")
+print("="*60)
+
+
+class QuietLogger:
+    def __getattr__(self, level):
+        return lambda message: None
+
+
+class FakeStartDriver:
+    """Stands in for StartDriver so DriverPool launches no Chrome"""
+
+    def __init__(self, driver_type=None, resource_policy=None, proxy=None, identity=None, proxy_pool=None):
+        self.proxy = identity.proxy if identity else proxy
+        self.identity = identity
+        self.instance_id = "fake"
+        self.launch_timings = {}
+        self.driver = self
+
+    def get_driver(self):
+        return self
+
+    def get_cookies(self):
+        return [{"name": "session", "value": "1", "domain": "pitchbook.com"}]
+
+    def execute_script(self, script):
+        return "Mozilla/5.0"
+
+    def collect_resource_stats(self):
+        pass
+
+    def CloseDriver(self):
+        pass
+
+
+def expired_pool():
+    """A one-proxy pool whose circuit is open and has just expired"""
+    pool = ProxyPool(["a:1"], state_path=None, failure_threshold=1, open_seconds=0.05, logger=QuietLogger())
+    pool.record_failure("a:1")
+    time.sleep(0.1)
+    assert pool.state["a:1"]["circuit"] == OPEN and pool.available() == ["a:1"]
+    return pool
+
+
+try:
+    # Test 1: Proxy circuit breaker
+    print("\n[Test 1] Testing proxy circuit open/half-open/close...")
+    pool = ProxyPool(["a:1"], state_path=None, failure_threshold=2, open_seconds=0.2,
+                     max_open_seconds=0.3, logger=QuietLogger())
+    pool.record_failure("a:1")
+    assert pool.state["a:1"]["circuit"] == CLOSED
+    pool.record_failure("a:1")
+    assert pool.state["a:1"]["circuit"] == OPEN
+    assert pool.choose(wait=False) is None and pool.choose(timeout=0.05) is None
+
+    time.sleep(0.25)
+    assert pool.choose(wait=False) == "a:1" and pool.state["a:1"]["circuit"] == HALF_OPEN
+    assert pool.choose(wait=False) is None, "only one trial while half-open"
+    pool.release_trial("a:1")
+    assert pool.choose(wait=False) == "a:1", "a released trial can be taken again"
+
+    pool.record_failure("a:1", "timeout")
+    assert pool.state["a:1"]["circuit"] == OPEN and pool.state["a:1"]["open_period"] == 0.3
+    started = time.time()
+    assert pool.choose(timeout=2) == "a:1", "choose must wait for the circuit to half-open"
+    assert 0.2 < time.time() - started < 1.0
+    pool.record_success("a:1", latency=0.5)
+    assert pool.state["a:1"]["circuit"] == CLOSED and pool.state["a:1"]["open_period"] is None
+    assert pool.choose(wait=False) == "a:1"
+
+    pool = ProxyPool(["a:1", "b:2"], state_path=None, captcha_threshold=0.8, logger=QuietLogger())
+    for _ in range(4):
+        pool.record_captcha("b:2")
+    assert pool.state["b:2"]["circuit"] == CLOSED and pool.state["b:2"]["consecutive_failures"] == 0
+    pool.record_captcha("b:2")
+    assert pool.state["b:2"]["circuit"] == OPEN
+    assert all(pool.choose(wait=False) == "a:1" for _ in range(20))
+    print("✓ Failures open the circuit, one trial half-opens it, success closes it")
+
+    # Test 2: Browser launches take the trial and give it back unused
+    print("\n[Test 2] Testing half-open trials in DriverPool...")
+    driver.pool.StartDriver = FakeStartDriver
+    driver.pool.CHOOSE_TIMEOUT = 0.2
+    pool = expired_pool()
+    browsers = DriverPool(max_size=2, proxy_pool=pool, logger=QuietLogger())
+    first = browsers.checkout()
+    assert first is not None and first.proxy == "a:1"
+    assert pool.state["a:1"]["circuit"] == HALF_OPEN and pool.state["a:1"]["trial_in_flight"]
+    assert browsers.checkout() is None, "a second browser must not join the trial"
+    browsers.checkin(first, recycle=True)
+    assert not pool.state["a:1"]["trial_in_flight"], "a retired browser that recorded nothing must give the trial back"
+
+    second = browsers.checkout()
+    browsers.report_page(second, "ready", 0.5)
+    browsers.checkin(second, recycle=True)
+    assert pool.state["a:1"]["circuit"] == CLOSED
+    print("✓ A launch is the circuit's one trial, released on retire when no page was recorded")
+
+    # Test 3: Fast path requests take the trial too
+    print("\n[Test 3] Testing half-open trials in the HTTP fast path...")
+    pool = expired_pool()
+    fast_path = HttpFastPath(logger=QuietLogger(), proxy_pool=pool)
+    fast_path.seed_from_driver(FakeStartDriver(proxy="a:1"))
+    found, proxy, _ = fast_path._pick()
+    assert found and proxy == "a:1" and pool.state["a:1"]["trial_in_flight"]
+    assert fast_path._pick() == (False, None, None), "a second request must not join the trial"
+    fast_path.close()
+    print("✓ Only one request goes out while a circuit is half-open")
+
+    print("\n" + "="*60)
+    print("✓ ALL TESTS PASSED")
+    print("="*60)
+except AssertionError as e:
+    print(f"✗ Test failed: {e}")
+    sys.exit(1)
@@ -0,0 +1,65 @@
+"""
+Test script for page readiness conditions and waits.
+Drives wait_for_page with a stand-in driver; no browser needed.
+"""
+
+import sys
+from selenium.common.exceptions import WebDriverException
+from driver.readiness import PageKind, ReadinessCondition, ReadinessStats, wait_for_page
+from details import PROFILE_PAGE, CAPTCHA_MARKER
+
+print("="*60)
+print("Page Readiness Validation")
+print("="*60)
+
+
+class FakeDriver:
+    """Returns the queued readiness states in turn, then repeats the last one"""
+
+    def __init__(self, *states):
+        self.states = list(states)
+        self.calls = 0
+
+    def execute_script(self, script):
+        self.calls += 1
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        if isinstance(state, Exception):
+            raise state
+        return state
+
+
+try:
+    # Test 1: Readiness conditions
+    print("\n[Test 1] Testing readiness condition precedence...")
+    script = PROFILE_PAGE.script
+    assert script.index('return "ready"') < script.index('return "captcha"') < script.index("readyState")
+    assert CAPTCHA_MARKER in script
+    try:
+        ReadinessCondition("ready")
+        assert False, "a condition without selector or text must be rejected"
+    except ValueError:
+        pass
+
+    kind = PageKind("test", [ReadinessCondition("ready", selector=".x"),
+                             ReadinessCondition("captcha", text="captcha")], timeout=0.3)
+    stats = ReadinessStats()
+    state, _ = wait_for_page(FakeDriver("loading", "loaded", "ready"), kind, poll_interval=0.01, stats=stats)
+    assert state == "ready"
+    state, _ = wait_for_page(FakeDriver(WebDriverException("navigating"), "captcha"), kind,
+                             poll_interval=0.01, stats=stats)
+    assert state == "captcha", "errors while the document is replaced must not end the wait"
+    state, elapsed = wait_for_page(FakeDriver("loaded"), kind, poll_interval=0.01, stats=stats)
+    assert state == "timeout" and elapsed >= 0.3, "a loaded page matching nothing is not ready"
+    settling = PageKind("settle", kind.conditions, timeout=2, settle_after_load=0.05)
+    state, elapsed = wait_for_page(FakeDriver("loaded"), settling, poll_interval=0.01, stats=stats)
+    assert state == "loaded" and elapsed < 1
+    assert stats.summary()["test"]["states"] == {"ready": 1, "captcha": 1, "timeout": 1}
+    print("✓ Conditions are checked in order; 'loaded' needs settle_after_load, else 'timeout'")
+
+
+    print("\n" + "="*60)
+    print("✓ ALL TESTS PASSED")
+    print("="*60)
+except AssertionError as e:
+    print(f"✗ Test failed: {e}")
+    sys.exit(1)
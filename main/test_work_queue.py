@@ -0,0 +1,82 @@
+"""
+Test script for the MongoDB lease queue.
+Needs a local mongod (MONGO_TEST_URI, default mongodb://localhost:27017); skipped otherwise.
+"""
+
+import os
+import sys
+import time
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from work_queue import LeaseQueue, LeaseHeartbeat, PENDING, LEASED, DONE, DEAD
+
+print("="*60)
+print("Work Queue Validation")
+print("="*60)
+
+uri = os.environ.get("MONGO_TEST_URI", "mongodb://localhost:27017")
+try:
+    client = MongoClient(uri, serverSelectionTimeoutMS=2000)
+    client.admin.command('ping')
+except PyMongoError as e:
+    print(f"Skipping: no mongod at {uri} ({e})")
+    sys.exit(0)
+
+db = client["PITCHBOOK_QUEUE_TEST"]
+client.drop_database(db.name)
+source = db["OrganiztionDetails"]
+source.insert_many([
+    {"organization_name": f"Company {i}", "financial": {"revenue": i}} for i in range(10)
+] + [{"organization_name": "Corrupted", "financial": {"x": 1}, "corrupted_data": True}])
+where_condition = {"corrupted_data": {"$ne": True}, "financial": {"$exists": True, "$nin": [{}, None]}}
+
+try:
+    # Test 1: Seeding is idempotent
+    print("\n[Test 1] Testing seed...")
+    node_a = LeaseQueue(db["ScrapeQueue"], owner="node-a", lease_seconds=1, max_attempts=2,
+                        retry_backoff_seconds=0)
+    node_a.ensure_indexes()
+    assert node_a.seed(source, where_condition, limit=100) == 10
+    assert node_a.seed(source, where_condition, limit=100) == 0
+    assert node_a.counts() == {PENDING: 10}
+    print("✓ Seeded 10 items, reseeding adds none")
+
+    # Test 2: Two nodes claim disjoint work
+    print("\n[Test 2] Testing disjoint claims...")
+    node_b = LeaseQueue(db["ScrapeQueue"], owner="node-b", lease_seconds=1, max_attempts=2,
+                        retry_backoff_seconds=0)
+    claimed_a = node_a.claim_many(5)
+    claimed_b = node_b.claim_many(10)
+    ids_a = {item["_id"] for item in claimed_a}
+    ids_b = {item["_id"] for item in claimed_b}
+    assert len(ids_a) == 5 and len(ids_b) == 5 and not ids_a & ids_b
+    assert node_a.claim() is None
+    print("✓ Claims are disjoint")
+
+    # Test 3: Heartbeat keeps the lease, expiry releases it
+    print("\n[Test 3] Testing lease expiry and heartbeat...")
+    kept = claimed_a[0]
+    with LeaseHeartbeat(node_a, kept, interval=0.3) as lease:
+        time.sleep(1.5)
+    assert not lease.lost
+    reclaimed = node_b.claim_many(10)
+    assert kept["_id"] not in {item["_id"] for item in reclaimed}
+    assert len(reclaimed) == 9
+    assert not node_a.heartbeat(claimed_a[1])
+    print("✓ Heartbeat holds the lease, expired leases move to another node")
+
+    # Test 4: Completion, failure and dead-lettering
+    print("\n[Test 4] Testing complete/fail/dead letter...")
+    node_a.complete(kept, result_count=3)
+    for item in reclaimed:
+        node_b.fail(item, error="captcha")
+    counts = node_a.counts()
+    assert counts.get(DONE) == 1 and counts.get(DEAD) == 9, counts
+    assert node_a.claim() is None
+    print("✓ Items that used all attempts are dead-lettered")
+
+    print("\n" + "="*60)
+    print("✓ ALL TESTS PASSED")
+    print("="*60)
+finally:
+    client.drop_database(db.name)
@@ -0,0 +1,281 @@
+"""
+MongoDB-backed lease queue so scrapers on many nodes claim disjoint companies.
+"""
+
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+
+def default_owner():
+    """Lease owner id for this process: host:pid"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaseQueue:
+    """
+    Work queue stored in a MongoDB collection.
+
+    Each document is one search term. ``claim`` atomically moves a pending
+    (or expired) item to 'leased' with ``find_one_and_update``, so two nodes
+    can never hold the same item. Leases expire unless renewed by
+    ``heartbeat``; items that fail ``max_attempts`` times go to 'dead'.
+
+    Document fields:
+        _id: source organization _id
+        search: organization name to search for
+        state: pending | leased | done | dead
+        attempts: number of claims so far
+        lease_owner / lease_expires_at / heartbeat_at: current lease
+        available_at: earliest time the item may be claimed again
+        last_error, result_count, created_at, updated_at
+    """
+
+    def __init__(self, collection, owner=None, lease_seconds=600, max_attempts=3,
+                 retry_backoff_seconds=300, logger=None):
+        """
+        Initialize the queue.
+
+        Args:
+            collection: MongoDB collection holding queue items
+            owner (str, optional): Lease owner id; defaults to host:pid
+            lease_seconds (int): Lease duration before another node may take the item
+            max_attempts (int): Claims before an item is dead-lettered
+            retry_backoff_seconds (int): Delay before a failed item can be claimed again
+            logger: Logger instance
+        """
+        self.collection = collection
+        self.owner = owner or default_owner()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.logger = logger
+
+    def _log(self, level, message):
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(message)
+
+    def ensure_indexes(self):
+        """Create the indexes used by claim and the expiry sweep"""
+        self.collection.create_index(
+            [("state", ASCENDING), ("available_at", ASCENDING)],
+            name="state_available_at"
+        )
+        self.collection.create_index(
+            [("state", ASCENDING), ("lease_expires_at", ASCENDING)],
+            name="state_lease_expires_at"
+        )
+
+    def seed(self, source_collection, where_condition, limit=1000):
+        """
+        Add companies from the source collection to the queue.
+
+        Existing items are left untouched, so seeding is idempotent and safe
+        to run from every node.
+
+        Args:
+            source_collection: STARTUPSCRAPERDATA.OrganiztionDetails
+            where_condition (dict): Filter for eligible companies
+            limit (int): Maximum number of companies sampled
+
+        Returns:
+            int: Number of new items
+        """
+        pipeline = [
+            {"$match": where_condition},
+            {"$sample": {"size": limit}},
+            {"$project": {"organization_name": 1}}
+        ]
+        now = datetime.utcnow()
+        operations = []
+        for doc in source_collection.aggregate(pipeline):
+            search = str(doc.get("organization_name", "")).strip()
+            if not search:
+                continue
+            operations.append(UpdateOne(
+                {"_id": doc["_id"]},
+                {"$setOnInsert": {
+                    "search": search,
+                    "state": PENDING,
+                    "attempts": 0,
+                    "available_at": now,
+                    "created_at": now,
+                    "updated_at": now
+                }},
+                upsert=True
+            ))
+
+        if not operations:
+            return 0
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            inserted = result.upserted_count
+        except BulkWriteError as e:
+            # Concurrent seeding from another node can race on the same _id
+            inserted = e.details.get("nUpserted", 0)
+        self._log("info", f"Seeded {inserted} new items into the work queue")
+        return inserted
+
+    def claim(self):
+        """
+        Atomically lease the next available item.
+
+        Returns:
+            dict or None: The leased item
+        """
+        now = datetime.utcnow()
+        query = {
+            "$or": [
+                {"state": PENDING, "available_at": {"$lte": now}},
+                {"state": LEASED, "lease_expires_at": {"$lt": now}}
+            ],
+            "attempts": {"$lt": self.max_attempts}
+        }
+        update = {
+            "$set": {
+                "state": LEASED,
+                "lease_owner": self.owner,
+                "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                "heartbeat_at": now,
+                "updated_at": now
+            },
+            "$inc": {"attempts": 1}
+        }
+        return self.collection.find_one_and_update(
+            query,
+            update,
+            sort=[("available_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def claim_many(self, count):
+        """Lease up to ``count`` items"""
+        items = []
+        for _ in range(count):
+            item = self.claim()
+            if item is None:
+                break
+            items.append(item)
+        return items
+
+    def heartbeat(self, item):
+        """
+        Extend the lease on an item this node holds.
+
+        Returns:
+            bool: False if the lease was lost (expired and taken by another node)
+        """
+        now = datetime.utcnow()
+        result = self.collection.update_one(
+            {"_id": item["_id"], "state": LEASED, "lease_owner": self.owner},
+            {"$set": {
+                "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                "heartbeat_at": now
+            }}
+        )
+        return result.modified_count == 1
+
+    def complete(self, item, result_count=0):
+        """Mark a leased item as done"""
+        now = datetime.utcnow()
+        self.collection.update_one(
+            {"_id": item["_id"], "lease_owner": self.owner},
+            {"$set": {
+                "state": DONE,
+                "result_count": result_count,
+                "updated_at": now
+            }, "$unset": {"lease_expires_at": ""}}
+        )
+
+    def fail(self, item, error=""):
+        """
+        Release a leased item after a failure.
+
+        The item returns to 'pending' after the retry backoff, or goes to
+        'dead' once it has used ``max_attempts`` claims.
+        """
+        now = datetime.utcnow()
+        dead = item.get("attempts", 0) >= self.max_attempts
+        self.collection.update_one(
+            {"_id": item["_id"], "lease_owner": self.owner},
+            {"$set": {
+                "state": DEAD if dead else PENDING,
+                "available_at": now + timedelta(seconds=self.retry_backoff_seconds),
+                "last_error": str(error)[:500],
+                "updated_at": now
+            }, "$unset": {"lease_expires_at": ""}}
+        )
+        if dead:
+            self._log("warning", f"Dead-lettered '{item.get('search')}' after {item.get('attempts')} attempts")
+
+    def dead_letter_expired(self):
+        """
+        Move expired leases that used up their attempts to 'dead'.
+
+        Returns:
+            int: Number of items dead-lettered
+        """
+        now = datetime.utcnow()
+        result = self.collection.update_many(
+            {"state": LEASED, "lease_expires_at": {"$lt": now}, "attempts": {"$gte": self.max_attempts}},
+            {"$set": {"state": DEAD, "last_error": "lease expired", "updated_at": now}}
+        )
+        return result.modified_count
+
+    def counts(self):
+        """
+        Number of items per state.
+
+        Returns:
+            dict: ``state -> count``
+        """
+        pipeline = [{"$group": {"_id": "$state", "count": {"$sum": 1}}}]
+        return {doc["_id"]: doc["count"] for doc in self.collection.aggregate(pipeline)}
+
+
+class LeaseHeartbeat:
+    """
+    Background thread renewing a lease while an item is processed.
+
+    Example:
+        >>> with LeaseHeartbeat(queue, item):
+        ...     process(item)
+    """
+
+    def __init__(self, queue, item, interval=None):
+        self.queue = queue
+        self.item = item
+        self.interval = interval or max(1, queue.lease_seconds // 3)
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.item):
+                    self.lost = True
+                    self.queue._log("warning", f"Lost lease on '{self.item.get('search')}'")
+                    return
+            except Exception as e:
+                self.queue._log("error", f"Heartbeat failed: {e}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,339 @@
+"""
+Multi-process worker mode for PitchBookScraper.
+Each worker owns a browser and a proxy; the parent feeds search terms and is the only DB writer.
+"""
+
+import multiprocessing
+import os
+import queue
+import signal
+import time
+
+from details import PROXIES, apply_stealth
+from driver.pool import DriverPool
+from driver.identities import IdentityStore
+from driver.proxy_pool import ProxyPool
+from driver.resource_policy import ResourcePolicy
+from logger import CustomLogger
+from main import PitchBookScraper
+from pacing import AIMDPacer
+
+
+STARTED = "started"
+RESULT = "result"
+DONE = "done"
+STOPPED = "stopped"
+
+MAX_TERM_ATTEMPTS = 2
+
+
+def worker_state_path(path, worker_id):
+    """
+    Per-worker copy of a state file, e.g. pacing_state.json -> pacing_state.worker-0.json.
+    The state files are saved with an unlocked read-merge-write, so processes must not share one.
+    """
+    base, ext = os.path.splitext(path)
+    return f"{base}.worker-{worker_id}{ext}"
+
+
+class WorkerScraper(PitchBookScraper):
+    """PitchBookScraper that sends every scraped profile to the parent instead of saving it"""
+
+    def __init__(self, worker_id, result_queue, **kwargs):
+        """
+        Args:
+            worker_id (int): Worker number, sent with every result
+            result_queue (Queue): Messages to the parent
+            **kwargs: PitchBookScraper options
+        """
+        super().__init__(connect_db=False, **kwargs)
+        self.worker_id = worker_id
+        self.result_queue = result_queue
+
+    def save_company_data(self, data: dict, search: str):
+        if not data:
+            self.logger.warning("No data to save")
+            return
+        self.result_queue.put((RESULT, self.worker_id, search, data))
+        self.saved_profiles += 1
+
+
+def worker_main(worker_id, proxy, task_queue, result_queue, tabs_per_browser=1, sections=None, base_url=None,
+                parse_workers=0):
+    """
+    Worker process entry point.
+
+    Pulls search terms until it receives None, scrapes every matching profile
+    (in parallel tabs when tabs_per_browser > 1) and sends each result to the
+    parent. Ctrl+C is left to the parent, which
+    shuts workers down with sentinels.
+
+    Args:
+        worker_id (int): Worker number, used for logs and messages
+        proxy (str): "host:port" proxy bound to this worker's browser
+        task_queue (Queue): Search terms, None to stop
+        result_queue (Queue): Messages to the parent
+        tabs_per_browser (int): Profiles loaded concurrently in tabs
+        sections (list, optional): Only extract these profile sections
+        base_url (str, optional): Site root for search URLs
+        parse_workers (int): Parse processes per worker, 0 parses inline
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    logger = CustomLogger(log_folder=f"logs/worker-{worker_id}")
+    driver_pool = DriverPool(
+        driver_type='undetected',
+        max_size=1,
+        on_create=apply_stealth,
+        logger=logger,
+        resource_policy=ResourcePolicy(),
+        proxy_pool=ProxyPool(
+            [proxy], state_path=worker_state_path("proxy_state.json", worker_id), logger=logger
+        ) if proxy else None,
+        # Identity leases are file-locked, so workers can share the root
+        identities=IdentityStore([proxy], logger=logger)
+    )
+    scraper = WorkerScraper(
+        worker_id,
+        result_queue,
+        driver_pool=driver_pool,
+        tabs_per_browser=tabs_per_browser,
+        pacer=AIMDPacer(state_path=worker_state_path("pacing_state.json", worker_id)),
+        logger=logger,
+        sections=sections,
+        parse_workers=parse_workers,
+        base_url=base_url
+    )
+    # The archive is shared: SQLite in WAL mode and blobs written by atomic rename are multi-process safe
+
+    try:
+        while True:
+            search = task_queue.get()
+            if search is None:
+                break
+
+            result_queue.put((STARTED, worker_id, search))
+            try:
+                # Results reach the parent through WorkerScraper.save_company_data
+                scraper.process_company(search)
+            except Exception as e:
+                logger.error(f"Error processing {search}: {e}")
+            result_queue.put((DONE, worker_id, search))
+    finally:
+        driver_pool.close_all()
+        result_queue.put((STOPPED, worker_id))
+
+
+class WorkerSupervisor:
+    """
+    Starts worker processes and acts as the single writer for their results.
+
+    Workers that die are restarted with the same proxy and their in-flight
+    search term is requeued (up to MAX_TERM_ATTEMPTS times), so one crashed
+    browser never takes the run down. There is at most one worker per proxy:
+    every worker paces its proxy on its own, so two workers sharing one
+    would double its request rate.
+    """
+
+    def __init__(self, scraper, num_workers, tabs_per_browser=1, sections=None, parse_workers=0):
+        """
+        Args:
+            scraper (PitchBookScraper): Parent scraper used for reading terms and saving
+            num_workers (int): Number of worker processes
+            tabs_per_browser (int): Profiles loaded concurrently in each worker's browser
+            sections (list, optional): Only extract these profile sections
+            parse_workers (int): Parse processes in each worker, 0 parses inline
+        """
+        self.scraper = scraper
+        self.logger = scraper.logger
+        if PROXIES and num_workers > len(PROXIES):
+            self.logger.warning(f"{num_workers} workers requested but only {len(PROXIES)} proxies, "
+                                f"starting {len(PROXIES)} workers")
+            num_workers = len(PROXIES)
+        self.num_workers = num_workers
+        self.tabs_per_browser = tabs_per_browser
+        self.sections = sections
+        self.parse_workers = parse_workers
+
+        # spawn: workers must not inherit the parent's Mongo client or threads
+        self.ctx = multiprocessing.get_context("spawn")
+        self.task_queue = self.ctx.Queue(maxsize=num_workers * 2)
+        self.result_queue = self.ctx.Queue()
+
+        self.processes = {}
+        self.in_flight = {}
+        self.attempts = {}
+        self.stopped = set()
+        self.pending = 0
+        self.last_message_at = time.time()
+        self.stats = {"terms": 0, "saved": 0, "crashes": 0}
+
+    def _proxy_for(self, worker_id):
+        return PROXIES[worker_id] if PROXIES else None
+
+    def _start_worker(self, worker_id):
+        process = self.ctx.Process(
+            target=worker_main,
+            args=(worker_id, self._proxy_for(worker_id), self.task_queue, self.result_queue,
+                  self.tabs_per_browser, self.sections, self.scraper.base_url, self.parse_workers),
+            name=f"pitchbook-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        self.processes[worker_id] = process
+        self.logger.info(f"✓ Started worker {worker_id} (pid {process.pid}, proxy {self._proxy_for(worker_id)})")
+
+    def start(self):
+        for worker_id in range(self.num_workers):
+            self._start_worker(worker_id)
+
+    def _handle(self, message):
+        self.last_message_at = time.time()
+        kind, worker_id = message[0], message[1]
+        if kind == STARTED:
+            self.in_flight[worker_id] = message[2]
+        elif kind == RESULT:
+            search, data = message[2], message[3]
+            self.scraper.save_company_data(data, search)
+            self.stats["saved"] += 1
+        elif kind == DONE:
+            self.in_flight.pop(worker_id, None)
+            self.pending -= 1
+        elif kind == STOPPED:
+            self.stopped.add(worker_id)
+
+    def drain(self, timeout=0.5):
+        """Write every result currently queued, waiting up to timeout for the first"""
+        try:
+            message = self.result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return
+        self._handle(message)
+        while True:
+            try:
+                self._handle(self.result_queue.get_nowait())
+            except queue.Empty:
+                return
+
+    def check_workers(self, restart=True):
+        """Detect crashed workers, requeue their term and restart them"""
+        for worker_id, process in list(self.processes.items()):
+            if process.is_alive() or worker_id in self.stopped:
+                continue
+
+            self.stats["crashes"] += 1
+            self.logger.error(f"✗ Worker {worker_id} died with exit code {process.exitcode}")
+            # Replace the process before requeueing, since submit() checks workers again
+            if restart:
+                self._start_worker(worker_id)
+            else:
+                self.stopped.add(worker_id)
+
+            search = self.in_flight.pop(worker_id, None)
+            if search is not None:
+                self.pending -= 1
+                self.attempts[search] = self.attempts.get(search, 0) + 1
+                if self.attempts[search] < MAX_TERM_ATTEMPTS:
+                    self.logger.info(f"Requeueing '{search}' after worker crash")
+                    self.submit(search)
+                else:
+                    self.logger.warning(f"Giving up on '{search}' after {MAX_TERM_ATTEMPTS} crashes")
+
+    def submit(self, search):
+        """Queue a search term, writing results while the queue is full"""
+        while True:
+            try:
+                self.task_queue.put(search, timeout=0.5)
+                self.pending += 1
+                self.stats["terms"] += 1
+                return
+            except queue.Full:
+                self.drain(timeout=0)
+                self.check_workers()
+
+    def wait_idle(self, silence_timeout=1800):
+        """
+        Block until every submitted term is finished.
+
+        Args:
+            silence_timeout (float): Give up if no worker reported anything for this
+                long (a term lost between a worker's get() and its 'started' message)
+        """
+        while self.pending > 0:
+            self.drain()
+            self.check_workers()
+            if time.time() - self.last_message_at > silence_timeout:
+                self.logger.warning(f"No worker activity for {silence_timeout}s, "
+                                    f"{self.pending} terms unaccounted for")
+                return
+
+    def shutdown(self, timeout=60):
+        """Send a stop sentinel to each worker, write remaining results and join"""
+        for _ in self.processes:
+            try:
+                self.task_queue.put(None, timeout=5)
+            except queue.Full:
+                break
+
+        deadline = time.time() + timeout
+        while time.time() < deadline and len(self.stopped) < len(self.processes):
+            self.drain()
+            self.check_workers(restart=False)
+            if all(not p.is_alive() for p in self.processes.values()):
+                break
+
+        for worker_id, process in self.processes.items():
+            process.join(timeout=5)
+            if process.is_alive():
+                self.logger.warning(f"Terminating worker {worker_id}")
+                process.terminate()
+        self.drain(timeout=0)
+
+
+def run_workers(num_workers, batch_size=5, max_runs=50, mongo_uri=None, tabs_per_browser=1, sections=None,
+                base_url=None, parse_workers=0):
+    """
+    Run the scraper with several worker processes.
+
+    Args:
+        num_workers (int): Number of worker processes
+        batch_size (int): Companies read from the database per batch
+        max_runs (int): Number of batches
+        mongo_uri (str, optional): MongoDB connection URI
+        tabs_per_browser (int): Profiles loaded concurrently in each worker's browser
+        sections (list, optional): Only extract these profile sections
+        base_url (str, optional): Site root for search URLs
+        parse_workers (int): Parse processes in each worker, 0 parses inline
+    """
+    # The parent only reads terms and writes results: no browser, proxies, pacing state or archive
+    scraper = PitchBookScraper(
+        mongo_uri=mongo_uri, batch_size=batch_size, max_runs=max_runs, base_url=base_url,
+        use_browser=False, http_fast_path=False, use_identities=False, archive_dir=None,
+        pacer=AIMDPacer(state_path=None)
+    )
+    supervisor = WorkerSupervisor(scraper, num_workers, tabs_per_browser=tabs_per_browser, sections=sections,
+                                  parse_workers=parse_workers)
+    supervisor.start()
+
+    seen = set()
+    try:
+        for run in range(max_runs):
+            scraper.logger.info(f"Starting run #{run + 1} of {max_runs} with {supervisor.num_workers} workers")
+            keywords = scraper.read_company_names(number_of_records=batch_size)
+            for key in keywords:
+                search = str(key.get('organization_name', '')).strip()
+                # $sample can repeat documents across batches
+                if not search or search in seen:
+                    continue
+                seen.add(search)
+                supervisor.submit(search)
+            scraper.logger.info(f"Queued run #{run + 1}")
+        supervisor.wait_idle()
+    except KeyboardInterrupt:
+        scraper.logger.warning("Interrupted, shutting down workers...")
+    finally:
+        supervisor.shutdown()
+        scraper.logger.info(f"Worker stats: {supervisor.stats}")
+        if scraper.writer is not None:
+            scraper.writer.close()
+            scraper.logger.info(f"DB writer: {scraper.writer.summary()}")